@@ -0,0 +1,47 @@
+import argparse
+import json
+import sys
+
+from benchmarks.compare import compare
+from benchmarks.suite import DEFAULT_SIZES, SIZES, run_suite
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run or compare the benchmark suite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="time every benchmark and write JSON results")
+    run.add_argument("-o", "--output", default="bench_results.json")
+    run.add_argument("--sizes", default=",".join(DEFAULT_SIZES),
+                     help=f"comma-separated sizes from: {', '.join(SIZES)} (default: %(default)s)")
+
+    cmp = sub.add_parser("compare", help="flag regressions against a stored baseline")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown as a fraction (default: 0.25)")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+        unknown = [s for s in sizes if s not in SIZES]
+        if unknown:
+            parser.error(f"unknown sizes: {', '.join(unknown)}")
+        doc = run_suite(sizes)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=2)
+        print(f"Wrote {args.output}")
+        return
+
+    rows = compare(args.baseline, args.current, args.threshold)
+    regressions = 0
+    for name, size, before, after, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        regressions += regressed
+        print(f"{size:>7} {name:<24} {before * 1000:10.3f} -> {after * 1000:10.3f} ms  x{ratio:5.2f} {flag}")
+    print(f"{regressions} regression(s) over {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Micro-benchmark for character name resolution.
+
+Compares CharacterRegistry lookups with the old linear scan over
+character_aliases as the alias table grows. Run from the repository root:
+
+    python -m benchmarks.bench_character_registry
+"""
+import timeit
+
+from src.players.character_registry import CharacterRegistry
+
+SIZES = [10, 100, 1000, 5000]
+LOOKUPS = 2000
+
+
+def make_alias_table(size):
+    character_list = [f"Character {i}" for i in range(size)]
+    character_aliases = {name: [f"{name} Alt", f"C{i}"] for i, name in enumerate(character_list)}
+    return character_list, character_aliases
+
+
+def linear_main_name(char, character_aliases):
+    for main, aliases in character_aliases.items():
+        if char == main or char in aliases:
+            return main
+    return char
+
+
+def main():
+    print(f"{'aliases':>8} {'registry (us/lookup)':>22} {'linear scan (us/lookup)':>25}")
+    for size in SIZES:
+        character_list, character_aliases = make_alias_table(size)
+        registry = CharacterRegistry(character_list, character_aliases)
+        # Worst case for the linear scan: the last alias in the table.
+        name = f"C{size - 1}"
+        registry.canonical(name)
+
+        fast = timeit.timeit(lambda: registry.canonical(name), number=LOOKUPS)
+        slow = timeit.timeit(lambda: linear_main_name(name, character_aliases), number=LOOKUPS)
+        print(f"{size * 3:>8} {fast / LOOKUPS * 1e6:>22.2f} {slow / LOOKUPS * 1e6:>25.2f}")
+
+
+if __name__ == "__main__":
+    main()
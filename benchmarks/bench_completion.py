@@ -0,0 +1,54 @@
+"""
+Per-keystroke latency of TAB completion at large option counts.
+
+"old" is one call of the previous completer, which rebuilt the full match
+list for every readline state (so a real TAB press paid it once per match).
+"new" is one full TAB press with CompletionIndex: matches plus the ranked
+first page of suggestions. Run from the repository root:
+
+    python -m benchmarks.bench_completion
+"""
+import random
+import string
+import timeit
+
+from src.players.autocomplete import _completions, SUGGESTION_PAGE_SIZE
+from src.players.completion import CompletionIndex
+
+SIZES = [1000, 10000, 100000]
+PREFIXES = ["", "k", "ka", "kai"]
+REPEAT = 20
+
+
+def make_options(count, seed=1):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        length = rng.randint(3, 12)
+        names.add("".join(rng.choice(string.ascii_lowercase) for _ in range(length)).title())
+    return sorted(names)
+
+
+def old_completer_call(options, text):
+    text_lower = text.lower()
+    return [o for o in options if o.lower().startswith(text_lower)]
+
+
+def main():
+    print(f"{'options':>8} {'prefix':>7} {'matches':>8} {'build (ms)':>11} {'old (ms/state)':>15} {'new (ms/TAB)':>13}")
+    for size in SIZES:
+        options = make_options(size)
+        weights = {o: random.randint(0, 50) for o in options}
+        build = timeit.timeit(lambda: CompletionIndex(options, weights), number=1)
+        index = CompletionIndex(options, weights)
+        for prefix in PREFIXES:
+            old = timeit.timeit(lambda: old_completer_call(options, prefix), number=REPEAT) / REPEAT
+            new = timeit.timeit(
+                lambda: (_completions(index, prefix), index.top(prefix, SUGGESTION_PAGE_SIZE)),
+                number=REPEAT
+            ) / REPEAT
+            print(f"{size:>8} {prefix!r:>7} {index.count(prefix):>8} {build * 1000:>11.1f} {old * 1000:>15.3f} {new * 1000:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
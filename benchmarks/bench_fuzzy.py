@@ -0,0 +1,57 @@
+"""
+"Did you mean" lookups and roster dedup at large player counts.
+Names are random letters (denser than real gamer tags, so more near
+duplicates than a real roster would have). Run from the repository root:
+
+    python -m benchmarks.bench_fuzzy
+"""
+import random
+import string
+import time
+import timeit
+
+from src.players.dedup import plan_merges
+from src.players.fuzzy import FuzzyIndex
+
+SIZES = [1000, 10000, 100000]
+REPEAT = 200
+
+
+def make_players(count, seed=1):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        length = rng.randint(5, 12)
+        names.add("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    return {name: [name.title(), {"Fighter": rng.randint(1, 50)}] for name in sorted(names)}
+
+
+def typo(name, rng):
+    i = rng.randrange(len(name))
+    return name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+
+
+def main():
+    rng = random.Random(2)
+    print(f"{'players':>8} {'build (ms)':>11} {'suggest (us)':>13} {'dedup (ms)':>11} {'merges':>7}")
+    for size in SIZES:
+        players = make_players(size)
+        started = time.perf_counter()
+        index = FuzzyIndex()
+        for key, (display_name, _) in players.items():
+            index.add(key, display_name)
+        build = time.perf_counter() - started
+
+        queries = [typo(name, rng) for name in rng.sample(sorted(players), REPEAT)]
+        it = iter(queries * 2)
+        suggest = timeit.timeit(lambda: index.suggest(next(it)), number=REPEAT) / REPEAT
+
+        started = time.perf_counter()
+        merges, _ = plan_merges(players)
+        dedup = time.perf_counter() - started
+        print(f"{size:>8} {build * 1000:>11.1f} {suggest * 1e6:>13.1f} {dedup * 1000:>11.1f} "
+              f"{sum(len(s) for s in merges.values()):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+History query latency at a million recorded sets.
+
+    python -m benchmarks.bench_history
+"""
+import os
+import random
+import tempfile
+import time
+
+from src.history.store import HistoryStore
+
+SETS = 1_000_000
+PLAYERS = 5000
+CHARACTERS = 89
+SERIES = ["PVL Weekly", "Helsinki Smash", "Turku Monthly"]
+ROUNDS = ["Pools", "Winners Round 1", "Winners Semi-Finals", "Losers Finals", "Winners Grand Finals"]
+
+
+def main():
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as workdir:
+        data_path = os.path.join(workdir, "data.json")
+        history = HistoryStore.open(data_path)
+        started = time.perf_counter()
+        for i in range(SETS):
+            a, b = rng.sample(range(PLAYERS), 2)
+            history.append(
+                f"Player{a}", f"Player{b}",
+                f"Fighter {rng.randrange(CHARACTERS)}", f"Fighter {rng.randrange(CHARACTERS)}",
+                SERIES[i % 3], i // 300 + 1, ROUNDS[i % 5], rng.choice((0, 1, 2))
+            )
+        history.flush()
+        print(f"append + flush {SETS} sets: {time.perf_counter() - started:.2f} s "
+              f"({os.path.getsize(history.rows_path) / 1e6:.0f} MB)")
+
+        started = time.perf_counter()
+        history = HistoryStore.open(data_path)
+        print(f"load: {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        queries = [
+            ("usage_over_time", lambda: history.usage_over_time("Player42", 10)),
+            ("head_to_head", lambda: history.head_to_head("Player42", "Player43")),
+            ("matchup_matrix (one series)", lambda: history.matchup_matrix("PVL Weekly")),
+            ("matchup_matrix (all)", lambda: history.matchup_matrix()),
+        ]
+        for name, query in queries:
+            started = time.perf_counter()
+            query()
+            print(f"{name:<28} {(time.perf_counter() - started) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Memory and latency of the compact Roster against today's dict-of-lists
+players, at 100k players loaded from JSON. Run from the repository root:
+
+    python -m benchmarks.bench_roster
+"""
+import gc
+import json
+import random
+import timeit
+import tracemalloc
+
+from benchmarks.synthetic import make_data
+from src.players.roster import Roster, top_characters
+
+PLAYERS = 100_000
+CHARS_PER_PLAYER = [1, 3, 8]
+REPEAT = 10_000
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size
+
+
+def main():
+    rng = random.Random(3)
+    print(f"{'chars/player':>12} {'dict MB':>8} {'roster MB':>10} "
+          f"{'top-10 dict us':>15} {'top-10 roster us':>17} {'+1 dict us':>11} {'+1 roster us':>13}")
+    for chars in CHARS_PER_PLAYER:
+        data = make_data(players=PLAYERS, chars_per_player=chars, events=0)
+        text = json.dumps(data["players"])
+        character_list = data["character_list"]
+
+        players, dict_size = measure(lambda: json.loads(text))
+        roster, roster_size = measure(lambda: Roster(json.loads(text), character_list))
+
+        keys = rng.sample(sorted(players), REPEAT)
+        picks = [rng.choice(character_list) for _ in keys]
+
+        def old_top():
+            for key in keys:
+                sorted(players[key][1].items(), key=lambda x: x[1], reverse=True)[:10]
+
+        def new_top():
+            for key in keys:
+                top_characters(roster[key][1], 10)
+
+        def old_increment():
+            for key, char in zip(keys, picks):
+                char_dict = players[key][1]
+                char_dict[char] = char_dict.get(char, 0) + 1
+
+        def new_increment():
+            for key, char in zip(keys, picks):
+                char_dict = roster[key][1]
+                char_dict[char] = char_dict.get(char, 0) + 1
+
+        per_call = [timeit.timeit(f, number=1) / REPEAT * 1e6 for f in (old_top, new_top, old_increment, new_increment)]
+        print(f"{chars:>12} {dict_size / 1e6:>8.1f} {roster_size / 1e6:>10.1f} "
+              f"{per_call[0]:>15.2f} {per_call[1]:>17.2f} {per_call[2]:>11.2f} {per_call[3]:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Cold-start budget for scripted calls (`python main.py title ...`, as run
+from stream overlay hotkeys). Each command runs in a fresh interpreter under
+`python -X importtime`; the import time it adds over a bare interpreter
+(`python -c pass`, measured in the same run) must stay within BUDGET_MS,
+and modules only the interactive flow or other commands need must not be
+imported at all. The fastest of RUNS runs is compared, so a busy machine
+does not flip the verdict. tests/test_startup.py checks the module lists
+on every test run. Run from the repository root:
+
+    python -m benchmarks.bench_startup        # exits 1 when over budget
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if __package__ in (None, ""):
+    # Run as a file (python benchmarks/bench_startup.py) rather than with -m
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import make_data  # noqa: E402
+from benchmarks.suite import SIZES  # noqa: E402
+
+# Commands add 15-35 ms on an idle machine and up to about 45 ms on a busy one;
+# which modules load is checked exactly (here and in tests/test_startup.py).
+BUDGET_MS = 60
+RUNS = 5
+
+SET_FLAGS = ["--p1", "Player000001", "--p2", "Player000002", "--round-type", "Losers", "--round", "sf"]
+COMMANDS = {
+    "title": ["title"] + SET_FLAGS,
+    "tags": ["tags"] + SET_FLAGS,
+    "all --json": ["all", "--json"] + SET_FLAGS,
+    "complete players": ["complete", "players", "player00"],
+    "complete rounds": ["complete", "rounds", "s"],
+}
+
+# Never needed by a scripted call
+NOT_IMPORTED = {
+    "readline", "tracemalloc", "sqlite3", "multiprocessing", "asyncio",
+    "src.session.flow", "src.core.speculative", "src.history.store", "src.players.fuzzy",
+    "src.profiling.spans", "concurrent.futures",
+}
+# Only needed by some commands
+NOT_IMPORTED_BY = {
+    "title": {"src.description.description_generator", "src.tags.tag_generator", "src.templates.engine"},
+    "tags": {"src.title.title_generator", "src.description.description_generator", "src.templates.engine"},
+    "complete rounds": {"json.decoder", "src.data.loader"},
+}
+
+
+def import_times(argv, env, script=("main.py",)):
+    """
+    Runs main.py (or script, e.g. ("-c", "pass")) with argv under
+    -X importtime from the repository root. Returns (total import ms, set of
+    imported module names, wall ms).
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *script, *argv],
+        env=env, cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    wall = (time.perf_counter() - started) * 1000
+    total = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the header line
+        modules.add(name.strip())
+        if not name.startswith("  "):
+            # Top-level imports only; their cumulative time includes the nested ones
+            total += int(cumulative)
+    return total / 1000, modules, wall
+
+
+def main():
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "data.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(make_data(**SIZES["today"]), f)
+        env = dict(os.environ, SMASHVOD_DATA=path)
+        env.pop("SMASHVOD_PROFILE", None)
+
+        baseline = min(import_times([], env, ("-c", "pass"))[0] for _ in range(RUNS))
+        print(f"bare interpreter imports: {baseline:.1f} ms")
+        print(f"{'command':<18} {'imports (ms)':>13} {'added (ms)':>11} {'wall (ms)':>10} {'modules':>8}")
+        for label, argv in COMMANDS.items():
+            runs = [import_times(argv, env) for _ in range(RUNS)]
+            imports = min(r[0] for r in runs)
+            wall = min(r[2] for r in runs)
+            modules = runs[0][1]
+            added = imports - baseline
+            print(f"{label:<18} {imports:>13.1f} {added:>11.1f} {wall:>10.1f} {len(modules):>8}")
+
+            if added > BUDGET_MS:
+                failures.append(f"{label}: imports added {added:.1f} ms (budget {BUDGET_MS} ms)")
+            unwanted = sorted((NOT_IMPORTED | NOT_IMPORTED_BY.get(label, set())) & modules)
+            if unwanted:
+                failures.append(f"{label}: imports {', '.join(unwanted)}")
+
+    for failure in failures:
+        print(f"OVER BUDGET {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Worst-case tag generation time as characters x aliases grows.
+
+"old" is the previous construct_tags, which built the full cartesian product
+of every alias of every character before trimming to 400 characters.
+Run from the repository root:
+
+    python -m benchmarks.bench_tags
+"""
+import timeit
+
+from src.core.set_context import SetContext
+from src.players.character_registry import CharacterRegistry
+from src.tags.tag_generator import construct_tags
+
+CHARACTERS = [1, 3, 5, 8]
+ALIASES = [0, 5, 20, 100]
+
+
+def make_registry(characters, aliases):
+    names = [f"Fighter {i}" for i in range(characters * 2)]
+    table = {name: [f"{name} alias {j}" for j in range(aliases)] for name in names}
+    return names, CharacterRegistry(names, table)
+
+
+def old_construct_tags(p1, p2, chars1, chars2, event_name, event_number, character_aliases):
+    def get_all_aliases(char):
+        for main, alias_list in character_aliases.items():
+            if char == main or char in alias_list:
+                return [main] + alias_list
+        return [char]
+
+    base = [
+        "ssbu", "Super Smash Bros. Ultimate", "tournament", "ssbu gameplay",
+        "competitive smash", "smash ultimate 2025",
+        f"{event_name} {event_number}", p1, p2
+    ]
+    matchups = []
+    chars1_aliases = [get_all_aliases(c1) for c1 in chars1]
+    chars2_aliases = [get_all_aliases(c2) for c2 in chars2]
+    for c1_aliases in chars1_aliases:
+        for c2_aliases in chars2_aliases:
+            for c1 in c1_aliases:
+                for c2 in c2_aliases:
+                    matchups.append(f"{c1} vs {c2}")
+            for c1 in c1_aliases:
+                matchups.append(f"{p1} {c1}")
+        for c2_aliases in chars2_aliases:
+            for c2 in c2_aliases:
+                matchups.append(f"{p2} {c2}")
+    matchups += [f"{p1} vs {p2}", f"{p2} vs {p1}"]
+
+    seen = set()
+    unique = []
+    for tag in base + matchups:
+        low = tag.lower()
+        if low not in seen:
+            seen.add(low)
+            unique.append(tag)
+    final = []
+    length = 0
+    for tag in unique:
+        addition = len(tag) + 1
+        if length + addition <= 400:
+            final.append(tag)
+            length += addition
+        else:
+            break
+    return ",".join(final)
+
+
+def main():
+    print(f"{'chars':>6} {'aliases':>8} {'old (ms)':>10} {'new (ms)':>10} {'new tags':>9}")
+    for characters in CHARACTERS:
+        for aliases in ALIASES:
+            names, registry = make_registry(characters, aliases)
+            chars1, chars2 = names[:characters], names[characters:]
+            ctx = SetContext("Player One", "Player Two", chars1, chars2, "PVL Weekly", 18, "Winners", "f")
+            number = 3 if characters * aliases > 200 else 20
+            old = timeit.timeit(
+                lambda: old_construct_tags("Player One", "Player Two", chars1, chars2, "PVL Weekly", 18, registry._character_aliases),
+                number=number
+            ) / number
+            new = timeit.timeit(lambda: construct_tags(ctx, registry), number=number) / number
+            tags = construct_tags(ctx, registry)
+            print(f"{characters:>6} {aliases:>8} {old * 1000:>10.2f} {new * 1000:>10.2f} {len(tags.split(',')):>9}")
+
+
+if __name__ == "__main__":
+    main()
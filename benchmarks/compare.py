@@ -0,0 +1,27 @@
+"""
+Compares two benchmark result files and flags regressions.
+"""
+import json
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    return {(r["benchmark"], r["size"]): r for r in doc["results"]}
+
+
+def compare(baseline_path, current_path, threshold=0.25):
+    """
+    Returns a list of (benchmark, size, baseline_s, current_s, ratio, regressed)
+    for every benchmark present in both files. A benchmark regressed if its
+    median is more than `threshold` (a fraction) slower than the baseline.
+    """
+    baseline = load_results(baseline_path)
+    current = load_results(current_path)
+    rows = []
+    for key in sorted(baseline.keys() & current.keys()):
+        before = baseline[key]["median_s"]
+        after = current[key]["median_s"]
+        ratio = after / before if before else float("inf")
+        rows.append((key[0], key[1], before, after, ratio, ratio > 1 + threshold))
+    return rows
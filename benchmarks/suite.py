@@ -0,0 +1,125 @@
+"""
+Times every generation and I/O path across data sizes and writes the results
+as JSON, so runs can be compared with benchmarks/compare.py.
+"""
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_data
+from src.core.set_context import SetContext
+from src.data.loader import load_data
+from src.data.saver import save_data
+from src.description.description_generator import generate_description
+from src.events.event_store import EventStore
+from src.players.autocomplete import _completions
+from src.players.character_registry import CharacterRegistry
+from src.players.completion import CompletionIndex
+from src.session.quick import QuickGrammar
+from src.tags.tag_generator import construct_tags
+from src.title.title_generator import generate_title
+
+# name -> make_data() parameters; "today" is roughly the size of the shipped data.json.
+SIZES = {
+    "today": dict(players=12, chars_per_player=2, aliases_per_character=1, events=2),
+    "small": dict(players=1000, chars_per_player=3, aliases_per_character=2, events=100),
+    "medium": dict(players=10000, chars_per_player=4, aliases_per_character=3, events=1000),
+    "large": dict(players=100000, chars_per_player=5, aliases_per_character=4, events=10000),
+}
+DEFAULT_SIZES = ["today", "small", "medium"]
+
+
+def measure(fn, repeat=5, number=1):
+    """
+    Runs fn `number` times per sample for `repeat` samples and returns
+    per-call timings in seconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {"min_s": min(samples), "median_s": statistics.median(samples), "repeat": repeat, "number": number}
+
+
+def _snapshots(setting, fn):
+    """
+    Wraps fn to run with data snapshots forced on ("1") or off ("0").
+    """
+    def run():
+        previous = os.environ.get("SMASHVOD_SNAPSHOT")
+        os.environ["SMASHVOD_SNAPSHOT"] = setting
+        try:
+            return fn()
+        finally:
+            if previous is None:
+                del os.environ["SMASHVOD_SNAPSHOT"]
+            else:
+                os.environ["SMASHVOD_SNAPSHOT"] = previous
+    return run
+
+
+def _io_benchmarks(data, workdir):
+    # Plain JSON, then JSON with its compiled snapshot (src/data/snapshot.py)
+    for suffix, setting in (("", "0"), ("_snapshot", "1")):
+        path = os.path.join(workdir, f"data{suffix}.json")
+        save = _snapshots(setting, lambda path=path: save_data(data, path))
+        save()
+        yield f"save_data{suffix}", save, 3, 1
+        yield f"load_data{suffix}", _snapshots(setting, lambda path=path: load_data(path)), 3, 1
+
+
+def _generation_benchmarks(data):
+    registry = CharacterRegistry(data["character_list"], data["character_aliases"])
+    players = list(data["players"].values())
+    (p1, chars1), (p2, chars2) = players[0], players[-1]
+    ctx = SetContext(p1, p2, list(chars1), list(chars2), "PVL Weekly", 1, "Losers", "sf")
+    store = EventStore(data["events"])
+    event = store.get("PVL Weekly", 1)
+
+    yield "registry_build", lambda: CharacterRegistry(data["character_list"], data["character_aliases"]).names(), 5, 1
+    yield "generate_title", lambda: generate_title(ctx), 5, 1000
+    yield "construct_tags", lambda: construct_tags(ctx, registry), 5, 100
+    yield "generate_description", lambda: generate_description(ctx, event), 5, 1000
+    yield "event_store_build", lambda: EventStore(data["events"]), 5, 1
+    yield "event_latest_number", lambda: store.latest_number("pvl weekly"), 5, 10000
+
+    names = [display for display, _ in players]
+    weights = {display: sum(chars.values()) for display, chars in players}
+    index = CompletionIndex(names, weights)
+    _completions(index, "")
+    yield "completion_index_build", lambda: CompletionIndex(names, weights), 3, 1
+    yield "completion_tab_empty", lambda: _completions(index, ""), 5, 10
+    yield "completion_tab_prefix", lambda: _completions(index, "player00"), 5, 100
+
+    grammar = QuickGrammar(data, index)
+    line = f"{p1} {min(chars1)} vs {p2} {min(chars2)} @pvl weekly 1 L sf"
+    yield "quick_entry_parse", lambda: grammar.parse(line), 5, 1000
+
+
+def run_suite(sizes=DEFAULT_SIZES, log=sys.stderr):
+    """
+    Runs every benchmark for each named size. Returns the results document.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            params = SIZES[size]
+            data = make_data(**params)
+            benchmarks = list(_generation_benchmarks(data)) + list(_io_benchmarks(data, workdir))
+            for name, fn, repeat, number in benchmarks:
+                timing = measure(fn, repeat, number)
+                results.append(dict(benchmark=name, size=size, params=params, **timing))
+                print(f"{size:>7} {name:<24} {timing['median_s'] * 1000:10.3f} ms", file=log)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
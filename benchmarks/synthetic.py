@@ -0,0 +1,69 @@
+"""
+Synthetic data.json generator for benchmarks.
+
+    python -m benchmarks.synthetic --players 10000 --events 1000 -o /tmp/data.json
+"""
+import argparse
+import json
+import random
+
+from src.data.storage import empty_data
+
+SERIES = ["PVL Weekly", "Helsinki Smash", "Turku Monthly", "Nordic Major", "Campus Clash"]
+
+
+def make_data(players=100, chars_per_player=2, aliases_per_character=2, events=10,
+              characters=90, seed=0):
+    """
+    Builds a data structure in the data.json format:
+    `characters` canonical characters each with `aliases_per_character` aliases,
+    `players` players each with usage counts for `chars_per_player` characters,
+    and `events` event editions spread over a few series, with links.
+    """
+    rng = random.Random(seed)
+    data = empty_data()
+
+    character_list = [f"Fighter {i}" for i in range(characters)]
+    data["character_list"] = character_list
+    data["character_aliases"] = {
+        name: [f"{name} Alt {j}" for j in range(aliases_per_character)]
+        for name in character_list
+    }
+
+    for i in range(players):
+        display_name = f"Player{i:06d}"
+        picks = rng.sample(character_list, min(chars_per_player, characters))
+        data["players"][display_name.lower()] = [
+            display_name, {c: rng.randint(1, 50) for c in picks}
+        ]
+
+    for i in range(events):
+        series = SERIES[i % len(SERIES)]
+        number = i // len(SERIES) + 1
+        data["events"].append({
+            "name": series,
+            "number": number,
+            "playlist": f"https://www.youtube.com/playlist?list=PL{i:08d}",
+            "bracket": f"https://start.gg/tournament/{series.lower().replace(' ', '-')}-{number}",
+        })
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--chars-per-player", type=int, default=2)
+    parser.add_argument("--aliases-per-character", type=int, default=2)
+    parser.add_argument("--events", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="data.json")
+    args = parser.parse_args()
+
+    data = make_data(args.players, args.chars_per_player, args.aliases_per_character, args.events, seed=args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
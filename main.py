@@ -1,65 +1,158 @@
-from src.data.loader import load_data
-from src.players.autocomplete import input_with_autocomplete
-from src.players.characters import get_characters
-from src.events.event_utils import generate_title_with_event, get_event_by_name_and_number, record_event_if_new
-from src.events.links import prompt_for_event_links
-from src.tags.tag_generator import construct_tags
-from src.description.description_generator import generate_description
-from src.data.saver import save_data
-
-# ANSI bold
-BOLD = "\033[1m"
-RESET = "\033[0m"
-
-def print_bold(text):
-    print(f"{BOLD}{text}{RESET}")
-
-def main():
-    data = load_data()
-
-    player_keys = [data["players"][k][0] for k in data["players"]]
-    while True:
-        p1_input = input_with_autocomplete("Enter player 1 name: ", player_keys, required=True)
-        if p1_input:
-            break
-        print("\033[91mPlayer 1 name is required. Please try again.\033[0m")
-
-    while True:
-        p2_input = input_with_autocomplete("Enter player 2 name: ", player_keys, required=True)
-        if p2_input:
-            break
-        print("\033[91mPlayer 2 name is required. Please try again.\033[0m")
-
-    p1_display, p1_chars = get_characters(p1_input, data)
-    p2_display, p2_chars = get_characters(p2_input, data)
-
-    title, evt_name, evt_num = generate_title_with_event(
-        p1_display, p2_display, p1_chars, p2_chars, data
-    )
-    print_bold("\nGenerated YouTube title:")
-    print(title)
-
-    tags = construct_tags(p1_display, p2_display, p1_chars, p2_chars, evt_name, evt_num, data)
-    print_bold("\nGenerated YouTube tags:")
-    print(tags)
-    print(f"\nCharacter count: {len(tags)}")
-
-    event_obj = get_event_by_name_and_number(data, evt_name, evt_num)
-    event_title = f"{evt_name} #{evt_num}"
-    if event_obj:
-        if prompt_for_event_links(event_obj, event_title):
-            print("Event links updated.")
-
-    # If no bracket link, add a placeholder line
-    
-    description = generate_description(
-        p1_display, p2_display, p1_chars, p2_chars, evt_name, evt_num, event_obj, data
+import argparse
+import sys
+
+from src.core.cli import add_set_arguments
+
+# Modules are imported inside the functions that need them, so a one-off
+# scripted call (e.g. `python main.py title ...` from a stream overlay) only
+# pays for what it uses; see benchmarks/bench_startup.py for the budget.
+
+SET_COMMANDS = ("title", "tags", "description", "all")
+COMPLETION_KINDS = ("players", "characters", "events", "rounds")
+
+
+def main(session_log=None, quick=False):
+    from src.data.loader import load_data
+    from src.data.saver import save_data
+    from src.core.speculative import speculator
+    from src.history.store import HistoryStore
+    from src.profiling.spans import note, span
+    from src.session.flow import run_session
+    from src.templates.engine import TemplateError
+
+    with span("load_data"):
+        data = load_data()
+
+    try:
+        if session_log:
+            from src.session.recorder import record_session
+            ctx, _ = record_session(session_log, data, quick)
+        else:
+            ctx, _ = run_session(data, quick)
+    except TemplateError as e:
+        sys.exit(f"Error: {e}")
+    note(speculator.summary())
+
+    with span("save_data"):
+        report = save_data(data)
+    print(f"\n{report}")
+
+    with span("record history"):
+        history = HistoryStore.open(load_rows=False)
+        history.append_context(ctx)
+        history.flush()
+
+
+def generate(args):
+    """
+    The title/tags/description/all commands: generates metadata for the set
+    given as flags, without prompting, and prints it as text or JSON.
+    """
+    from src.batch.manifest import normalize_record
+    from src.core.resolve import generate_set, live_view
+    from src.data.loader import load_data
+
+    fields = ("title", "tags", "description") if args.command == "all" else (args.command,)
+    record = normalize_record({
+        "p1": args.p1, "p2": args.p2, "p1_chars": args.c1, "p2_chars": args.c2,
+        "event": args.event, "number": args.number, "round_type": args.round_type, "round": args.round,
+    })
+    data = load_data(args.data)
+    output, usage = generate_set(record, live_view(data), fields)
+
+    if args.record:
+        from src.core.resolve import apply_set_usage
+        from src.data.saver import save_data
+        from src.history.store import HistoryStore
+        apply_set_usage(data, output, usage)
+        save_data(data, args.data)
+        history = HistoryStore.open(args.data, load_rows=False)
+        history.append(output["p1"], output["p2"], output["p1_chars"][0], output["p2_chars"][0],
+                       output["event"], output["number"], output["round"], output["winner"])
+        history.flush()
+
+    if args.json:
+        import json
+        print(json.dumps(output, ensure_ascii=False, indent=2))
+    else:
+        print("\n\n".join(output[k] for k in fields))
+
+
+def complete(args):
+    from src.players.completion import CompletionIndex, player_index
+
+    if args.kind == "rounds":
+        from src.events.rounds import ROUND_DETAIL_OPTIONS
+        index = ROUND_DETAIL_OPTIONS
+    else:
+        from src.data.loader import load_data
+        data = load_data(args.data)
+        if args.kind == "players":
+            index = player_index(data["players"])
+        elif args.kind == "characters":
+            index = CompletionIndex(data.get("character_list", []))
+        else:
+            from src.events.event_store import get_event_store
+            store = get_event_store(data)
+            index = CompletionIndex(store.series_names(), store.edition_counts())
+
+    matches = index.top(args.text, args.limit)
+    if args.json:
+        import json
+        print(json.dumps({"matches": matches, "total": index.count(args.text)}, ensure_ascii=False))
+    else:
+        print("\n".join(matches))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a YouTube title, tags and description for one set. Without a command the "
+                    "set is entered interactively; the commands take it as flags and print the result."
     )
-    print_bold("\nGenerated YouTube description:\n")
-    print(description)
+    parser.add_argument("--profile", nargs="?", const="", metavar="TRACE",
+                        help="time each stage and write a Chrome trace (default: profile.trace.json); "
+                             "also enabled by SMASHVOD_PROFILE=1")
+    parser.add_argument("--quick", action="store_true",
+                        help="enter the whole set on one line, e.g. "
+                             "'hertsu sheik vs dasuki plant @pvl 18 L sf'")
+    parser.add_argument("--record-session", nargs="?", const="sessions.jsonl", metavar="LOG",
+                        help="append the prompts, answers and outputs to a session log for replay "
+                             "(default: sessions.jsonl); see python -m src.session")
+    sub = parser.add_subparsers(dest="command", metavar="command")
+
+    for command in SET_COMMANDS:
+        set_parser = sub.add_parser(
+            command, help=f"print the {command} for a set" if command != "all" else "print everything for a set"
+        )
+        add_set_arguments(set_parser)
+        set_parser.add_argument("--data", help="data file (default: $SMASHVOD_DATA or data.json)")
+
+    completion = sub.add_parser("complete", help="list players, characters, events or rounds starting with a prefix")
+    completion.add_argument("kind", choices=COMPLETION_KINDS)
+    completion.add_argument("text", nargs="?", default="")
+    completion.add_argument("--limit", type=int, default=20)
+    completion.add_argument("--json", action="store_true", help="print the matches and total as JSON")
+    completion.add_argument("--data", help="data file (default: $SMASHVOD_DATA or data.json)")
+    return parser.parse_args(argv)
 
-    save_data(data)
 
 if __name__ == "__main__":
-    main()
-print()
\ No newline at end of file
+    args = parse_args()
+    if args.command in SET_COMMANDS:
+        try:
+            generate(args)
+        except ValueError as e:
+            sys.exit(f"Error: {e}")
+    elif args.command == "complete":
+        complete(args)
+    else:
+        from src.profiling.spans import enable, enable_from_env, finish
+        if args.profile is not None:
+            enable(args.profile)
+        else:
+            enable_from_env()
+        try:
+            main(args.record_session, args.quick)
+        finally:
+            finish()
+        print()
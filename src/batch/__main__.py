@@ -0,0 +1,43 @@
+import argparse
+import sys
+import time
+
+from src.batch.runner import run_batch
+from src.data.loader import load_data
+from src.data.saver import save_data
+from src.history.store import HistoryStore
+from src.tags.limits import TAG_CHAR_LIMIT
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.batch",
+        description="Generate titles, tags and descriptions for every set in a CSV/JSONL manifest."
+    )
+    parser.add_argument("manifest", help="CSV or JSONL file with p1, p2, p1_chars, p2_chars, event, number, round_type, round")
+    parser.add_argument("-o", "--output", help="JSONL file to write (default: stdout)")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="sets per work unit sent to a worker")
+    parser.add_argument("--tag-budget", type=int, default=TAG_CHAR_LIMIT, help="maximum length of the tag string")
+    parser.add_argument("--dry-run", action="store_true", help="do not save usage counts or set history")
+    args = parser.parse_args()
+
+    data = load_data()
+    history = None if args.dry_run else HistoryStore.open(load_rows=False)
+    start = time.perf_counter()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            written, errors = run_batch(args.manifest, out, data, args.processes, args.chunk_size, args.tag_budget, history)
+    else:
+        written, errors = run_batch(args.manifest, sys.stdout, data, args.processes, args.chunk_size, args.tag_budget, history)
+    elapsed = time.perf_counter() - start
+
+    rate = written / elapsed if elapsed else 0
+    print(f"Generated {written} sets ({errors} errors) in {elapsed:.2f}s ({rate:.0f} sets/s)", file=sys.stderr)
+    if not args.dry_run:
+        save_data(data)
+        history.flush()
+
+
+if __name__ == "__main__":
+    main()
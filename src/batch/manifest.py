@@ -0,0 +1,84 @@
+import json
+
+# Columns understood in a CSV manifest (JSONL uses the same keys).
+# "winner" is optional: 1, 2, or the winning player's name. "video_id" is
+# optional too: the YouTube video the metadata is for (see src/publish).
+MANIFEST_FIELDS = [
+    "p1", "p2", "p1_chars", "p2_chars", "event", "number", "round_type", "round", "winner", "video_id",
+]
+
+
+class ManifestLineError:
+    """
+    Stands in for the record of a manifest line that could not be read
+    (e.g. malformed JSON), so the run reports it and carries on.
+    """
+    __slots__ = ("message",)
+
+    def __init__(self, message):
+        self.message = message
+
+
+def read_manifest(path):
+    """
+    Streams set records from a CSV or JSONL manifest, one at a time, so a
+    season-long backfill never has to fit in memory.
+    Yields (line_number, record) where record has the MANIFEST_FIELDS keys,
+    or is a ManifestLineError for a line that could not be read.
+    Character columns may hold several names separated by ';' or '|'.
+    """
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        yield from _read_jsonl(path)
+    else:
+        yield from _read_csv(path)
+
+
+def _read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError as e:
+                yield line_no, ManifestLineError(f"invalid JSON: {e}")
+                continue
+            if not isinstance(raw, dict):
+                yield line_no, ManifestLineError("expected a JSON object")
+                continue
+            yield line_no, normalize_record(raw)
+
+
+def _read_csv(path):
+    import csv
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, normalize_record(row)
+
+
+def normalize_record(raw):
+    """
+    Cleans up one manifest row: strips strings, splits character lists and
+    turns the event number into an int (or None when missing).
+    """
+    record = {}
+    for field in MANIFEST_FIELDS:
+        value = raw.get(field)
+        if field in ("p1_chars", "p2_chars"):
+            record[field] = _split_chars(value)
+        elif field == "number":
+            record[field] = int(value) if str(value or "").strip().isdigit() else None
+        else:
+            record[field] = str(value).strip() if value is not None else ""
+    return record
+
+
+def _split_chars(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace("|", ";").split(";")
+    return [c.strip() for c in value if c and c.strip()]
@@ -0,0 +1,103 @@
+import json
+import multiprocessing
+import os
+from collections import Counter, deque
+from itertools import islice
+
+from src.batch.manifest import ManifestLineError, read_manifest
+from src.core.resolve import generate_set, merge_usage, snapshot_view
+from src.tags.limits import TAG_CHAR_LIMIT
+
+# Read-only view of the data, set once per worker process by _init_worker().
+_worker_view = None
+
+
+def generate_chunk(chunk, view=None):
+    """
+    Generates a list of (line_number, record) pairs. Returns the output records
+    in order plus the merged usage increments and events seen in the chunk.
+    """
+    view = view if view is not None else _worker_view
+    outputs = []
+    usage = Counter()
+    display_names = {}
+    events = set()
+    for line_no, record in chunk:
+        if isinstance(record, ManifestLineError):
+            outputs.append({"line": line_no, "error": record.message})
+            continue
+        try:
+            output, set_usage = generate_set(record, view)
+        except ValueError as e:
+            outputs.append({"line": line_no, "error": str(e)})
+            continue
+        outputs.append(dict(line=line_no, **output))
+        for key, display_name, char in set_usage:
+            usage[(key, char)] += 1
+            display_names.setdefault(key, display_name)
+        if output["event"]:
+            events.add((output["event"], output["number"]))
+    return outputs, usage, display_names, events
+
+
+def _init_worker(view):
+    global _worker_view
+    _worker_view = view
+
+
+def run_batch(manifest_path, out_file, data, processes=None, chunk_size=256, tag_budget=TAG_CHAR_LIMIT,
+              history=None):
+    """
+    Streams records from manifest_path, generates them across a process pool
+    and writes one JSON line per set to out_file, in manifest order.
+    At most a few chunks per worker are in flight, so memory stays bounded
+    regardless of manifest size. Usage counts are merged into data at the end,
+    and each set is added to `history` (a HistoryStore) if given; saving and
+    flushing are left to the caller.
+    Returns (sets_written, errors).
+    """
+    processes = processes or os.cpu_count() or 1
+    view = snapshot_view(data, tag_budget)
+    records = read_manifest(manifest_path)
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+
+    total_usage = Counter()
+    all_display_names = {}
+    all_events = set()
+    written = errors = 0
+
+    def collect(result):
+        nonlocal written, errors
+        outputs, usage, display_names, events = result
+        for output in outputs:
+            out_file.write(json.dumps(output, ensure_ascii=False) + "\n")
+            if "error" in output:
+                errors += 1
+                continue
+            written += 1
+            if history is not None:
+                history.append(
+                    output["p1"], output["p2"], output["p1_chars"][0], output["p2_chars"][0],
+                    output["event"], output["number"], output["round"], output["winner"]
+                )
+        total_usage.update(usage)
+        for key, display_name in display_names.items():
+            all_display_names.setdefault(key, display_name)
+        all_events.update(events)
+
+    if processes == 1:
+        for chunk in chunks:
+            collect(generate_chunk(chunk, view))
+    else:
+        max_in_flight = processes * 4
+        with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(view,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(generate_chunk, (chunk,)))
+                if len(pending) >= max_in_flight:
+                    collect(pending.popleft().get())
+            while pending:
+                collect(pending.popleft().get())
+
+    merge_usage(data, total_usage, all_display_names, all_events)
+    return written, errors
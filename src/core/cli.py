@@ -0,0 +1,16 @@
+def add_set_arguments(parser):
+    """
+    Adds the flags that describe one set (players, characters, event, round)
+    to a title/tags/description/all subcommand. Shared by main.py and the
+    daemon client so the two take a set the same way.
+    """
+    parser.add_argument("--p1", required=True)
+    parser.add_argument("--p2", required=True)
+    parser.add_argument("--c1", action="append", default=[], help="player 1 character (repeat for more)")
+    parser.add_argument("--c2", action="append", default=[], help="player 2 character (repeat for more)")
+    parser.add_argument("--event", default="", help="event series (default: the most recent one)")
+    parser.add_argument("--number", type=int, help="event number (default: the latest edition)")
+    parser.add_argument("--round-type", required=True, help="Winners, Losers or Pools")
+    parser.add_argument("--round", default="", help="round detail, e.g. sf, r2, gf")
+    parser.add_argument("--record", action="store_true", help="count character usage for this set and save it")
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
@@ -0,0 +1,73 @@
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_FRAGMENTS = 4096
+
+
+class FragmentCache:
+    """
+    Bounded LRU cache for generated text fragments, such as the tags for a
+    (player, character) or (character, character) pairing.
+    Every lookup carries a version stamp (the character registry's version);
+    when it differs from the stamp the cache was filled under, the whole cache
+    is dropped, so editing character_aliases (even one alias in one list)
+    never serves stale aliases.
+    Player display names are part of the keys, so a renamed player simply
+    misses and the old entries age out.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAX_FRAGMENTS):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._stamp = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, build, stamp):
+        """
+        Returns the cached fragment for key, calling build() to create it on a miss.
+        """
+        with self._lock:
+            if stamp != self._stamp:
+                if self._entries:
+                    self._entries.clear()
+                    self.invalidations += 1
+                self._stamp = stamp
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = build()
+        with self._lock:
+            if stamp == self._stamp:
+                self._entries[key] = value
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Shared by tag generation in this process.
+fragment_cache = FragmentCache()
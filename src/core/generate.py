@@ -0,0 +1,25 @@
+from src.tags.limits import TAG_CHAR_LIMIT
+
+METADATA_FIELDS = ("title", "tags", "description")
+
+
+def generate_metadata(ctx, registry, event=None, tag_budget=TAG_CHAR_LIMIT, templates=None,
+                      fields=METADATA_FIELDS):
+    """
+    Generates the title, tags and description for one set (or only the given
+    fields; each generator is imported on first use, so a one-off call for a
+    title does not load the others).
+    No prompting, printing or file access happens here.
+    templates defaults to the built-in house style.
+    """
+    output = {}
+    if "title" in fields:
+        from src.title.title_generator import generate_title
+        output["title"] = generate_title(ctx, templates)
+    if "tags" in fields:
+        from src.tags.tag_generator import construct_tags
+        output["tags"] = construct_tags(ctx, registry, tag_budget)
+    if "description" in fields:
+        from src.description.description_generator import generate_description
+        output["description"] = generate_description(ctx, event, templates)
+    return output
@@ -0,0 +1,188 @@
+from collections import Counter
+
+from src.core.generate import METADATA_FIELDS, generate_metadata
+from src.core.set_context import SetContext
+from src.data.tracked import stored_items
+from src.events.event_store import EventStore, get_event_store
+from src.events.event_utils import record_event_if_new
+from src.events.rounds import ROUND_TYPES, normalize_round_type
+from src.players.character_registry import get_registry
+from src.players.roster import top_characters
+from src.tags.limits import TAG_CHAR_LIMIT
+
+# A "view" is what generate_set() reads: a dict with "players" (key ->
+# (display_name, characters ranked by usage)), "character_list",
+# "character_aliases", "templates", "events" (an EventStore),
+# "default_event" and "tag_budget".
+
+
+def snapshot_view(data, tag_budget=TAG_CHAR_LIMIT):
+    """
+    Returns a self-contained copy of what set generation needs, suitable for
+    shipping to worker processes.
+    """
+    players = {}
+    for key, (display_name, char_dict) in stored_items(data.get("players", {})):
+        players[key] = (display_name, top_characters(char_dict))
+
+    store = EventStore(list(data.get("events", [])))
+    return {
+        "players": players,
+        "character_list": data.get("character_list", []),
+        "character_aliases": data.get("character_aliases", {}),
+        "templates": data.get("templates", {}),
+        "events": store,
+        "default_event": store.default_series(),
+        "tag_budget": tag_budget,
+    }
+
+
+class RankedPlayers:
+    """
+    Read-through stand-in for the "players" of a view, backed by live
+    data["players"], so usage updates are seen without rebuilding anything.
+    Only the most used character is ranked, which is all generate_set() needs.
+    """
+
+    def __init__(self, players):
+        self._players = players
+
+    def get(self, key, default=None):
+        entry = self._players.get(key)
+        if entry is None:
+            return default
+        display_name, char_dict = entry
+        return display_name, top_characters(char_dict, 1)
+
+
+def live_view(data, tag_budget=TAG_CHAR_LIMIT):
+    """
+    Returns a view that reads straight from data, for long-running processes
+    that keep updating it.
+    """
+    store = get_event_store(data)
+    return {
+        "players": RankedPlayers(data.setdefault("players", {})),
+        "character_list": data.get("character_list", []),
+        "character_aliases": data.get("character_aliases", {}),
+        "templates": data.get("templates", {}),
+        "events": store,
+        "default_event": store.default_series(),
+        "tag_budget": tag_budget,
+    }
+
+
+def generate_set(record, view, fields=METADATA_FIELDS):
+    """
+    Generates title, tags and description (or only the given fields) for one
+    set record (see src/batch/manifest.py for the fields) without prompting.
+    Returns (output_record, [(player_key, display_name, char), ...]) where the
+    second item lists the usage increments the set implies.
+    Raises ValueError for records that cannot be generated.
+    """
+    if not record["p1"] or not record["p2"]:
+        raise ValueError("both p1 and p2 are required")
+    round_type = normalize_round_type(record["round_type"])
+    if not round_type:
+        raise ValueError(f"round_type must be one of: {', '.join(ROUND_TYPES)}")
+
+    registry = get_registry(view)
+    usage = []
+    sides = []
+    for player_field, chars_field in (("p1", "p1_chars"), ("p2", "p2_chars")):
+        player_input = record[player_field]
+        key = player_input.lower()
+        display_name, default_chars = resolve_player(player_input, view)
+        chars = [_canonical_character(registry, c) for c in record[chars_field]]
+        chars = chars or default_chars
+        for char in chars:
+            if char != "Unknown":
+                usage.append((key, display_name, char))
+        sides.append((display_name, chars))
+
+    (p1, chars1), (p2, chars2) = sides
+    event_name, event_number = resolve_event(record, view)
+    event = view["events"].get(event_name, event_number)
+    ctx = SetContext(p1, p2, chars1, chars2, event_name, event_number, round_type, record["round"])
+
+    output = {
+        "p1": p1, "p2": p2, "p1_chars": ctx.chars1, "p2_chars": ctx.chars2,
+        "event": event_name, "number": event_number, "round": ctx.bracket_title,
+        "winner": _winner_side(record.get("winner", ""), record["p1"], record["p2"]),
+    }
+    if record.get("video_id"):
+        output["video_id"] = record["video_id"]
+    templates = None
+    if view.get("templates"):
+        # Only configured templates need the compiler; see title_generator
+        from src.templates.engine import get_templates
+        templates = get_templates(view, event_name)
+    output.update(generate_metadata(ctx, registry, event, view["tag_budget"], templates, fields))
+    return output, usage
+
+
+def resolve_event(record, view):
+    """
+    Returns the (event_name, event_number) a record belongs to: blank events
+    default to the view's default series, blank numbers to its latest edition.
+    """
+    event_name = record["event"] or view["default_event"]
+    event_number = record["number"] or view["events"].latest_number(event_name) or 1
+    return event_name, event_number
+
+
+def resolve_player(player_input, view):
+    """
+    Returns (display_name, default_chars) for a player as typed: the name
+    recorded for them, and their most used character (or "Unknown") for a
+    side reported without characters.
+    """
+    display_name, ranked = view["players"].get(player_input.lower(), (player_input, []))
+    return display_name, ranked[:1] or ["Unknown"]
+
+
+def _winner_side(winner, p1, p2):
+    """
+    Returns 1 or 2 for the winning side ("1", "p1" or player 1's name, ...), else 0.
+    """
+    winner = str(winner or "").strip().casefold()
+    if winner in ("1", "p1", p1.casefold()):
+        return 1
+    if winner in ("2", "p2", p2.casefold()):
+        return 2
+    return 0
+
+
+def _canonical_character(registry, name):
+    if not len(registry):
+        return name
+    canonical = registry.canonical(name)
+    if canonical is None:
+        raise ValueError(f"unknown character '{name}'")
+    return canonical
+
+
+def merge_usage(data, usage, display_names, events):
+    """
+    Applies usage increments ({(player_key, char): count}) and event editions
+    ({(name, number)}) to data, the same way the interactive flow would have
+    one set at a time. display_names supplies names for new players.
+    """
+    players = data.setdefault("players", {})
+    for (key, char), count in usage.items():
+        if key not in players:
+            players[key] = [display_names[key], {}]
+        char_dict = players[key][1]
+        char_dict[char] = char_dict.get(char, 0) + count
+    for name, number in sorted(events, key=lambda e: e[1]):
+        record_event_if_new(data, name, number)
+
+
+def apply_set_usage(data, output, usage):
+    """
+    Applies the usage increments of a single generate_set() result to data.
+    """
+    counts = Counter((key, char) for key, _, char in usage)
+    display_names = {key: display_name for key, display_name, _ in usage}
+    events = {(output["event"], output["number"])} if output["event"] else set()
+    merge_usage(data, counts, display_names, events)
@@ -0,0 +1,57 @@
+from src.events.rounds import best_of_for, format_bracket_title
+
+
+class SetContext:
+    """
+    Everything known about one set: players, canonical characters, event and round.
+    Title, tag and description generation are pure functions of a SetContext,
+    so they can be called from prompts, batch jobs or other tools alike.
+    """
+    __slots__ = (
+        "p1", "p2", "chars1", "chars2", "event_name", "event_number",
+        "round_type", "round_detail", "bracket_title", "best_of",
+    )
+
+    def __init__(self, p1, p2, chars1, chars2, event_name, event_number,
+                 round_type, round_detail="", best_of=None):
+        self.p1 = p1
+        self.p2 = p2
+        self.chars1 = list(chars1) or ["Unknown"]
+        self.chars2 = list(chars2) or ["Unknown"]
+        self.event_name = event_name
+        self.event_number = event_number
+        self.round_type = round_type
+        self.round_detail = round_detail
+        self.bracket_title = format_bracket_title(round_type, round_detail)
+        self.best_of = best_of or best_of_for(self.bracket_title)
+
+    @property
+    def p1_char(self):
+        return self.chars1[0]
+
+    @property
+    def p2_char(self):
+        return self.chars2[0]
+
+    @property
+    def event_title(self):
+        return f"{self.event_name} #{self.event_number}"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"SetContext({self.event_title} {self.bracket_title}: {self.p1} {self.chars1} vs {self.p2} {self.chars2})"
+
+
+def build_context(p1, p2, chars1, chars2, event_name, event_number,
+                  round_type, round_detail, registry):
+    """
+    Builds a SetContext, resolving every character to its canonical name.
+    """
+    return SetContext(
+        p1, p2,
+        [registry.main_name(c) for c in chars1],
+        [registry.main_name(c) for c in chars2],
+        event_name, event_number, round_type, round_detail,
+    )
@@ -0,0 +1,211 @@
+"""
+Speculative generation for the interactive flow.
+
+Long before the last prompt is answered, most of a set is predictable: once
+the players are named, their most played characters and the default event
+are what get_characters() and prompt_event_details() pick when the operator
+just presses Enter. The flow hands each such guess to the Speculator, which
+generates its tags on a background thread while the operator is still
+typing. Once the round type is entered, the title and description are
+generated too, for each round detail usually typed for it, and once the
+detail is entered, for that round only. When the set is complete, every
+output is taken from a guess that matches it exactly (a hit) or generated
+on the spot (a miss).
+
+A guess is keyed by every input of the output it produces, so a hit is
+always what generating directly would have given. The worker only sees
+strings, tuples, compiled templates and the character registry, never the
+data the prompts are editing.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.core.set_context import SetContext
+from src.description.description_generator import generate_description
+from src.tags.tag_generator import construct_tags
+from src.title.title_generator import generate_title
+
+# Generation is plain Python, so more threads would only wait on each other.
+WORKERS = 1
+
+# Round details generated ahead once the round type is known, spelled the
+# way they are usually typed at the round detail prompt.
+LIKELY_DETAILS = {
+    "Winners": ("r1", "r2", "r3", "qf", "sf", "f", "gf"),
+    "Losers": ("r1", "r2", "r3", "qf", "sf", "f", "gf"),
+    "Pools": ("",),
+}
+
+
+def speculation_enabled():
+    """
+    Speculation is on unless $SMASHVOD_SPECULATE is "0".
+    """
+    return os.environ.get("SMASHVOD_SPECULATE", "1") != "0"
+
+
+def _set_key(p1, p2, chars1, chars2, event_name, event_number):
+    # Same defaults as SetContext, so a guess and the final context compare equal
+    return p1, p2, tuple(chars1) or ("Unknown",), tuple(chars2) or ("Unknown",), event_name, event_number
+
+
+def _context_key(ctx):
+    return _set_key(ctx.p1, ctx.p2, ctx.chars1, ctx.chars2, ctx.event_name, ctx.event_number)
+
+
+def likely_rounds(round_type, round_detail=None):
+    """
+    The (round_type, round_detail) pairs worth generating ahead: the given
+    round, or every LIKELY_DETAILS entry while the detail is not known yet.
+    """
+    if round_detail is not None:
+        return ((round_type, round_detail),)
+    return tuple((round_type, detail) for detail in LIKELY_DETAILS.get(round_type, ()))
+
+
+def _links(event):
+    """
+    The parts of a stored event edition a description uses; a missing link
+    renders like an empty one.
+    """
+    event = event or {}
+    return event.get("playlist") or "", event.get("bracket") or ""
+
+
+def _tags(registry, set_key):
+    # Tags do not depend on the round, so one guess covers every round
+    version = registry.version
+    return version, construct_tags(SetContext(*set_key, ""), registry)
+
+
+def _title(set_key, round_type, round_detail, templates):
+    return generate_title(SetContext(*set_key, round_type, round_detail), templates)
+
+
+def _description(set_key, round_type, round_detail, links, templates):
+    playlist, bracket = links
+    event = {"playlist": playlist, "bracket": bracket}
+    return generate_description(SetContext(*set_key, round_type, round_detail), event, templates)
+
+
+class Speculator:
+    """
+    Generates the outputs of guessed sets in the background and hands them
+    out when the real set matches. Counts hits (taken from a guess), misses
+    (generated on the spot), and guesses started and discarded unused.
+    """
+
+    def __init__(self, workers=WORKERS, enabled=True):
+        self.workers = workers
+        self.enabled = enabled
+        self._pool = None
+        self._pending = {}
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def guess(self, registry, p1, p2, chars1, chars2, event_name, event_number, rounds=(),
+              templates=None, event=None):
+        """
+        Replaces the current guesses with this set: its tags and, for each
+        (round_type, round_detail) in rounds, its title and description.
+        event is the stored edition as it is now (its links go into the
+        description). Work for anything guessed before and still guessed
+        keeps running; the rest is cancelled. Titles are queued before
+        descriptions, since they are taken first.
+        """
+        if not self.enabled:
+            return
+        set_key = _set_key(p1, p2, chars1, chars2, event_name, event_number)
+        tasks = {("tags", set_key): (_tags, registry, set_key)}
+        links = _links(event)
+        for round_type, detail in rounds:
+            tasks[("title", set_key, round_type, detail, templates)] = (
+                _title, set_key, round_type, detail, templates)
+        for round_type, detail in rounds:
+            tasks[("description", set_key, round_type, detail, links, templates)] = (
+                _description, set_key, round_type, detail, links, templates)
+
+        for key in [key for key in self._pending if key not in tasks]:
+            self._drop(key)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="speculate")
+        for key, (fn, *args) in tasks.items():
+            if key not in self._pending:
+                self._pending[key] = self._pool.submit(fn, *args)
+                self.started += 1
+
+    def _drop(self, key):
+        self._pending.pop(key).cancel()
+        self.discarded += 1
+
+    def _take(self, key):
+        """
+        Returns (True, result) for a guess that has finished or is running
+        (waiting for it), or (False, None). A guess still queued is
+        cancelled: generating directly is quicker than waiting for its turn.
+        """
+        future = self._pending.pop(key, None)
+        if future is None or future.cancel():
+            return False, None
+        try:
+            return True, future.result()
+        except Exception:
+            # A failing guess is a miss; generating directly raises it properly
+            return False, None
+
+    def _count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hit
+
+    def title(self, ctx, templates):
+        found, title = self._take(("title", _context_key(ctx), ctx.round_type, ctx.round_detail, templates))
+        if self._count(found):
+            return title
+        return generate_title(ctx, templates)
+
+    def tags(self, ctx, registry):
+        found, result = self._take(("tags", _context_key(ctx)))
+        # A guess made before the alias table changed is stale
+        if self._count(found and result[0] == registry.version):
+            return result[1]
+        return construct_tags(ctx, registry)
+
+    def description(self, ctx, event, templates):
+        found, description = self._take(
+            ("description", _context_key(ctx), ctx.round_type, ctx.round_detail, _links(event), templates)
+        )
+        if self._count(found):
+            return description
+        return generate_description(ctx, event, templates)
+
+    def finish(self):
+        """
+        Discards whatever was guessed but not taken, at the end of a set.
+        """
+        for key in list(self._pending):
+            self._drop(key)
+
+    def stats(self):
+        taken = self.hits + self.misses
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "hit_rate": self.hits / taken if taken else 0.0,
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"speculation: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%} hit rate), {stats['started']} guesses started, "
+                f"{stats['discarded']} discarded")
+
+
+# Shared by the interactive flow in this process.
+speculator = Speculator(enabled=speculation_enabled())
@@ -0,0 +1,72 @@
+import argparse
+import json
+import sys
+
+from src.core.cli import add_set_arguments
+from src.daemon.client import DaemonClient
+
+SET_OPS = ["title", "tags", "description", "all"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.daemon",
+        description="Run the metadata daemon, or send it a request."
+    )
+    parser.add_argument("--socket", help="Unix socket path (default: per-user socket in the temp directory)")
+    parser.add_argument("--port", type=int, help="use localhost TCP on this port instead of a Unix socket")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="load the data once and serve requests")
+    serve.add_argument("--data", help="data file (default: $SMASHVOD_DATA or data.json)")
+    serve.add_argument("--flush-interval", type=float, default=5.0, help="seconds between write-behind saves")
+
+    for op in SET_OPS:
+        add_set_arguments(sub.add_parser(op, help=f"generate the {op} for a set" if op != "all" else "generate everything for a set"))
+
+    complete = sub.add_parser("complete", help="complete a player, character, event or round prefix")
+    complete.add_argument("kind", choices=["players", "characters", "events", "rounds"])
+    complete.add_argument("text", nargs="?", default="")
+    complete.add_argument("--limit", type=int, default=20)
+
+    sub.add_parser("flush", help="save pending usage updates now")
+    sub.add_parser("ping", help="check that the daemon is running")
+    sub.add_parser("stop", help="flush and stop the daemon")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        from src.daemon.server import serve
+        serve(args.socket, args.port, args.data, args.flush_interval)
+        return
+
+    try:
+        client = DaemonClient(args.socket, args.port)
+    except OSError as e:
+        sys.exit(f"Cannot reach the daemon ({e}). Start it with: python -m src.daemon serve")
+
+    with client:
+        if args.command in SET_OPS:
+            response = client.request(
+                args.command, p1=args.p1, p2=args.p2, p1_chars=args.c1, p2_chars=args.c2,
+                event=args.event, number=args.number, round_type=args.round_type,
+                round=args.round, record=args.record
+            )
+            if args.json:
+                print(json.dumps(response, ensure_ascii=False, indent=2))
+            else:
+                print("\n\n".join(response[k] for k in ("title", "tags", "description") if k in response))
+        elif args.command == "complete":
+            response = client.request("complete", kind=args.kind, text=args.text, limit=args.limit)
+            print("\n".join(response["matches"]))
+        elif args.command == "stop":
+            client.request("shutdown")
+        else:
+            print(json.dumps(client.request(args.command)))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except RuntimeError as e:
+        sys.exit(f"Error: {e}")
@@ -0,0 +1,44 @@
+import json
+import socket
+
+from src.daemon.protocol import parse_address
+
+
+class DaemonClient:
+    """
+    Keeps one connection to the daemon open and sends requests over it.
+    """
+
+    def __init__(self, socket_path=None, port=None, timeout=10.0):
+        address = parse_address(socket_path, port)
+        family = socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(address)
+        self._file = self._sock.makefile("rwb")
+
+    def request(self, op, **fields):
+        """
+        Sends one request and returns the response dict.
+        Raises RuntimeError if the daemon reports an error.
+        """
+        payload = dict(op=op, **fields)
+        self._file.write((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("daemon closed the connection")
+        response = json.loads(line)
+        if not response.pop("ok", False):
+            raise RuntimeError(response.get("error", "request failed"))
+        return response
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,27 @@
+import os
+import socket
+import tempfile
+
+# Requests and responses are single JSON objects, one per line, e.g.
+#   {"op": "all", "p1": "hertsu", "p2": "dasuki", "round_type": "Losers", "round": "sf"}
+#   {"ok": true, "title": "...", "tags": "...", "description": "..."}
+# Errors come back as {"ok": false, "error": "..."}.
+DEFAULT_PORT = 8765
+
+
+def default_address():
+    """
+    Returns where the daemon listens unless told otherwise: a per-user Unix
+    domain socket in the temp directory, or localhost TCP where Unix sockets
+    are not available.
+    """
+    if hasattr(socket, "AF_UNIX"):
+        user = os.getuid() if hasattr(os, "getuid") else "user"
+        return os.path.join(tempfile.gettempdir(), f"smashvod-{user}.sock")
+    return ("127.0.0.1", DEFAULT_PORT)
+
+
+def parse_address(socket_path=None, port=None):
+    if port:
+        return ("127.0.0.1", port)
+    return socket_path or default_address()
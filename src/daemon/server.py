@@ -0,0 +1,205 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+
+from src.batch.manifest import normalize_record
+from src.core.fragments import fragment_cache
+from src.core.resolve import apply_set_usage, generate_set, live_view
+from src.daemon.protocol import parse_address
+from src.data.loader import load_data
+from src.data.saver import save_data
+from src.events.event_store import get_event_store
+from src.events.rounds import ROUND_DETAIL_OPTIONS
+from src.history.store import HistoryStore
+from src.players.completion import CompletionIndex, player_index
+from src.players.roster import compact_players
+from src.tags.limits import TAG_CHAR_LIMIT
+
+GENERATE_OPS = {"title": ("title",), "tags": ("tags",), "description": ("description",),
+                "all": ("title", "tags", "description")}
+
+
+class MetadataService:
+    """
+    Holds the data in memory and answers requests against it.
+    Usage-count updates are applied in memory and written back in batches by
+    flush(), which the server calls every flush_interval seconds while there
+    are unsaved changes (write-behind), and once more on shutdown.
+    Players are kept in a compact Roster while the service runs.
+    """
+
+    def __init__(self, data, data_path=None):
+        self.data = data
+        compact_players(data)
+        self.data_path = data_path
+        self.lock = threading.RLock()
+        self.pending_updates = 0
+        self.history = HistoryStore.open(data_path, load_rows=False)
+        self._player_index = None
+
+    def handle(self, request):
+        op = request.get("op")
+        if op in GENERATE_OPS:
+            return self.generate(request, GENERATE_OPS[op])
+        if op == "complete":
+            return self.complete(request)
+        if op == "flush":
+            return {"saved": self.flush()}
+        if op == "ping":
+            return {
+                "pending_updates": self.pending_updates,
+                "players": len(self.data["players"]),
+                "fragment_cache": fragment_cache.stats(),
+            }
+        raise ValueError(f"unknown op {op!r}")
+
+    def generate(self, request, fields):
+        """
+        Generates metadata for one set. With "record": true, the set's usage
+        counts and event edition are recorded like the interactive flow does,
+        and the set is added to the history.
+        """
+        record = normalize_record(request)
+        with self.lock:
+            output, usage = generate_set(
+                record, live_view(self.data, request.get("tag_budget") or TAG_CHAR_LIMIT), fields
+            )
+            if request.get("record"):
+                new_players = any(key not in self.data["players"] for key, _, _ in usage)
+                apply_set_usage(self.data, output, usage)
+                self.history.append(
+                    output["p1"], output["p2"], output["p1_chars"][0], output["p2_chars"][0],
+                    output["event"], output["number"], output["round"], output["winner"]
+                )
+                self.pending_updates += 1
+                if new_players:
+                    self._player_index = None
+        response = {k: output[k] for k in ("p1", "p2", "p1_chars", "p2_chars", "event", "number", "round")}
+        response.update({k: output[k] for k in fields})
+        return response
+
+    def complete(self, request):
+        kind = request.get("kind", "players")
+        text = request.get("text", "")
+        limit = int(request.get("limit", 20))
+        with self.lock:
+            if kind == "players":
+                index = self._players()
+            elif kind == "characters":
+                index = CompletionIndex(self.data.get("character_list", []))
+            elif kind == "events":
+                store = get_event_store(self.data)
+                index = CompletionIndex(store.series_names(), store.edition_counts())
+            elif kind == "rounds":
+                index = ROUND_DETAIL_OPTIONS
+            else:
+                raise ValueError(f"unknown completion kind {kind!r}")
+            return {"matches": index.top(text, limit), "total": index.count(text)}
+
+    def _players(self):
+        if self._player_index is None:
+            self._player_index = player_index(self.data["players"])
+        return self._player_index
+
+    def flush(self):
+        """
+        Saves the data if there are unsaved updates. Returns True if it saved.
+        """
+        with self.lock:
+            if not self.pending_updates:
+                return False
+            save_data(self.data, self.data_path)
+            self.history.flush()
+            self.pending_updates = 0
+            return True
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # One connection may carry any number of requests, one per line.
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request must be a JSON object")
+                if request.get("op") == "shutdown":
+                    response = {"ok": True}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    response = dict(ok=True, **self.server.service.handle(request))
+            except (ValueError, KeyError, TypeError) as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+class _TcpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def make_server(service, address):
+    """
+    Creates a threaded server for service on a Unix socket path or a
+    (host, port) tuple.
+    """
+    if isinstance(address, tuple):
+        server = _TcpServer(address, _Handler)
+    else:
+        if os.path.exists(address):
+            _remove_stale_socket(address)
+        server = _UnixServer(address, _Handler)
+    server.service = service
+    return server
+
+
+def _remove_stale_socket(path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise OSError(f"a daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+def serve(socket_path=None, port=None, data_path=None, flush_interval=5.0, log=print):
+    """
+    Loads the data once and serves requests until a "shutdown" request or
+    Ctrl-C, flushing usage updates every flush_interval seconds.
+    """
+    address = parse_address(socket_path, port)
+    service = MetadataService(load_data(data_path), data_path)
+    server = make_server(service, address)
+    stop = threading.Event()
+
+    def flusher():
+        while not stop.wait(flush_interval):
+            service.flush()
+
+    threading.Thread(target=flusher, daemon=True).start()
+    log(f"Serving on {address} ({len(service.data['players'])} players loaded)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+        if not isinstance(address, tuple) and os.path.exists(address):
+            os.unlink(address)
+        started = time.perf_counter()
+        if service.flush():
+            log(f"Saved pending updates in {(time.perf_counter() - started) * 1000:.1f} ms")
@@ -1,25 +1,10 @@
-def load_data():
-    """
-    Loads the JSON from data.json.
-    - If it’s already in the new format (top-level “players” & “events”), use it.
-    - If it’s an older flat dict of players, migrate it under “players”.
-    """
-    import os
-    import json
-
-    DATA_FILE = "data.json"
-
-    if not os.path.exists(DATA_FILE):
-        return {"players": {}, "events": [], "character_list": [], "character_aliases": {}}
+from src.data.storage import get_storage
 
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        raw = json.load(f)
 
-    if isinstance(raw, dict) and "players" in raw and "events" in raw:
-        if "character_list" not in raw:
-            raw["character_list"] = []
-        if "character_aliases" not in raw:
-            raw["character_aliases"] = {}
-        return raw
-
-    return {"players": raw, "events": [], "character_list": [], "character_aliases": {}}
\ No newline at end of file
+def load_data(path=None):
+    """
+    Loads the players, events and character tables.
+    Uses data.json by default; see get_storage() for choosing another file or
+    the SQLite backend. Older flat player dicts are migrated under “players”.
+    """
+    return get_storage(path).load()
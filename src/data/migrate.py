@@ -0,0 +1,20 @@
+import argparse
+
+from src.data.sqlite_storage import migrate_json_to_sqlite
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.data.migrate",
+        description="Copy a data.json file into a SQLite database."
+    )
+    parser.add_argument("json_path", nargs="?", default="data.json")
+    parser.add_argument("db_path", nargs="?", default="data.db")
+    args = parser.parse_args()
+
+    count = migrate_json_to_sqlite(args.json_path, args.db_path)
+    print(f"Migrated {count} players from {args.json_path} to {args.db_path}")
+
+
+if __name__ == "__main__":
+    main()
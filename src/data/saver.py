@@ -1,9 +1,10 @@
-import json
+from src.data.storage import get_storage
 
 
-def save_data(data):
+def save_data(data, path=None):
     """
-    Saves the combined structure ({ "players": {...}, "events": [...] }) back to disk.
+    Saves the combined structure ({ "players": {...}, "events": [...] }) back to
+    the storage it was loaded from. Nothing is written if nothing changed.
+    Returns a SaveReport (bytes written, time taken, what changed).
     """
-    with open("data.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+    return get_storage(path).save(data)
@@ -0,0 +1,526 @@
+"""
+Compiled snapshot of a JSON data file, for loading large files without parsing them.
+
+data.snapshot sits next to data.json and is rebuilt whenever the JSON file is
+saved (copying the players and events that did not change) or found to have
+changed. It is memory-mapped read-only, so opening it
+costs the same however large the roster is, and processes reading the same
+snapshot share its pages. Layout (little- or big-endian as the machine that
+wrote it, recorded in the magic):
+
+    header     magic, format, source stamp (inode, size, mtime) and SHA-1
+    directory  (offset, length) of each section below
+    layout     JSON: top-level key order, and every section other than
+               players and events (character tables, templates, ...)
+    players    the players as one compact JSON object
+    player_spans    uint32 (key start, value start, value end) per player,
+                    offsets into players
+    player_order    uint32 player positions sorted by encoded key
+    roster     JSON [[keys], [display names], [total usages]] in file order,
+               for completion and fuzzy lookups that need no character counts
+    events     the events as one compact JSON array
+    event_spans     uint32 (start, end) per event, offsets into events
+    series     JSON [[name, [numbers], [positions]], ...]: the EventStore
+               index, editions sorted by number
+
+A single player or event is decoded from its own span when looked up (a
+binary search for players); anything that needs all of them parses the
+whole section at once, which costs what parsing data.json did.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from json.encoder import c_make_encoder, encode_basestring
+
+from src.data.storage import _to_json, write_atomic
+from src.data.tracked import _ENTRIES, TrackedList, TrackedSection, _adopt, _event_entry, stored_items, track
+
+FORMAT = 2
+MAGIC = b"SVSNAP" + (b"LE" if sys.byteorder == "little" else b"BE")
+HEADER = struct.Struct("<8sIQQq20s")
+SECTION = struct.Struct("<QQ")
+SECTIONS = ("layout", "players", "player_spans", "player_order", "roster", "events", "event_spans", "series")
+_ALIGN = 8
+_MAX_OFFSET = 2 ** 32 - 1
+
+
+def snapshot_path(source_path):
+    """
+    Returns the snapshot kept next to a data file, e.g. data.snapshot.
+    """
+    return f"{os.path.splitext(source_path)[0]}.snapshot"
+
+
+def _stamp(source_path):
+    st = os.stat(source_path)
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _compact_encoder():
+    # One C encoder reused for every record: encoding each record on its own
+    # then costs about what encoding them all at once does
+    if c_make_encoder is None:
+        return json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_to_json).encode
+    iterencode = c_make_encoder(None, _to_json, encode_basestring, None, ":", ",", False, False, True)
+    return lambda value: "".join(iterencode(value, 0))
+
+
+def _checked(section):
+    if len(section) > _MAX_OFFSET:
+        raise ValueError("section too large for a snapshot")
+    return section
+
+
+def _roster_entry(key, value):
+    try:
+        display_name, char_dict = value
+        return display_name, sum(char_dict.values())
+    except (TypeError, ValueError, AttributeError):
+        raise ValueError(f"player {key!r} is not [display name, {{character: count}}]") from None
+
+
+def _players_section(players, previous=None, changed=()):
+    """
+    Returns the players, player_spans, player_order and roster sections.
+    Entries of previous that are not in changed are copied rather than
+    encoded again.
+    """
+    encode = _compact_encoder()
+    reusable = previous.player_count() if previous is not None else 0
+    same_keys = len(players) == reusable
+    keys = []
+    parts = []
+    names = []
+    weights = []
+    spans = array("I")
+    offset = 1
+    for position, (key, value) in enumerate(stored_items(players)):
+        display_name, weight = _roster_entry(key, value)
+        names.append(display_name)
+        weights.append(weight)
+        key_bytes = encode_basestring(key).encode("utf-8")
+        part = previous.player_bytes(position) if position < reusable else None
+        # Positions only line up with previous while no entry was removed
+        if part is not None and not part.startswith(key_bytes + b":"):
+            part = None
+            same_keys = False
+        if part is None or key in changed:
+            part = key_bytes + b":" + encode(value).encode("utf-8")
+        spans.extend((offset, offset + len(key_bytes) + 1, offset + len(part)))
+        offset += len(part) + 1
+        keys.append(key_bytes)
+        parts.append(part)
+    section = _checked(b"{" + b",".join(parts) + b"}")
+
+    if same_keys:
+        order = previous.section_bytes("player_order")
+    else:
+        order = array("I", sorted(range(len(keys)), key=keys.__getitem__)).tobytes()
+    roster = encode([list(players), names, weights]).encode("utf-8")
+    return section, spans.tobytes(), order, roster
+
+
+def _events_section(events, previous=None, changed=()):
+    """
+    Returns the events, event_spans and series sections, copying the records
+    of previous that are not in changed like _players_section(). A record is
+    marked under the (name, number) it had when it was loaded, so editing
+    either in place is checked under both the old and the new key.
+    """
+    encode = _compact_encoder()
+    reusable = previous.event_count() if previous is not None else 0
+    series = {}
+    parts = []
+    spans = array("I")
+    offset = 1
+    for position, record in enumerate(events):
+        if not isinstance(record, dict) or not isinstance(record.get("name"), str) \
+                or type(record.get("number")) is not int:
+            raise ValueError(f"event {position} has no name and number")
+        # Same rules as EventStore: the first record of a series names it,
+        # and the first record of an edition wins
+        name, numbers = series.setdefault(record["name"].casefold(), (record["name"], {}))
+        numbers.setdefault(record["number"], position)
+
+        if position < reusable and _event_entry(record) not in changed \
+                and getattr(record, "_entry", None) not in changed:
+            part = previous.event_bytes(position)
+        else:
+            part = encode(record).encode("utf-8")
+        spans.extend((offset, offset + len(part)))
+        offset += len(part) + 1
+        parts.append(part)
+    section = _checked(b"[" + b",".join(parts) + b"]")
+
+    index = []
+    for name, numbers in series.values():
+        ordered = sorted(numbers)
+        index.append([name, ordered, [numbers[n] for n in ordered]])
+    return section, spans.tobytes(), encode(index).encode("utf-8")
+
+
+def write_snapshot(source_path, data, source_bytes, previous=None):
+    """
+    Compiles data, which must be what source_path holds (source_bytes), into
+    the snapshot next to it and returns it as a Snapshot. previous is the
+    Snapshot data was loaded from or last written to, if any: players and
+    events that data.changes does not list are copied from it, so only what
+    changed is encoded again. Raises ValueError for data the snapshot format
+    cannot hold (players that are not a dict, events without a name and
+    number); the JSON file stays the only copy then.
+    """
+    stamp = _stamp(source_path)
+    players = data.get("players", {})
+    if hasattr(players, "to_json"):
+        players = players.to_json()
+    events = data.get("events", [])
+    if not isinstance(players, dict) or not isinstance(events, list):
+        raise ValueError("players must be a dict and events a list")
+
+    layout = {
+        "keys": list(data),
+        "other": {key: value for key, value in data.items() if key not in ("players", "events")},
+    }
+    sections = {"layout": json.dumps(layout, ensure_ascii=False, default=_to_json).encode("utf-8")}
+    sections["players"], sections["player_spans"], sections["player_order"], sections["roster"] = _players_section(
+        players, *_reusable(previous, data, "players")
+    )
+    sections["events"], sections["event_spans"], sections["series"] = _events_section(
+        events, *_reusable(previous, data, "events")
+    )
+
+    directory = []
+    body = []
+    offset = HEADER.size + SECTION.size * len(SECTIONS)
+    for name in SECTIONS:
+        padding = -offset % _ALIGN
+        body.append(b"\0" * padding)
+        offset += padding
+        directory.append(SECTION.pack(offset, len(sections[name])))
+        body.append(sections[name])
+        offset += len(sections[name])
+
+    header = HEADER.pack(MAGIC, FORMAT, *stamp, hashlib.sha1(source_bytes).digest())
+    path = snapshot_path(source_path)
+    write_atomic(path, b"".join([header, *directory, *body]))
+    return Snapshot(path)
+
+
+def _reusable(previous, data, section):
+    """
+    Returns (previous, changed entries) for one section, or (None, ()) when
+    nothing can be copied: the section changed as a whole, or it is held by
+    something that does not track its entries (a Roster).
+    """
+    if previous is None or hasattr(data[section], "to_json"):
+        return None, ()
+    entries = data.changes.changed.get(section, ())
+    if None in entries:
+        return None, ()
+    return previous, entries
+
+
+class Snapshot:
+    """
+    A snapshot file mapped read-only. Sections are memoryviews into the
+    mapping; nothing is decoded until asked for.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size + SECTION.size * len(SECTIONS):
+            raise ValueError(f"{path} is truncated")
+        magic, version, *stamp, digest = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT:
+            raise ValueError(f"{path} is not a snapshot this version can read")
+        self.stamp = tuple(stamp)
+        self.digest = digest
+
+        view = memoryview(self._map)
+        self._sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = SECTION.unpack_from(self._map, HEADER.size + i * SECTION.size)
+            if offset + length > len(self._map):
+                raise ValueError(f"{path} is truncated")
+            self._sections[name] = view[offset:offset + length]
+        self._player_spans = self._sections["player_spans"].cast("I")
+        self._player_order = self._sections["player_order"].cast("I")
+        self._event_spans = self._sections["event_spans"].cast("I")
+
+    def section_bytes(self, name):
+        return self._sections[name].tobytes()
+
+    def load(self):
+        """
+        Returns the data, tracked like a normal load, with players and events
+        left in the snapshot until used.
+        """
+        layout = json.loads(self.section_bytes("layout"))
+        data = track(layout["other"])
+        sections = {"players": SnapshotPlayers(), "events": SnapshotEvents([_PENDING] * self.event_count())}
+        for section, container in sections.items():
+            container._tracker = data.changes
+            container._section = section
+            container._entry = _ENTRIES
+            container._snapshot = self
+
+        # Back in the order of the file
+        ordered = {key: sections[key] if key in sections else dict.__getitem__(data, key) for key in layout["keys"]}
+        dict.clear(data)
+        dict.update(data, ordered)
+        return data
+
+    # Players
+
+    def player_count(self):
+        return len(self._player_order)
+
+    def _player_position(self, key):
+        target = encode_basestring(key).encode("utf-8")
+        players, spans, order = self._sections["players"], self._player_spans, self._player_order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = order[mid] * 3
+            found = players[spans[i]:spans[i + 1] - 1].tobytes()
+            if found == target:
+                return order[mid]
+            if found < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return -1
+
+    def has_player(self, key):
+        return isinstance(key, str) and self._player_position(key) >= 0
+
+    def player(self, key):
+        """
+        Returns the [display_name, {character: count}] entry for key, or None.
+        """
+        if not isinstance(key, str):
+            return None
+        position = self._player_position(key)
+        if position < 0:
+            return None
+        i = position * 3
+        return json.loads(self._sections["players"][self._player_spans[i + 1]:self._player_spans[i + 2]].tobytes())
+
+    def players(self):
+        """
+        Returns every player as a plain dict, in file order.
+        """
+        return json.loads(self.section_bytes("players"))
+
+    def roster(self):
+        """
+        Returns [keys, display names, total usages], three lists in file
+        order, without decoding anyone's character counts.
+        """
+        return json.loads(self.section_bytes("roster"))
+
+    def player_bytes(self, position):
+        """
+        Returns the encoded "key":[...] of the player at position.
+        """
+        i = position * 3
+        return self._sections["players"][self._player_spans[i]:self._player_spans[i + 2]].tobytes()
+
+    # Events
+
+    def event_count(self):
+        return len(self._event_spans) // 2
+
+    def event_bytes(self, position):
+        spans = self._event_spans
+        return self._sections["events"][spans[position * 2]:spans[position * 2 + 1]].tobytes()
+
+    def event(self, position):
+        return json.loads(self.event_bytes(position))
+
+    def events(self):
+        return json.loads(self.section_bytes("events"))
+
+    def series(self):
+        """
+        Returns [[name, [numbers], [positions]], ...], one per event series.
+        """
+        return json.loads(self.section_bytes("series"))
+
+
+def _loading(method):
+    # Whole-section operations decode everything first, then behave as usual
+    def load_all_first(self, *args, **kwargs):
+        self.materialize()
+        return method(self, *args, **kwargs)
+    load_all_first.__name__ = method.__name__
+    return load_all_first
+
+
+class SnapshotPlayers(TrackedSection):
+    """
+    data["players"] read from a snapshot: each entry is decoded the first
+    time it is looked up, and the whole section when iterated, copied or
+    deleted from. Adding or replacing entries needs nothing decoded.
+    """
+    __slots__ = ("_snapshot",)
+
+    def __missing__(self, key):
+        entry = self._snapshot.player(key) if self._snapshot is not None else None
+        if entry is None:
+            raise KeyError(key)
+        entry = _adopt(entry, self._tracker, self._section, key)
+        dict.__setitem__(self, key, entry)
+        return entry
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or (self._snapshot is not None and self._snapshot.has_player(key))
+
+    def __len__(self):
+        if self._snapshot is None:
+            return dict.__len__(self)
+        added = sum(1 for key in dict.keys(self) if not self._snapshot.has_player(key))
+        return self._snapshot.player_count() + added
+
+    def roster(self):
+        """
+        Returns (keys, display names, total usages), three lists in iteration
+        order, or None once every entry was decoded. Players not looked up yet
+        are read from the snapshot's roster table, so no character counts are
+        decoded for them.
+        """
+        if self._snapshot is None:
+            return None
+        keys, names, weights = self._snapshot.roster()
+        for key, (display_name, char_dict) in dict.items(self):
+            position = self._snapshot._player_position(key)
+            if position < 0:
+                keys.append(key)
+                names.append(display_name)
+                weights.append(sum(char_dict.values()))
+            else:
+                names[position] = display_name
+                weights[position] = sum(char_dict.values())
+        return keys, names, weights
+
+    def materialize(self):
+        """
+        Decodes every entry not looked up yet, keeping the file order.
+        """
+        if self._snapshot is None:
+            return
+        seen = dict(dict.items(self))
+        dict.clear(self)
+        dict.update(self, self._snapshot.players())
+        dict.update(self, seen)
+        self._snapshot = None
+
+    __iter__ = _loading(dict.__iter__)
+    __reversed__ = _loading(dict.__reversed__)
+    __repr__ = _loading(dict.__repr__)
+    __eq__ = _loading(dict.__eq__)
+    __or__ = _loading(dict.__or__)
+    __reduce__ = _loading(TrackedSection.__reduce__)
+    keys = _loading(dict.keys)
+    values = _loading(TrackedSection.values)
+    items = _loading(TrackedSection.items)
+    copy = _loading(dict.copy)
+    pop = _loading(TrackedSection.pop)
+    popitem = _loading(TrackedSection.popitem)
+    clear = _loading(TrackedSection.clear)
+    __delitem__ = _loading(TrackedSection.__delitem__)
+
+
+# Stands in for an event not decoded yet
+_PENDING = object()
+
+
+class SnapshotEvents(TrackedList):
+    """
+    data["events"] read from a snapshot: a list of the right length whose
+    records are decoded when indexed, and all at once when iterated, sliced
+    or reordered. Appending needs nothing decoded.
+    """
+    __slots__ = ("_snapshot",)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self.materialize()
+            return list.__getitem__(self, index)
+        record = list.__getitem__(self, index)
+        if record is _PENDING:
+            position = index % len(self)
+            record = self._snapshot.event(position)
+            record = _adopt(record, self._tracker, self._section, _event_entry(record))
+            list.__setitem__(self, position, record)
+        return record
+
+    def series_index(self):
+        """
+        Returns (the snapshot's [[name, [numbers], [positions]], ...], number
+        of records it covers), or None once the records were all decoded.
+        Records appended since loading come after the ones it covers.
+        """
+        if self._snapshot is None:
+            return None
+        return self._snapshot.series(), self._snapshot.event_count()
+
+    def materialize(self):
+        """
+        Decodes every record not looked up yet.
+        """
+        if self._snapshot is None:
+            return
+        for position, record in enumerate(self._snapshot.events()):
+            if list.__getitem__(self, position) is _PENDING:
+                list.__setitem__(self, position, _adopt(record, self._tracker, self._section, _event_entry(record)))
+        self._snapshot = None
+
+    __iter__ = _loading(list.__iter__)
+    __reversed__ = _loading(list.__reversed__)
+    __contains__ = _loading(list.__contains__)
+    __repr__ = _loading(list.__repr__)
+    __eq__ = _loading(list.__eq__)
+    __add__ = _loading(list.__add__)
+    __reduce__ = _loading(TrackedList.__reduce__)
+    index = _loading(list.index)
+    count = _loading(list.count)
+    copy = _loading(list.copy)
+    insert = _loading(TrackedList.insert)
+    pop = _loading(TrackedList.pop)
+    remove = _loading(TrackedList.remove)
+    sort = _loading(TrackedList.sort)
+    reverse = _loading(TrackedList.reverse)
+    __setitem__ = _loading(TrackedList.__setitem__)
+    __delitem__ = _loading(TrackedList.__delitem__)
+    __imul__ = _loading(TrackedList.__imul__)
+
+
+def open_snapshot(source_path):
+    """
+    Returns the Snapshot of source_path, or None if there is none or it was
+    built from other content. A snapshot whose source was only touched
+    (same SHA-1, e.g. after a checkout) is restamped and used.
+    """
+    path = snapshot_path(source_path)
+    try:
+        snapshot = Snapshot(path)
+        stamp = _stamp(source_path)
+    except (OSError, ValueError):
+        return None
+    if snapshot.stamp != stamp:
+        with open(source_path, "rb") as f:
+            if hashlib.sha1(f.read()).digest() != snapshot.digest:
+                return None
+        try:
+            with open(path, "r+b") as f:
+                f.write(HEADER.pack(MAGIC, FORMAT, *stamp, snapshot.digest))
+        except OSError:
+            pass
+        snapshot.stamp = stamp
+    return snapshot
@@ -0,0 +1,259 @@
+import json
+import sqlite3
+import time
+
+from src.data.storage import SaveReport, empty_data
+from src.data.tracked import stored_items, track, unsaved_changes
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    key TEXT PRIMARY KEY,
+    display_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS character_usage (
+    player_key TEXT NOT NULL,
+    character TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (player_key, character)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_character_usage_character ON character_usage (character);
+CREATE TABLE IF NOT EXISTS characters (
+    position INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS character_aliases (
+    main TEXT NOT NULL,
+    alias TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (main, alias)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_character_aliases_alias ON character_aliases (alias);
+CREATE TABLE IF NOT EXISTS events (
+    name TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    playlist TEXT,
+    bracket TEXT,
+    extra TEXT,
+    PRIMARY KEY (name, number)
+);
+CREATE INDEX IF NOT EXISTS idx_events_name ON events (name COLLATE NOCASE, number);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Top-level keys with their own tables; any other key (e.g. "templates") is
+# stored as JSON in the settings table.
+TABLE_KEYS = ("players", "events", "character_list", "character_aliases")
+
+# Event keys with their own column; anything else is kept as JSON in "extra".
+EVENT_COLUMNS = ("name", "number", "playlist", "bracket")
+
+
+def _rows(data):
+    """
+    Flattens data into the row sets stored in each table, keyed by primary key.
+    """
+    players = {}
+    usage = {}
+    for key, (display_name, char_dict) in stored_items(data.get("players", {})):
+        players[key] = display_name
+        for char, count in char_dict.items():
+            usage[(key, char)] = count
+
+    aliases = {}
+    for main, alias_list in stored_items(data.get("character_aliases", {})):
+        for position, alias in enumerate(alias_list):
+            aliases[(main, alias)] = position
+        if not alias_list:
+            # Keep mains with an empty alias list
+            aliases[(main, "")] = -1
+
+    events = {}
+    for position, e in enumerate(data.get("events", [])):
+        extra = {k: v for k, v in e.items() if k not in EVENT_COLUMNS}
+        events[(e["name"], e["number"])] = (
+            position, e.get("playlist"), e.get("bracket"),
+            json.dumps(extra, ensure_ascii=False) if extra else None,
+        )
+
+    settings = {
+        key: json.dumps(value, ensure_ascii=False, sort_keys=True)
+        for key, value in data.items() if key not in TABLE_KEYS
+    }
+
+    return {
+        "settings": settings,
+        "players": players,
+        "usage": usage,
+        "characters": tuple(data.get("character_list", [])),
+        "aliases": aliases,
+        "events": events,
+    }
+
+
+def _changed(old, new):
+    """
+    Returns (upserts, deletes) between two keyed row sets.
+    """
+    upserts = {k: v for k, v in new.items() if old.get(k) != v}
+    deletes = [k for k in old if k not in new]
+    return upserts, deletes
+
+
+class SqliteStorage:
+    """
+    Stores data in an indexed SQLite database.
+    Saving compares against what was last loaded or saved and only writes the
+    rows that changed. Character counts are written as increments, so two
+    stations sharing one database (WAL mode) do not overwrite each other's
+    usage updates. Loaded data tracks its changes, so saving it unchanged
+    skips even the comparison.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._rows = _rows(empty_data())
+        self._current = None
+
+    def connect(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def load(self):
+        conn = self.connect()
+        data = empty_data()
+
+        players = data["players"]
+        for key, display_name in conn.execute("SELECT key, display_name FROM players ORDER BY rowid"):
+            players[key] = [display_name, {}]
+        for key, char, count in conn.execute(
+            "SELECT player_key, character, count FROM character_usage ORDER BY player_key, count DESC"
+        ):
+            if key in players:
+                players[key][1][char] = count
+
+        data["character_list"] = [name for (name,) in conn.execute("SELECT name FROM characters ORDER BY position")]
+
+        aliases = data["character_aliases"]
+        for main, alias, position in conn.execute(
+            "SELECT main, alias, position FROM character_aliases ORDER BY main, position"
+        ):
+            alias_list = aliases.setdefault(main, [])
+            if position >= 0:
+                alias_list.append(alias)
+
+        for name, number, playlist, bracket, extra in conn.execute(
+            "SELECT name, number, playlist, bracket, extra FROM events ORDER BY position"
+        ):
+            event = {"name": name, "number": number}
+            if playlist is not None:
+                event["playlist"] = playlist
+            if bracket is not None:
+                event["bracket"] = bracket
+            if extra:
+                event.update(json.loads(extra))
+            data["events"].append(event)
+
+        for key, value in conn.execute("SELECT key, value FROM settings"):
+            data[key] = json.loads(value)
+
+        self._rows = _rows(data)
+        data = self._current = track(data)
+        return data
+
+    def save(self, data):
+        """
+        Writes the rows that changed since the last load or save. Returns a SaveReport.
+        """
+        started = time.perf_counter()
+        changes = unsaved_changes(data)
+        if changes == {} and data is self._current:
+            return SaveReport(self.path, changes, None, time.perf_counter() - started)
+
+        conn = self.connect()
+        old = self._rows
+        new = _rows(data)
+
+        with conn:
+            upserts, deletes = _changed(old["settings"], new["settings"])
+            conn.executemany(
+                "INSERT INTO settings (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                upserts.items()
+            )
+            conn.executemany("DELETE FROM settings WHERE key = ?", [(k,) for k in deletes])
+
+            upserts, deletes = _changed(old["players"], new["players"])
+            conn.executemany(
+                "INSERT INTO players (key, display_name) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET display_name = excluded.display_name",
+                upserts.items()
+            )
+            conn.executemany("DELETE FROM character_usage WHERE player_key = ?", [(k,) for k in deletes])
+            conn.executemany("DELETE FROM players WHERE key = ?", [(k,) for k in deletes])
+
+            upserts, deletes = _changed(old["usage"], new["usage"])
+            conn.executemany(
+                "INSERT INTO character_usage (player_key, character, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (player_key, character) DO UPDATE SET count = count + excluded.count",
+                [(key, char, count - old["usage"].get((key, char), 0)) for (key, char), count in upserts.items()]
+            )
+            conn.executemany("DELETE FROM character_usage WHERE player_key = ? AND character = ?", deletes)
+
+            if old["characters"] != new["characters"]:
+                conn.execute("DELETE FROM characters")
+                conn.executemany("INSERT INTO characters (position, name) VALUES (?, ?)", enumerate(new["characters"]))
+
+            upserts, deletes = _changed(old["aliases"], new["aliases"])
+            conn.executemany(
+                "INSERT INTO character_aliases (main, alias, position) VALUES (?, ?, ?) "
+                "ON CONFLICT (main, alias) DO UPDATE SET position = excluded.position",
+                [(main, alias, position) for (main, alias), position in upserts.items()]
+            )
+            conn.executemany("DELETE FROM character_aliases WHERE main = ? AND alias = ?", deletes)
+
+            upserts, deletes = _changed(old["events"], new["events"])
+            conn.executemany(
+                "INSERT INTO events (name, number, position, playlist, bracket, extra) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (name, number) DO UPDATE SET position = excluded.position, "
+                "playlist = excluded.playlist, bracket = excluded.bracket, extra = excluded.extra",
+                [key + row for key, row in upserts.items()]
+            )
+            conn.executemany("DELETE FROM events WHERE name = ? AND number = ?", deletes)
+
+        self._rows = new
+        if changes is not None:
+            data.changes.clear()
+        self._current = data
+        return SaveReport(self.path, changes, None, time.perf_counter() - started)
+
+
+def migrate_json_to_sqlite(json_path, db_path):
+    """
+    Copies everything in a JSON data file (either format load_data understands)
+    into a SQLite database. Returns the number of players migrated.
+    """
+    from src.data.storage import JsonStorage
+
+    data = JsonStorage(json_path).load()
+    storage = SqliteStorage(db_path)
+    try:
+        storage.load()
+        storage.save(data)
+    finally:
+        storage.close()
+    return len(data["players"])
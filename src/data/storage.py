@@ -0,0 +1,243 @@
+import json
+import os
+import stat
+import tempfile
+import time
+
+from src.data.tracked import as_stored, track, unsaved_changes
+
+DEFAULT_DATA_FILE = "data.json"
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# JSON files larger than this are written without indentation, which is
+# smaller and several times faster to encode. $SMASHVOD_COMPACT_JSON=1 or 0
+# forces either way.
+COMPACT_JSON_BYTES = 4 * 1024 * 1024
+
+# JSON files larger than this also keep a compiled snapshot next to them
+# (data.snapshot, see src/data/snapshot.py), which loads without parsing.
+# $SMASHVOD_SNAPSHOT=1 or 0 forces either way.
+SNAPSHOT_BYTES = 1024 * 1024
+
+
+def empty_data():
+    return {"players": {}, "events": [], "character_list": [], "character_aliases": {}}
+
+
+def normalize_data(raw):
+    """
+    Brings loaded data into the current shape.
+    - If it’s already in the new format (top-level “players” & “events”), use it.
+    - If it’s an older flat dict of players, migrate it under “players”.
+    """
+    if isinstance(raw, dict) and "players" in raw and "events" in raw:
+        if "character_list" not in raw:
+            raw["character_list"] = []
+        if "character_aliases" not in raw:
+            raw["character_aliases"] = {}
+        return raw
+
+    data = empty_data()
+    data["players"] = raw
+    return data
+
+
+class SaveReport:
+    """
+    What a save did: the changed entries per section ({} if nothing changed
+    and the write was skipped, None if unknown), bytes written (None for
+    SQLite) and how long it took.
+    """
+    __slots__ = ("path", "changes", "bytes_written", "seconds")
+
+    def __init__(self, path, changes, bytes_written, seconds):
+        self.path = path
+        self.changes = changes
+        self.bytes_written = bytes_written
+        self.seconds = seconds
+
+    @property
+    def skipped(self):
+        return self.changes == {}
+
+    def __str__(self):
+        if self.skipped:
+            return f"No changes to save in {self.path}"
+        if self.changes is None:
+            what = "everything"
+        else:
+            what = ", ".join(
+                section if count is None else f"{section}: {count}"
+                for section, count in sorted(self.changes.items())
+            )
+        size = f"{self.bytes_written:,} bytes in " if self.bytes_written is not None else ""
+        return f"Saved {self.path} (changed {what}; {size}{self.seconds * 1000:.1f} ms)"
+
+
+def write_atomic(path, payload):
+    """
+    Replaces path with payload (bytes) so that a crash at any point leaves
+    either the old file or the new one: the bytes go to a temporary file in
+    the same directory, are flushed to disk, and the file is renamed over path.
+    Each call gets its own temporary file, so concurrent savers (the daemon's
+    write-behind flush and a CLI --record) cannot clobber each other's.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+            # mkstemp creates the file private to the owner; keep path's permissions
+            os.chmod(tmp, _file_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def _file_mode(path):
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        # What open() would have created
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def _fsync_directory(directory):
+    # Makes the rename itself durable; not possible (or needed) on Windows
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _compact_json(size):
+    setting = os.environ.get("SMASHVOD_COMPACT_JSON", "")
+    if setting:
+        return setting != "0"
+    return size > COMPACT_JSON_BYTES
+
+
+def _use_snapshot(size):
+    setting = os.environ.get("SMASHVOD_SNAPSHOT", "")
+    if setting:
+        return setting != "0"
+    return size > SNAPSHOT_BYTES
+
+
+class JsonStorage:
+    """
+    Keeps all data in a single JSON file (the original data.json format).
+    Loaded data tracks its changes (see src/data/tracked.py): saving it
+    unchanged writes nothing, and otherwise the whole file is replaced
+    atomically. Large files are loaded from their snapshot while it is up
+    to date, and the snapshot is rebuilt whenever the file is parsed or saved.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._current = None
+        self._size = 0
+        self._snapshot = None
+
+    def load(self):
+        self._snapshot = None
+        if not os.path.exists(self.path):
+            data = track(empty_data())
+        else:
+            self._size = os.path.getsize(self.path)
+            if _use_snapshot(self._size):
+                from src.data.snapshot import open_snapshot
+                self._snapshot = open_snapshot(self.path)
+            if self._snapshot is not None:
+                data = self._snapshot.load()
+            else:
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                self._size = len(raw)
+                data = track(normalize_data(json.loads(raw)))
+                self._update_snapshot(data, raw)
+        self._current = data
+        return data
+
+    def save(self, data):
+        """
+        Writes data unless it is what this storage last loaded or saved and
+        nothing in it changed since. Returns a SaveReport.
+        """
+        started = time.perf_counter()
+        changes = unsaved_changes(data)
+        if changes == {} and data is self._current and os.path.exists(self.path):
+            return SaveReport(self.path, changes, 0, time.perf_counter() - started)
+
+        # The snapshot of what was last loaded or saved, to copy unchanged entries from
+        previous = self._snapshot if data is self._current and changes is not None else None
+        indent = None if _compact_json(self._size) else 2
+        # Sections still partly in a snapshot are decoded before encoding
+        payload = json.dumps(as_stored(data), indent=indent, ensure_ascii=False, default=_to_json).encode("utf-8")
+        write_atomic(self.path, payload)
+        self._size = len(payload)
+        self._update_snapshot(data, payload, previous)
+        if changes is not None:
+            data.changes.clear()
+        self._current = data
+        return SaveReport(self.path, changes, len(payload), time.perf_counter() - started)
+
+    def _update_snapshot(self, data, raw, previous=None):
+        self._snapshot = None
+        if not _use_snapshot(len(raw)):
+            return
+        from src.data.snapshot import write_snapshot
+        try:
+            self._snapshot = write_snapshot(self.path, data, raw, previous)
+        except (OSError, ValueError):
+            # The JSON file is complete on its own; the next load parses it
+            pass
+
+
+def _to_json(value):
+    # In-memory stand-ins for parts of the data (e.g. a players Roster) know
+    # their JSON shape
+    to_json = getattr(value, "to_json", None)
+    if to_json is None:
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+    return to_json()
+
+
+_storages = {}
+
+
+def resolve_data_path(path=None):
+    """
+    Returns the data file in use: path, else $SMASHVOD_DATA, else data.json.
+    """
+    return path or os.environ.get("SMASHVOD_DATA") or DEFAULT_DATA_FILE
+
+
+def get_storage(path=None):
+    """
+    Returns the storage backend for path, chosen by file extension:
+    .db/.sqlite/.sqlite3 use SQLite, anything else JSON.
+    Defaults to $SMASHVOD_DATA, or data.json in the working directory.
+    The same backend object is returned for the same path, so a save can
+    reuse what was recorded during the load.
+    """
+    path = resolve_data_path(path)
+    if path not in _storages:
+        if path.lower().endswith(SQLITE_SUFFIXES):
+            from src.data.sqlite_storage import SqliteStorage
+            _storages[path] = SqliteStorage(path)
+        else:
+            _storages[path] = JsonStorage(path)
+    return _storages[path]
@@ -0,0 +1,341 @@
+"""
+Change tracking for loaded data.
+
+track() turns the dicts and lists of a loaded data structure into
+TrackedDict/TrackedList, which record every change (set, delete, append,
+in-place update) in a ChangeTracker as (section, entry) pairs, e.g.
+("players", "hertsu") or ("events", ("PVL Weekly", 18)). Storage backends use
+it to skip saving when nothing changed.
+
+Player and alias entries are converted the first time they are reached
+(players[key], players.get(key), or players.items() and players.values() as
+they are iterated), so loading a large roster stays cheap. Read-only passes
+over a whole section (saving, indexing) use stored_items() or as_stored()
+instead, which convert nothing. Containers added later are converted as they
+are inserted, so code that adds an entry should read it back before changing
+it further (players[key] = [name, {}]; display, chars = players[key]).
+"""
+from collections.abc import ItemsView, ValuesView
+
+# Sections whose entries are tracked one by one; changes anywhere else are
+# recorded against the whole section.
+ENTRY_SECTIONS = ("players", "character_aliases", "events")
+
+
+class ChangeTracker:
+    """
+    Which entries of each section changed since the last clear().
+    An entry of None stands for the section as a whole (e.g. a reordered list).
+    revisions counts the changes to each section and is never cleared, so
+    caches built from a section can tell whether it changed since.
+    """
+    __slots__ = ("changed", "revisions")
+
+    def __init__(self):
+        self.changed = {}
+        self.revisions = {}
+
+    def mark(self, section, entry=None):
+        self.revisions[section] = self.revisions.get(section, 0) + 1
+        entries = self.changed.get(section)
+        if entries is None:
+            entries = self.changed[section] = set()
+        entries.add(entry)
+
+    def clear(self):
+        self.changed.clear()
+
+    def __bool__(self):
+        return bool(self.changed)
+
+    def summary(self):
+        """
+        Returns {section: number of changed entries}.
+        """
+        return {section: len(entries) for section, entries in self.changed.items()}
+
+
+class _Entries:
+    """
+    Marker for a section container: each item is its own entry.
+    """
+
+    def __repr__(self):
+        return "ENTRIES"
+
+
+_ENTRIES = _Entries()
+
+
+def _event_entry(item):
+    if isinstance(item, dict):
+        return item.get("name"), item.get("number")
+    return None
+
+
+def _adopt(value, tracker, section, entry):
+    if type(value) is dict:
+        tracked = TrackedDict()
+        dict.update(tracked, {k: _adopt(v, tracker, section, entry) for k, v in value.items()})
+    elif type(value) is list:
+        tracked = TrackedList(_adopt(v, tracker, section, entry) for v in value)
+    else:
+        return value
+    tracked._tracker = tracker
+    tracked._section = section
+    tracked._entry = entry
+    return tracked
+
+
+class TrackedDict(dict):
+    """
+    A dict that reports changes to its tracker. Pickles and copies as a plain dict.
+    """
+    __slots__ = ("_tracker", "_section", "_entry")
+
+    def _mark(self, key):
+        entry = key if self._entry is _ENTRIES else self._entry
+        self._tracker.mark(self._section, entry)
+        return entry
+
+    def _wrap(self, key, value):
+        return _adopt(value, self._tracker, self._section, self._mark(key))
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, self._wrap(key, value))
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self._mark(key)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def pop(self, key, *default):
+        if key in self:
+            self._mark(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._mark(key)
+        return key, value
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        for key in self:
+            self._mark(key)
+        dict.clear(self)
+
+
+class TrackedList(list):
+    """
+    A list that reports changes to its tracker. Pickles and copies as a plain list.
+    """
+    __slots__ = ("_tracker", "_section", "_entry")
+
+    def _entry_for(self, item):
+        return _event_entry(item) if self._entry is _ENTRIES else self._entry
+
+    def _mark(self, item=None):
+        entry = self._entry_for(item)
+        self._tracker.mark(self._section, entry)
+        return entry
+
+    def _wrap(self, value):
+        return _adopt(value, self._tracker, self._section, self._mark(value))
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+    def append(self, value):
+        list.append(self, self._wrap(value))
+
+    def extend(self, values):
+        list.extend(self, [self._wrap(v) for v in values])
+
+    def __iadd__(self, values):
+        self.extend(values)
+        return self
+
+    def insert(self, index, value):
+        list.insert(self, index, self._wrap(value))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._mark()
+            list.__setitem__(self, index, [_adopt(v, self._tracker, self._section, self._entry_for(v)) for v in value])
+        else:
+            list.__setitem__(self, index, self._wrap(value))
+
+    def __delitem__(self, index):
+        self._mark()
+        list.__delitem__(self, index)
+
+    def pop(self, index=-1):
+        self._mark()
+        return list.pop(self, index)
+
+    def remove(self, value):
+        self._mark()
+        list.remove(self, value)
+
+    def clear(self):
+        self._mark()
+        list.clear(self)
+
+    def sort(self, *args, **kwargs):
+        self._mark()
+        list.sort(self, *args, **kwargs)
+
+    def reverse(self):
+        self._mark()
+        list.reverse(self)
+
+    def __imul__(self, n):
+        self._mark()
+        return list.__imul__(self, n)
+
+
+class TrackedSection(TrackedDict):
+    """
+    A section dict (players, aliases) whose entries are converted to tracked
+    containers on first lookup rather than all at load.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if type(value) is dict or type(value) is list:
+            value = _adopt(value, self._tracker, self._section, key)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    # Entries are converted as the views reach them, so changing one tracks it
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key in self:
+            self._mark(key)
+        return dict.pop(self, key, *default)
+
+
+class TrackedData(TrackedDict):
+    """
+    The top-level data dict. changes is the ChangeTracker shared by every
+    container inside it.
+    """
+    __slots__ = ()
+
+    @property
+    def changes(self):
+        return self._tracker
+
+    def _wrap(self, key, value):
+        self._tracker.mark(key)
+        return _adopt_section(key, value, self._tracker)
+
+
+def _adopt_section(section, value, tracker):
+    if section not in ENTRY_SECTIONS or type(value) not in (dict, list):
+        return _adopt(value, tracker, section, None)
+    if type(value) is dict:
+        tracked = TrackedSection(value)
+    else:
+        tracked = TrackedList(_adopt(v, tracker, section, _event_entry(v)) for v in value)
+    tracked._tracker = tracker
+    tracked._section = section
+    tracked._entry = _ENTRIES
+    return tracked
+
+
+def track(data):
+    """
+    Returns a TrackedData holding the same data, with nothing marked changed.
+    Sections that are not plain dicts or lists (e.g. a players Roster) are
+    kept as they are and count as changed on every save.
+    """
+    tracker = ChangeTracker()
+    tracked = TrackedData()
+    dict.update(tracked, {key: _adopt_section(key, value, tracker) for key, value in data.items()})
+    tracked._tracker = tracker
+    tracked._section = None
+    tracked._entry = None
+    return tracked
+
+
+def stored_items(section):
+    """
+    Returns the (key, entry) pairs of a section as stored, converting none of
+    them, for read-only passes over a whole section that would otherwise pay
+    for tracking every entry they only read. Entries may come back tracked or
+    plain; change them through a lookup or items() instead.
+    """
+    materialize = getattr(section, "materialize", None)
+    if materialize is not None:
+        materialize()
+    if isinstance(section, dict):
+        return dict.items(section)
+    return section.items()
+
+
+def as_stored(data):
+    """
+    Returns the top level of data with each entry section as a plain dict of
+    its stored entries, for encoders (which walk dicts through items()).
+    """
+    return {
+        key: dict(stored_items(value)) if isinstance(value, TrackedSection) else value
+        for key, value in data.items()
+    }
+
+
+def revision(container):
+    """
+    How many changes the section holding a tracked container has seen, or
+    None for a container that is not tracked.
+    """
+    tracker = getattr(container, "_tracker", None)
+    if tracker is None:
+        return None
+    return tracker.revisions.get(container._section, 0)
+
+
+def unsaved_changes(data):
+    """
+    Returns {section: number of changed entries} for tracked data, or None
+    when data is not tracked (then everything has to be assumed changed).
+    Sections held by objects that track nothing themselves, such as a
+    Roster, are always included, with None as their count.
+    """
+    if not isinstance(data, TrackedData):
+        return None
+    summary = data.changes.summary()
+    for section, value in data.items():
+        if hasattr(value, "to_json"):
+            summary[section] = None
+    return summary
@@ -0,0 +1,138 @@
+from bisect import insort
+
+
+class EventSeries:
+    """
+    All editions of one event series, e.g. every "PVL Weekly".
+    numbers is kept sorted, so the latest edition is numbers[-1].
+    Editions indexed from a snapshot are kept as positions in the events
+    list until first asked for, so their records are decoded only then.
+    """
+    __slots__ = ("name", "numbers", "editions", "_positions")
+
+    def __init__(self, name):
+        self.name = name
+        self.numbers = []
+        self.editions = {}
+        self._positions = None
+
+    def add(self, record):
+        number = record["number"]
+        if number not in self.editions and not (self._positions and number in self._positions):
+            self.editions[number] = record
+            insort(self.numbers, number)
+
+    def edition(self, number, events):
+        record = self.editions.get(number)
+        if record is None and self._positions:
+            position = self._positions.pop(number, None)
+            if position is not None:
+                record = self.editions[number] = events[position]
+        return record
+
+    def latest(self):
+        return self.numbers[-1] if self.numbers else None
+
+
+class EventStore:
+    """
+    Index over data["events"], keyed by case-folded series name.
+    The list stays the storage format: one {"name", "number", ...} record per
+    edition, each with its own links. The store indexes those same record
+    dicts and appends new editions to the list, so saving data needs no
+    conversion and older files (one record per series) still load.
+    """
+
+    def __init__(self, events):
+        self._events = events
+        self._series = {}
+        indexed = 0
+        # Events loaded from a snapshot come with the index already built
+        series_index = getattr(events, "series_index", None)
+        prebuilt = series_index() if series_index else None
+        if prebuilt:
+            entries, indexed = prebuilt
+            for name, numbers, positions in entries:
+                series = self._series[name.casefold()] = EventSeries(name)
+                series.numbers = numbers
+                series._positions = dict(zip(numbers, positions))
+        for position in range(indexed, len(events)):
+            self._index(events[position])
+        self._indexed = len(events)
+
+    def _index(self, record):
+        key = record["name"].casefold()
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = EventSeries(record["name"])
+        series.add(record)
+
+    def is_current(self, events):
+        """
+        True if this store indexes exactly the given list as it is now.
+        """
+        return self._events is events and self._indexed == len(events)
+
+    def series(self, name):
+        return self._series.get(name.casefold())
+
+    def series_names(self):
+        """
+        Returns the display name of every series, sorted case-insensitively.
+        """
+        return sorted((s.name for s in self._series.values()), key=str.lower)
+
+    def default_series(self):
+        """
+        Returns the series offered by default: "PVL Weekly" if it exists,
+        else the first series alphabetically, else "".
+        """
+        names = self.series_names()
+        if "PVL Weekly" in names:
+            return "PVL Weekly"
+        return names[0] if names else ""
+
+    def edition_counts(self):
+        return {s.name: len(s.numbers) for s in self._series.values()}
+
+    def latest_number(self, name):
+        series = self.series(name)
+        return series.latest() if series else None
+
+    def get(self, name, number):
+        series = self.series(name)
+        return series.edition(number, self._events) if series else None
+
+    def add(self, name, number):
+        """
+        Returns the record for this edition, creating it if needed.
+        New editions reuse the existing series' spelling of the name.
+        """
+        record = self.get(name, number)
+        if record is None:
+            series = self.series(name)
+            record = {"name": series.name if series else name, "number": number}
+            self._events.append(record)
+            # Read back what was stored: tracked data keeps its own copy
+            record = self._events[-1]
+            self._index(record)
+            self._indexed += 1
+        return record
+
+    def to_list(self):
+        return self._events
+
+
+_store = None
+
+
+def get_event_store(data):
+    """
+    Returns an EventStore over data["events"], reusing the previous one unless
+    the list was replaced or changed length outside the store.
+    """
+    global _store
+    events = data.setdefault("events", [])
+    if _store is None or not _store.is_current(events):
+        _store = EventStore(events)
+    return _store
@@ -0,0 +1,161 @@
+import re
+
+from src.players.completion import CompletionIndex
+
+ROUND_TYPES = ["Winners", "Losers", "Pools"]
+
+# Completion options for the round detail prompt, suggested in this order.
+ROUND_DETAIL_OPTIONS = CompletionIndex.in_order(
+    [f"r{i}" for i in range(1, 100)] +
+    ["qf", "sf", "f", "gf", "Quarterfinals", "Semi-Finals", "Finals", "Grand Finals"]
+)
+
+# Rounds played as best-of-5; everything else is best-of-3.
+BEST_OF_5_ROUNDS = {
+    "losers semi-finals",
+    "losers finals",
+    "winners finals",
+    "winners grand finals",
+}
+
+
+def parse_round_input(raw, round_type):
+    """
+    Parses the round detail input and returns a formatted string for the bracket title.
+    Accepts abbreviations like 'qf', 'sf', 'f', 'gf', or numbers like 'r1', 'r2', etc.
+    """
+    if not raw:
+        return ""
+    val = raw.strip().lower()
+    mapping = {
+        "qf": "Quarterfinals",
+        "sf": "Semi-Finals",
+        "f": "Finals",
+        "gf": "Grand Finals",
+        "quarterfinals": "Quarterfinals",
+        "semi-finals": "Semi-Finals",
+        "finals": "Finals",
+        "grand finals": "Grand Finals"
+    }
+    if val in mapping:
+        return mapping[val]
+    if val.startswith("r") and val[1:].isdigit():
+        return f"Round {val[1:]}"
+    return raw.title()
+
+
+# Round names used by bracket sites, mapped to parse_round_input() shorthands.
+_ROUND_TEXT_DETAILS = {
+    "quarter-final": "qf", "quarter-finals": "qf", "quarterfinal": "qf", "quarterfinals": "qf",
+    "semi-final": "sf", "semi-finals": "sf", "semifinal": "sf", "semifinals": "sf",
+    "final": "f", "finals": "f",
+}
+
+
+def round_from_text(text):
+    """
+    Splits a bracket site's round name into (round_type, raw_detail) for
+    format_bracket_title(), e.g. "Losers Semi-Final" -> ("Losers", "sf"),
+    "Winners Round 2" -> ("Winners", "r2"), "Grand Final Reset" -> ("Winners", "gf").
+    Rounds without a side ("Semi-Final", "Round 1") count as Winners.
+    """
+    words = text.strip().lower().split()
+    if "grand" in words:
+        return "Winners", "gf"
+    round_type = "Winners"
+    if words and words[0] in ("winners", "losers"):
+        round_type = words.pop(0).capitalize()
+    rest = " ".join(words)
+    if rest in _ROUND_TEXT_DETAILS:
+        return round_type, _ROUND_TEXT_DETAILS[rest]
+    if len(words) == 2 and words[0] == "round" and words[1].isdigit():
+        return round_type, f"r{words[1]}"
+    return round_type, rest
+
+
+# Compact round names used in file names: "WSF", "LQF", "WF", "GF", "WR2", "L-R3"
+_ROUND_HINT_SIDES = {"w": "Winners", "l": "Losers"}
+
+
+def round_from_hint(text):
+    """
+    Like round_from_text(), but also accepts the compact forms people put in
+    file names: "LSF" -> ("Losers", "sf"), "WR2" -> ("Winners", "r2"),
+    "GF" -> ("Winners", "gf"), "Pools" -> ("Pools", "").
+    """
+    compact = text.strip().lower().replace("-", "").replace(" ", "")
+    if compact in ("pools", "pool"):
+        return "Pools", ""
+    if compact in ("gf", "gfr", "gfreset"):
+        return "Winners", "gf"
+    side = _ROUND_HINT_SIDES.get(compact[:1])
+    rest = compact[1:]
+    if side and (rest in ("qf", "sf", "f") or (rest[:1] == "r" and rest[1:].isdigit())):
+        return side, rest
+    return round_from_text(text)
+
+
+# A whole round typed on one line: "L sf", "lsf", "W r2", "winners round 2",
+# "gf", "pools". The side is optional; it is None when not given.
+_QUICK_ROUND = re.compile(r"""
+    (?P<pools>pools?)
+  | (?:(?P<side>w|l|winners|losers)[\s-]*)?
+    (?P<detail>qf|sf|f|gf|r\d+|round\s*\d+|quarter-?finals?|semi-?finals?|grand\s*finals?|finals?)
+""", re.IGNORECASE | re.VERBOSE)
+
+_QUICK_DETAILS = {
+    "quarterfinal": "qf", "quarterfinals": "qf", "semifinal": "sf", "semifinals": "sf",
+    "final": "f", "finals": "f", "grandfinal": "gf", "grandfinals": "gf",
+}
+
+
+def quick_round(text):
+    """
+    Reads a round written as one short phrase. Returns (round_type, raw_detail)
+    with the detail as a parse_round_input() shorthand, e.g. "L sf" ->
+    ("Losers", "sf"), "pools" -> ("Pools", ""), "gf" -> ("Winners", "gf").
+    round_type is None when no side was given ("sf"); returns None if text
+    is not a round at all.
+    """
+    match = _QUICK_ROUND.fullmatch(text.strip())
+    if match is None:
+        return None
+    if match.group("pools"):
+        return "Pools", ""
+    detail = re.sub(r"[\s-]", "", match.group("detail").lower())
+    detail = _QUICK_DETAILS.get(detail, detail)
+    if detail.startswith("round"):
+        detail = "r" + detail[5:]
+    side = match.group("side")
+    if side:
+        return _ROUND_HINT_SIDES[side[0].lower()], detail
+    return ("Winners" if detail == "gf" else None), detail
+
+
+def normalize_round_type(round_type):
+    """
+    Returns "Winners", "Losers" or "Pools" for any casing of those words, else None.
+    """
+    normalized = round_type.strip().lower().capitalize()
+    return normalized if normalized in ROUND_TYPES else None
+
+
+def format_bracket_title(round_type, raw_detail):
+    """
+    Combines a round type (Winners, Losers, Pools) with the parsed round detail,
+    e.g. ("Losers", "sf") -> "Losers Semi-Finals". Pools have no detail.
+    """
+    round_type = round_type.strip().lower().capitalize()
+    if round_type in ["Winners", "Losers"]:
+        parsed = parse_round_input(raw_detail, round_type)
+        return f"{round_type} {parsed}".strip()
+    return round_type
+
+
+def best_of_for(bracket_title):
+    """
+    Returns the set format ("Best-of-3" or "Best-of-5") for a bracket title.
+    """
+    if bracket_title.lower() in BEST_OF_5_ROUNDS:
+        return "Best-of-5"
+    return "Best-of-3"
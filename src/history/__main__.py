@@ -0,0 +1,55 @@
+import argparse
+import time
+
+from src.history.store import HistoryStore
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.history", description="Query the recorded set history.")
+    parser.add_argument("--data", help="data file the history belongs to (default: $SMASHVOD_DATA or data.json)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    usage = sub.add_parser("usage", help="characters a player used per event edition")
+    usage.add_argument("player")
+    usage.add_argument("--last", type=int, default=10, help="number of most recent editions (default: 10)")
+
+    h2h = sub.add_parser("h2h", help="head-to-head record between two players")
+    h2h.add_argument("player_a")
+    h2h.add_argument("player_b")
+
+    matchups = sub.add_parser("matchups", help="most frequent character matchups")
+    matchups.add_argument("--event", help="only this event series")
+    matchups.add_argument("--top", type=int, default=20)
+
+    sub.add_parser("stats", help="size of the history")
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+    history = HistoryStore.open(args.data)
+    loaded = time.perf_counter()
+
+    if args.command == "usage":
+        for event, number, chars in history.usage_over_time(args.player, args.last):
+            print(f"{event} #{number}: " + ", ".join(f"{c} ({k})" for c, k in chars.items()))
+    elif args.command == "h2h":
+        result = history.head_to_head(args.player_a, args.player_b)
+        wins = result["wins"]
+        print(f"{result['sets']} sets: {args.player_a} {wins[args.player_a]} - {wins[args.player_b]} {args.player_b}"
+              f" ({result['unknown']} without a recorded winner)")
+        for (a, b), k in result["matchups"].items():
+            print(f"  {a} vs {b}: {k}")
+    elif args.command == "matchups":
+        for i, ((a, b), k) in enumerate(history.matchup_matrix(args.event).items()):
+            if i == args.top:
+                break
+            print(f"{k:6}  {a} vs {b}")
+    else:
+        print(f"{len(history)} sets, {len(history.players)} players, {len(history.characters)} characters, "
+              f"{len(history.events)} event series")
+
+    done = time.perf_counter()
+    print(f"(loaded in {(loaded - started) * 1000:.0f} ms, query {(done - loaded) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
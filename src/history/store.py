@@ -0,0 +1,419 @@
+import json
+import os
+import sys
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: flushes are not serialized between processes
+    fcntl = None
+
+from src.data.storage import resolve_data_path
+
+# One row per set. Every column is an unsigned 32-bit integer; strings are
+# stored once in a table and referenced by id.
+COLUMNS = ("p1", "p2", "c1", "c2", "event", "number", "round", "winner")
+WIDTH = len(COLUMNS)
+ROW_BYTES = 4 * WIDTH
+P1, P2, C1, C2, EVENT, NUMBER, ROUND, WINNER = range(WIDTH)
+
+# String tables and the columns holding their ids
+TABLES = {"players": (P1, P2), "characters": (C1, C2), "events": (EVENT,), "rounds": (ROUND,)}
+
+# Stored matchup counts are caught up by a query once they lag this many rows behind
+CATCH_UP_ROWS = 10_000
+
+# winner column values
+WINNER_UNKNOWN, WINNER_P1, WINNER_P2 = 0, 1, 2
+
+
+class StringTable:
+    """
+    Interned strings with case-insensitive lookup, e.g. player or character names.
+    """
+
+    def __init__(self, names=()):
+        self.names = []
+        self._ids = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name):
+        key = name.casefold()
+        sid = self._ids.get(key)
+        if sid is None:
+            sid = self._ids[key] = len(self.names)
+            self.names.append(name)
+        return sid
+
+    def id_of(self, name):
+        return self._ids.get(name.casefold())
+
+    def __len__(self):
+        return len(self.names)
+
+
+def history_paths(data_path=None):
+    """
+    Returns (rows_path, tables_path, matchups_path, lock_path) for the
+    history kept next to the data file.
+    """
+    base = os.path.splitext(resolve_data_path(data_path))[0]
+    return f"{base}.history.bin", f"{base}.history.json", f"{base}.history.matchups.json", f"{base}.history.lock"
+
+
+def _write_json(path, value):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+class HistoryStore:
+    """
+    Every recorded set, kept as one flat array('I') of fixed-width rows.
+    On disk, rows are appended to a binary file (never rewritten), the string
+    tables live in a small JSON file beside it, and so do the matchup counts
+    per event series, brought up to date by whoever appends.
+
+    Several processes may append to the same history (prompts, batch,
+    ingest, the watcher, the daemon): flush() takes a file lock and interns
+    the new names into the tables as they are on disk, so ids are only ever
+    added and mean the same thing to every process.
+
+    Queries load lazily: a player's rows are found when first asked for, and
+    the matchup counts are read from disk and only the rows they do not cover
+    yet are counted.
+    """
+
+    def __init__(self, rows_path=None, tables_path=None, matchups_path=None, lock_path=None):
+        self.rows_path = rows_path
+        self.tables_path = tables_path
+        self.matchups_path = matchups_path
+        self.lock_path = lock_path
+        self.rows = array("I")
+        self.players = StringTable()
+        self.characters = StringTable()
+        self.events = StringTable()
+        self.rounds = StringTable()
+        self._player_rows = {}
+        self._player_columns = None
+        self._matchups = None
+        self._matchups_stored = None
+        self._pending = []
+
+    @classmethod
+    def open(cls, data_path=None, load_rows=True):
+        """
+        Loads the history kept next to the data file (empty if there is none yet).
+        With load_rows=False only the string tables are read: enough to append
+        sets cheaply, but not to query.
+        """
+        store = cls(*history_paths(data_path))
+        store._load(load_rows)
+        return store
+
+    def _read_tables(self):
+        """
+        Returns {table name: StringTable} as the tables file has them.
+        """
+        if not os.path.exists(self.tables_path):
+            return {name: StringTable() for name in TABLES}
+        with open(self.tables_path, "r", encoding="utf-8") as f:
+            tables = json.load(f)
+        return {name: StringTable(tables[name]) for name in TABLES}
+
+    def _read_matchups(self):
+        """
+        Returns (rows covered, {event id: Counter}) from the matchups file,
+        or (0, {}) if there is none.
+        """
+        if not os.path.exists(self.matchups_path):
+            return 0, {}
+        with open(self.matchups_path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        return stored["rows"], {
+            int(eid): Counter({(c1, c2): k for c1, c2, k in counts})
+            for eid, counts in stored["events"].items()
+        }
+
+    def _write_matchups(self, rows, matchups):
+        _write_json(self.matchups_path, {
+            "rows": rows,
+            "events": {str(eid): [[c1, c2, k] for (c1, c2), k in counts.items()]
+                       for eid, counts in matchups.items()},
+        })
+
+    def _load(self, load_rows=True):
+        if load_rows:
+            # Writers add the matchup counts after the rows, and the rows
+            # after the tables: read in the other order, so every row is
+            # covered by the tables and no count is of a row not read
+            if os.path.exists(self.matchups_path):
+                self._matchups_stored = self._read_matchups()
+            if os.path.exists(self.rows_path):
+                with open(self.rows_path, "rb") as f:
+                    # Ignore a partially written trailing row
+                    self.rows.fromfile(f, os.fstat(f.fileno()).st_size // ROW_BYTES * WIDTH)
+                if sys.byteorder != "little":
+                    self.rows.byteswap()
+        for name, table in self._read_tables().items():
+            setattr(self, name, table)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Holds the history's lock file exclusively (where the platform supports it).
+        """
+        with open(self.lock_path, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def __len__(self):
+        return len(self.rows) // WIDTH
+
+    def append(self, p1, p2, char1, char2, event, number, round_title, winner=WINNER_UNKNOWN):
+        """
+        Records one set. Players and characters are names; the row is written
+        to disk on flush().
+        """
+        row = len(self)
+        values = (
+            self.players.intern(p1), self.players.intern(p2),
+            self.characters.intern(char1), self.characters.intern(char2),
+            self.events.intern(event), int(number), self.rounds.intern(round_title), int(winner),
+        )
+        self.rows.extend(values)
+        self._pending.append((p1, p2, char1, char2, event, int(number), round_title, int(winner)))
+        for pid in {values[0], values[1]}:
+            if pid in self._player_rows:
+                self._player_rows[pid].append(row)
+        if self._matchups is not None:
+            _count_matchups(self._matchups, self.rows, row, row + 1)
+
+    def append_context(self, ctx, winner=WINNER_UNKNOWN):
+        """
+        Records the set described by a SetContext (first character of each side).
+        """
+        self.append(ctx.p1, ctx.p2, ctx.p1_char, ctx.p2_char,
+                    ctx.event_name, ctx.event_number, ctx.bracket_title, winner)
+
+    def flush(self):
+        """
+        Appends pending rows to the rows file. Under the lock, the tables are
+        read back from disk and the pending names interned into them, so names
+        another process added meanwhile keep their ids; new names are written
+        before the rows that use them, so every id in the rows file always has
+        a name. The stored matchup counts are updated too, if they covered
+        every row so far.
+        """
+        if not self._pending:
+            return
+        with self._locked():
+            tables = self._read_tables()
+            sizes = [len(table) for table in tables.values()]
+            players, characters = tables["players"], tables["characters"]
+            events, rounds = tables["events"], tables["rounds"]
+            rows = array("I")
+            for p1, p2, char1, char2, event, number, round_title, winner in self._pending:
+                rows.extend((
+                    players.intern(p1), players.intern(p2),
+                    characters.intern(char1), characters.intern(char2),
+                    events.intern(event), number, rounds.intern(round_title), winner,
+                ))
+            if sizes != [len(table) for table in tables.values()]:
+                _write_json(self.tables_path, {name: table.names for name, table in tables.items()})
+
+            written = os.path.getsize(self.rows_path) if os.path.exists(self.rows_path) else 0
+            data = rows
+            if sys.byteorder != "little":
+                data = array("I", rows)
+                data.byteswap()
+            with open(self.rows_path, "ab") as f:
+                # Drop a partial row left by a crash, or every later row would be misaligned
+                f.truncate(written - written % ROW_BYTES)
+                f.write(data.tobytes())
+
+            covered, matchups = self._read_matchups()
+            if covered == written // ROW_BYTES:
+                _count_matchups(matchups, rows, 0, len(rows) // WIDTH)
+                self._write_matchups(covered + len(rows) // WIDTH, matchups)
+        self._pending = []
+        self._adopt_tables(tables)
+
+    def _adopt_tables(self, tables):
+        """
+        Switches to the tables as written by flush(), renumbering the rows in
+        memory where another process gave a name an id first.
+        """
+        renumbered = False
+        for name, columns in TABLES.items():
+            ids = array("I", (tables[name].intern(n) for n in getattr(self, name).names))
+            setattr(self, name, tables[name])
+            if all(new == old for old, new in enumerate(ids)):
+                continue
+            renumbered = True
+            rows = self.rows
+            for column in columns:
+                for i in range(column, len(rows), WIDTH):
+                    rows[i] = ids[rows[i]]
+        if renumbered:
+            self._player_rows = {}
+            self._player_columns = None
+            self._matchups = None
+            self._matchups_stored = None
+
+    # Queries
+
+    def rows_for_player(self, name):
+        pid = self.players.id_of(name)
+        return self._rows_of(pid) if pid is not None else array("I")
+
+    def _rows_of(self, pid):
+        """
+        The rows a player id appears in, found on first use: the player
+        columns are searched as bytes, which is much quicker than walking
+        every row.
+        """
+        found = self._player_rows.get(pid)
+        if found is not None:
+            return found
+        if self._player_columns is None:
+            self._player_columns = (len(self), self.rows[P1::WIDTH].tobytes(), self.rows[P2::WIDTH].tobytes())
+        covered, p1_bytes, p2_bytes = self._player_columns
+        pattern = array("I", [pid]).tobytes()
+        rows = set()
+        for column in (p1_bytes, p2_bytes):
+            position = column.find(pattern)
+            while position != -1:
+                if position % 4 == 0:
+                    rows.add(position // 4)
+                position = column.find(pattern, position + 1)
+        rows.update(row for row in range(covered, len(self))
+                    if pid in (self.rows[row * WIDTH + P1], self.rows[row * WIDTH + P2]))
+        found = self._player_rows[pid] = array("I", sorted(rows))
+        return found
+
+    def _matchup_counts(self):
+        """
+        {event id: Counter({(character id, character id): sets})}: the stored
+        counts plus the rows they do not cover yet. Counts caught up over
+        many rows are stored again, so the next query starts from there.
+        """
+        if self._matchups is not None:
+            return self._matchups
+        covered, matchups = self._matchups_stored or (0, {})
+        _count_matchups(matchups, self.rows, covered, len(self))
+        self._matchups = matchups
+        flushed = len(self) - len(self._pending)
+        if flushed - covered >= CATCH_UP_ROWS and self.matchups_path and os.path.exists(self.rows_path):
+            with self._locked():
+                # Only if no writer moved the stored counts on meanwhile
+                if self._read_matchups()[0] == covered:
+                    self._write_matchups(flushed, _without_pending(matchups, self.rows, flushed, len(self)))
+        return matchups
+
+    def usage_over_time(self, player, last=10):
+        """
+        Characters a player used in each of their last `last` event editions.
+        Returns [(event, number, {character: sets}), ...], oldest first.
+        """
+        pid = self.players.id_of(player)
+        if pid is None:
+            return []
+        rows = self.rows
+        by_edition = {}
+        for row in self._rows_of(pid):
+            base = row * WIDTH
+            char = rows[base + C1] if rows[base + P1] == pid else rows[base + C2]
+            by_edition.setdefault((rows[base + EVENT], rows[base + NUMBER]), Counter())[char] += 1
+        editions = sorted(by_edition, key=lambda e: (e[1], e[0]))[-last:]
+        names = self.characters.names
+        return [
+            (self.events.names[e], n, {names[c]: k for c, k in by_edition[(e, n)].most_common()})
+            for e, n in editions
+        ]
+
+    def head_to_head(self, player_a, player_b):
+        """
+        Sets between two players: {"sets", "wins" per player, "unknown",
+        "matchups": {(a's character, b's character): sets}}.
+        """
+        a = self.players.id_of(player_a)
+        b = self.players.id_of(player_b)
+        result = {"sets": 0, "wins": {player_a: 0, player_b: 0}, "unknown": 0, "matchups": {}}
+        if a is None or b is None or a == b:
+            return result
+        rows_a = self._rows_of(a)
+        rows_b = self._rows_of(b)
+        # Walk the shorter list and check the other side of each set
+        rows = self.rows
+        matchups = Counter()
+        for row in (rows_a if len(rows_a) <= len(rows_b) else rows_b):
+            p1, p2, c1, c2 = rows[row * WIDTH:row * WIDTH + 4]
+            if {p1, p2} != {a, b}:
+                continue
+            a_first = p1 == a
+            result["sets"] += 1
+            matchups[(c1, c2) if a_first else (c2, c1)] += 1
+            w = rows[row * WIDTH + WINNER]
+            if w == WINNER_UNKNOWN:
+                result["unknown"] += 1
+            elif (w == WINNER_P1) == a_first:
+                result["wins"][player_a] += 1
+            else:
+                result["wins"][player_b] += 1
+        names = self.characters.names
+        result["matchups"] = {(names[x], names[y]): k for (x, y), k in matchups.most_common()}
+        return result
+
+    def matchup_matrix(self, event=None):
+        """
+        How often each pair of characters met, for one event series or all of
+        them. Returns {(character, character): sets}, most frequent first;
+        each pair is listed once, in id order.
+        """
+        counts = self._matchup_counts()
+        if event is None:
+            totals = Counter()
+            for per_event in counts.values():
+                totals.update(per_event)
+        else:
+            eid = self.events.id_of(event)
+            totals = counts.get(eid, Counter()) if eid is not None else Counter()
+        names = self.characters.names
+        return {(names[x], names[y]): k for (x, y), k in totals.most_common()}
+
+
+def _count_matchups(matchups, rows, start, stop):
+    """
+    Adds rows start..stop of a flat rows array to {event id: Counter}.
+    """
+    for base in range(start * WIDTH, stop * WIDTH, WIDTH):
+        c1, c2 = rows[base + C1], rows[base + C2]
+        counts = matchups.get(rows[base + EVENT])
+        if counts is None:
+            counts = matchups[rows[base + EVENT]] = Counter()
+        counts[(c1, c2) if c1 <= c2 else (c2, c1)] += 1
+
+
+def _without_pending(matchups, rows, start, stop):
+    """
+    A copy of the counts minus rows start..stop (appended but not flushed).
+    """
+    if start == stop:
+        return matchups
+    pending = {}
+    _count_matchups(pending, rows, start, stop)
+    result = {eid: Counter(counts) for eid, counts in matchups.items()}
+    for eid, counts in pending.items():
+        result[eid].subtract(counts)
+        result[eid] = +result[eid]
+    return result
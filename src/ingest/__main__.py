@@ -0,0 +1,56 @@
+import argparse
+import sys
+import time
+
+from src.core.resolve import live_view
+from src.data.loader import load_data
+from src.data.saver import save_data
+from src.history.store import HistoryStore
+from src.ingest.cache import BuildCache, build_cache_path
+from src.ingest.export import read_export
+from src.ingest.runner import ingest
+from src.tags.limits import TAG_CHAR_LIMIT
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.ingest",
+        description="Generate metadata for a start.gg/Challonge bracket export, regenerating only changed sets."
+    )
+    parser.add_argument("export", help="JSON dump of a start.gg event or Challonge tournament")
+    parser.add_argument("-o", "--output", help="JSONL file to write (default: stdout)")
+    parser.add_argument("--event", help="event series (default: taken from the tournament name)")
+    parser.add_argument("--number", type=int, help="event edition (default: taken from the tournament name)")
+    parser.add_argument("--all", action="store_true", help="also write sets that did not change")
+    parser.add_argument("--cache", help="build cache file (default: next to the data file)")
+    parser.add_argument("--tag-budget", type=int, default=TAG_CHAR_LIMIT, help="maximum length of the tag string")
+    parser.add_argument("--record", action="store_true",
+                        help="count character usage and add to the set history for sets seen for the first time")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = load_data()
+    source, sets = read_export(args.export, args.event, args.number)
+    cache = BuildCache(args.cache or build_cache_path())
+    history = HistoryStore.open(load_rows=False) if args.record else None
+    record_data = data if args.record else None
+
+    view = live_view(data, args.tag_budget)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            counts = ingest(source, sets, view, cache, out, args.all, record_data, history)
+    else:
+        counts = ingest(source, sets, view, cache, sys.stdout, args.all, record_data, history)
+    regenerated, unchanged, errors = counts
+
+    cache.save()
+    if args.record and regenerated:
+        save_data(data)
+        history.flush()
+    elapsed = time.perf_counter() - start
+    print(f"{source}: {regenerated} regenerated, {unchanged} unchanged, {errors} errors "
+          f"in {elapsed * 1000:.0f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+
+from src.core.resolve import resolve_event, resolve_player
+from src.data.storage import resolve_data_path
+
+# Bump when generation changes in a way that should invalidate every cached set.
+CACHE_FORMAT = 1
+
+
+def build_cache_path(data_path=None):
+    """
+    Returns the build cache kept next to the data file, e.g. data.build_cache.json.
+    """
+    base = os.path.splitext(resolve_data_path(data_path))[0]
+    return f"{base}.build_cache.json"
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class SetHasher:
+    """
+    Content hash of what one set's output depends on: its record as written,
+    the event edition with its links, the series' templates and the
+    character list and aliases. Data-wide parts are hashed once per run.
+    The players' display names and default characters change as usage is
+    recorded, so they are not hashed; check a cached output against them
+    with resolves_same() instead.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        self._base = _digest([
+            CACHE_FORMAT, view["tag_budget"], view["character_list"], view["character_aliases"],
+            view["templates"].get("default"),
+        ])
+        self._series_templates = {name.casefold(): t for name, t in view["templates"].items() if name != "default"}
+
+    def __call__(self, record):
+        event_name, event_number = resolve_event(record, self.view)
+        return _digest([
+            self._base, record, event_name, event_number,
+            self.view["events"].get(event_name, event_number),
+            self._series_templates.get(event_name.casefold()),
+        ])
+
+    def resolves_same(self, record, output):
+        """
+        True if the record's players still resolve to the display names, and
+        sides without characters to the default characters, in output.
+        """
+        for player_field, chars_field in (("p1", "p1_chars"), ("p2", "p2_chars")):
+            display_name, default_chars = resolve_player(record[player_field], self.view)
+            if output[player_field] != display_name:
+                return False
+            if not record[chars_field] and list(output[chars_field]) != default_chars:
+                return False
+        return True
+
+
+class BuildCache:
+    """
+    Last generated output of every ingested set, with the hash of its inputs,
+    grouped by bracket: {"format": 1, "brackets": {source: {set_id: [hash, output]}}}.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.brackets = {}
+        self.dirty = False
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if raw.get("format") == CACHE_FORMAT:
+                self.brackets = raw["brackets"]
+
+    def bracket(self, source):
+        return self.brackets.get(source, {})
+
+    def replace_bracket(self, source, entries):
+        """
+        Stores the entries of one bracket, dropping sets no longer in the export.
+        """
+        if self.brackets.get(source) != entries:
+            self.brackets[source] = entries
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"format": CACHE_FORMAT, "brackets": self.brackets}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.dirty = False
@@ -0,0 +1,145 @@
+import json
+import re
+
+from src.batch.manifest import normalize_record
+from src.events.rounds import round_from_text
+
+# youtu.be/<id>, youtube.com/watch?v=<id>, youtube.com/live/<id>, ...
+_YOUTUBE_ID = re.compile(r"(?:youtu\.be/|[?&]v=|/(?:live|shorts|embed)/)([\w-]{11})")
+
+# "PVL Weekly #42", "PVL Weekly 42" -> ("PVL Weekly", 42)
+_EDITION = re.compile(r"^(.*?)\s*#?\s*(\d+)\s*$")
+
+
+def split_event_name(name):
+    """
+    Splits a tournament name into (series, edition number or None).
+    """
+    match = _EDITION.match(name or "")
+    if match and match.group(1):
+        return match.group(1).strip(), int(match.group(2))
+    return (name or "").strip(), None
+
+
+def youtube_id(url):
+    """
+    Returns the video id in a YouTube URL, or "".
+    """
+    match = _YOUTUBE_ID.search(url or "")
+    return match.group(1) if match else ""
+
+
+def read_export(path, event=None, number=None):
+    """
+    Reads a start.gg or Challonge bracket export (a local JSON dump of the
+    API response) and returns (source, sets), where source names the bracket
+    and sets is a list of (set_id, record) with manifest fields (see
+    src/batch/manifest.py). event/number override the edition taken from the
+    tournament name.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if isinstance(raw, dict) and "data" in raw:
+        raw = raw["data"]
+    if isinstance(raw, dict) and "tournament" in raw and "matches" in raw.get("tournament", {}):
+        source, name, sets = _challonge_sets(raw["tournament"])
+    elif isinstance(raw, dict) and "event" in raw:
+        source, name, sets = _startgg_sets(raw["event"])
+    else:
+        raise ValueError(f"{path}: not a start.gg or Challonge bracket export")
+
+    series, edition = split_event_name(name)
+    event = event or series
+    number = number or edition
+    records = []
+    for set_id, fields in sets:
+        fields.update(event=event, number=number)
+        records.append((str(set_id), normalize_record(fields)))
+    return source, records
+
+
+def _entrant_name(name):
+    # start.gg entrant names carry the sponsor prefix: "TSM | Tweek" -> "Tweek"
+    return (name or "").rsplit(" | ", 1)[-1].strip()
+
+
+def _startgg_sets(event):
+    tournament = event.get("tournament") or {}
+    name = tournament.get("name") or event.get("name", "")
+    sets = event.get("sets") or []
+    if isinstance(sets, dict):
+        sets = sets.get("nodes") or []
+
+    out = []
+    for s in sets:
+        slots = s.get("slots") or []
+        entrants = [(slot.get("entrant") or {}) for slot in slots[:2]]
+        if len(entrants) < 2:
+            continue
+        ids = [e.get("id") for e in entrants]
+        chars = ([], [])
+        for game in s.get("games") or []:
+            for selection in game.get("selections") or []:
+                entrant_id = (selection.get("entrant") or {}).get("id")
+                char = (selection.get("character") or {}).get("name")
+                if entrant_id is not None and entrant_id in ids and char:
+                    side = chars[ids.index(entrant_id)]
+                    if char not in side:
+                        side.append(char)
+
+        phase = (((s.get("phaseGroup") or {}).get("phase") or {}).get("name") or "").lower()
+        if "pool" in phase:
+            round_type, detail = "Pools", ""
+        else:
+            round_type, detail = round_from_text(s.get("fullRoundText") or "")
+        winner = s.get("winnerId")
+        out.append((s.get("id"), {
+            "p1": _entrant_name(entrants[0].get("name")),
+            "p2": _entrant_name(entrants[1].get("name")),
+            "p1_chars": chars[0],
+            "p2_chars": chars[1],
+            "round_type": round_type,
+            "round": detail,
+            "winner": str(ids.index(winner) + 1) if winner is not None and winner in ids else "",
+            "video_id": youtube_id(s.get("vodUrl")),
+        }))
+    return f"startgg:{event.get('id') or name}", name, out
+
+
+def _challonge_sets(tournament):
+    participants = {}
+    for p in tournament.get("participants") or []:
+        p = p.get("participant", p)
+        participants[p.get("id")] = p.get("name") or p.get("display_name") or ""
+    matches = [m.get("match", m) for m in tournament.get("matches") or []]
+
+    # Challonge only numbers rounds (losers rounds are negative); name the last
+    # ones of a double elimination bracket like start.gg does.
+    double = "double" in (tournament.get("tournament_type") or "")
+    winners_last = max((m.get("round") or 0 for m in matches), default=0)
+    losers_last = min((m.get("round") or 0 for m in matches), default=0)
+
+    out = []
+    for m in matches:
+        p1, p2 = m.get("player1_id"), m.get("player2_id")
+        if p1 is None or p2 is None:
+            continue
+        number = m.get("round") or 0
+        if number < 0:
+            round_type = "Losers"
+            detail = {losers_last: "f", losers_last + 1: "sf"}.get(number, f"r{-number}")
+        else:
+            round_type = "Winners"
+            last = {winners_last: "gf", winners_last - 1: "f", winners_last - 2: "sf"} if double else \
+                {winners_last: "f", winners_last - 1: "sf"}
+            detail = last.get(number, f"r{number}")
+        winner = m.get("winner_id")
+        out.append((m.get("id"), {
+            "p1": participants.get(p1, ""),
+            "p2": participants.get(p2, ""),
+            "round_type": round_type,
+            "round": detail,
+            "winner": "1" if winner == p1 else "2" if winner == p2 else "",
+        }))
+    name = tournament.get("name", "")
+    return f"challonge:{tournament.get('url') or tournament.get('id') or name}", name, out
@@ -0,0 +1,55 @@
+import json
+
+from src.core.resolve import apply_set_usage, generate_set
+from src.ingest.cache import SetHasher
+
+
+def ingest(source, sets, view, cache, out_file, emit_all=False, data=None, history=None):
+    """
+    Generates metadata for the sets of one bracket export, reusing cached
+    output for every set whose inputs hash the same as last time and whose
+    players resolve as they did then. Writes one
+    JSON line per regenerated set (per set with emit_all) to out_file.
+    When data is given, usage counts and the event edition are recorded for
+    sets ingested for the first time, and those sets are added to history.
+    Returns (regenerated, unchanged, errors).
+    """
+    hasher = SetHasher(view)
+    previous = cache.bracket(source)
+    entries = {}
+    regenerated = unchanged = errors = 0
+
+    for set_id, record in sets:
+        digest = hasher(record)
+        cached = previous.get(set_id)
+        if cached is not None and cached[0] == digest and hasher.resolves_same(record, cached[1]):
+            entries[set_id] = cached
+            unchanged += 1
+            if emit_all:
+                out_file.write(json.dumps(dict(set_id=set_id, **cached[1]), ensure_ascii=False) + "\n")
+            continue
+
+        try:
+            output, usage = generate_set(record, view)
+        except ValueError as e:
+            errors += 1
+            if cached is not None:
+                entries[set_id] = cached
+            out_file.write(json.dumps({"set_id": set_id, "error": str(e)}, ensure_ascii=False) + "\n")
+            continue
+        regenerated += 1
+        out_file.write(json.dumps(dict(set_id=set_id, **output), ensure_ascii=False) + "\n")
+        if data is not None and cached is None:
+            apply_set_usage(data, output, usage)
+            if history is not None:
+                history.append(
+                    output["p1"], output["p2"], output["p1_chars"][0], output["p2_chars"][0],
+                    output["event"], output["number"], output["round"], output["winner"]
+                )
+            # Recording the event edition may have changed the hashed inputs
+            # of this set; hash again so the next run does not regenerate it.
+            digest = hasher(record)
+        entries[set_id] = [digest, output]
+
+    cache.replace_bracket(source, entries)
+    return regenerated, unchanged, errors
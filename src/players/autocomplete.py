@@ -1,4 +1,6 @@
-import readline
+import sys
+
+from src.players.completion import CompletionIndex
 
 # ANSI color codes
 RED = "\033[91m"
@@ -6,22 +8,30 @@ ORANGE = "\033[38;5;208m"
 LIGHT_GRAY = "\033[37m"
 RESET = "\033[0m"
 
+# How many suggestions are listed per TAB-TAB; pressing it again shows the next page.
+SUGGESTION_PAGE_SIZE = 20
+
 
-def input_with_autocomplete(prompt, options, required=False):
+def input_with_autocomplete(prompt, options, required=False, weights=None):
     """
     Prompts the user, but enables TAB-completion among the given options.
+    options may be a list or a prebuilt CompletionIndex (reuse one index
+    when prompting repeatedly over the same options).
     After input, the completer is cleared.
     Colors:
       - Required input: red prompt
       - Optional input: orange prompt
       - Autocomplete suggestions: light gray (display only, if supported)
     """
-    if options:
-        case_insensitive_autocomplete(options)
+    import readline  # only interactive prompts need it
+
     # Color the prompt
     color = RED if required else ORANGE
+    colored_prompt = f"{color}{prompt}{RESET}"
+    if options:
+        case_insensitive_autocomplete(options, weights, colored_prompt)
     try:
-        return input(f"{color}{prompt}{RESET}").strip()
+        return input(colored_prompt).strip()
     finally:
         readline.set_completer(None)
         # Only clear display hook if it exists (for cross-platform)
@@ -29,26 +39,64 @@ def input_with_autocomplete(prompt, options, required=False):
             readline.set_completion_display_matches_hook(None)
 
 
-def case_insensitive_autocomplete(options):
+def case_insensitive_autocomplete(options, weights=None, prompt=""):
     """
     Sets up readline’s completer so that pressing TAB will autocomplete
     among ‘options’, matching case-insensitively.
+    Matches are computed once per TAB press from a CompletionIndex, ranked by
+    weights (e.g. usage counts), and only the top SUGGESTION_PAGE_SIZE are
+    listed at a time.
     Suggestions are shown in light gray (display only, if supported).
     """
+    import readline
+
+    index = options if isinstance(options, CompletionIndex) else CompletionIndex(options, weights)
+    state_matches = []
+
     def completer(text, state):
-        text_lower = text.lower()
-        matches = [o for o in options if o.lower().startswith(text_lower)]
-        if state < len(matches):
-            return matches[state]
+        if state == 0:
+            state_matches[:] = _completions(index, text)
+        if state < len(state_matches):
+            return state_matches[state]
         return None
 
     readline.set_completer(completer)
     # Only set display hook if available (not on Windows)
     if hasattr(readline, "set_completion_display_matches_hook"):
+        paging = {"text": None, "offset": 0}
+
         def display_matches(substitution, matches, longest_match_length):
+            # Repeating TAB on the same text pages through the ranked suggestions
+            total = index.count(substitution)
+            if paging["text"] == substitution and paging["offset"] + SUGGESTION_PAGE_SIZE < total:
+                paging["offset"] += SUGGESTION_PAGE_SIZE
+            else:
+                paging["text"] = substitution
+                paging["offset"] = 0
+            offset = paging["offset"]
+            page = index.top(substitution, SUGGESTION_PAGE_SIZE, offset)
+
             # Print suggestions in light gray
             print()
-            for match in matches:
+            for match in page:
                 print(f"{LIGHT_GRAY}{match}{RESET}")
+            if total > len(page):
+                shown_to = offset + len(page)
+                print(f"{LIGHT_GRAY}({offset + 1}-{shown_to} of {total}, TAB for more){RESET}")
+            print(prompt + readline.get_line_buffer(), end="")
+            sys.stdout.flush()
         readline.set_completion_display_matches_hook(display_matches)
-    readline.parse_and_bind("tab: complete")
\ No newline at end of file
+    readline.parse_and_bind("tab: complete")
+    readline.parse_and_bind("set completion-ignore-case on")
+
+
+def _completions(index, text):
+    """
+    Returns what the completer hands to readline for text.
+    When there are more matches than one page, the typed text itself is added
+    so readline does not extend the line past what every match has in common.
+    """
+    total = index.count(text)
+    if total <= SUGGESTION_PAGE_SIZE:
+        return index.top(text, total)
+    return [text] + index.top(text, SUGGESTION_PAGE_SIZE)
@@ -0,0 +1,143 @@
+import unicodedata
+from itertools import count
+
+from src.data.tracked import revision, stored_items
+
+_NO_CHARACTERS = ()
+_NO_ALIASES = {}
+
+# Index versions are unique across all registries, so caches keyed on a
+# version never mistake one registry's index for another's.
+_versions = count(1)
+
+
+def fold_name(name):
+    """
+    Folds a character name for lookups: accents removed, case-folded and
+    whitespace collapsed, so "Pokémon Trainer", "pokemon  trainer" and
+    "POKEMON TRAINER" all map to the same key.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+class CharacterRegistry:
+    """
+    Canonical character names and their aliases, built from data["character_list"]
+    and data["character_aliases"].
+    Every spelling (canonical name or alias) is folded with fold_name() into a
+    single dict, so resolving a name is one dict lookup however large the alias
+    table gets. The index is (re)built lazily on first use and whenever the
+    list or alias table changes: replaced, resized, or (for loaded, tracked
+    data) edited anywhere inside, such as an alias added to or renamed in an
+    existing list. For plain dicts and lists, call invalidate() after editing
+    them in place.
+    """
+
+    def __init__(self, character_list, character_aliases):
+        self._character_list = character_list
+        self._character_aliases = character_aliases
+        self._stamp = None
+        self._index = {}
+        self._aliases = {}
+        self._version = 0
+
+    def _signature(self):
+        return (
+            id(self._character_list), len(self._character_list), revision(self._character_list),
+            id(self._character_aliases), len(self._character_aliases), revision(self._character_aliases),
+        )
+
+    def _ensure_index(self):
+        stamp = self._signature()
+        if stamp != self._stamp:
+            self._rebuild()
+            self._stamp = stamp
+
+    def _rebuild(self):
+        index = {}
+        aliases = {}
+        for main in self._character_list:
+            index.setdefault(fold_name(main), main)
+            aliases[main] = [main]
+        for main, alias_list in stored_items(self._character_aliases):
+            index[fold_name(main)] = main
+            aliases[main] = [main] + [a for a in alias_list if a != main]
+            for alias in alias_list:
+                index.setdefault(fold_name(alias), main)
+        self._index = index
+        self._aliases = aliases
+        self._version = next(_versions)
+
+    @property
+    def version(self):
+        """
+        Changes every time the index is rebuilt, i.e. whenever the alias table changes.
+        """
+        self._ensure_index()
+        return self._version
+
+    def invalidate(self):
+        """
+        Forces a rebuild on the next lookup.
+        """
+        self._stamp = None
+
+    def canonical(self, name):
+        """
+        Returns the canonical name for any known spelling of a character,
+        or None if the name is not a known character or alias.
+        """
+        self._ensure_index()
+        return self._index.get(fold_name(name))
+
+    def main_name(self, name):
+        """
+        Like canonical(), but returns the name unchanged if it is unknown.
+        """
+        return self.canonical(name) or name
+
+    def aliases(self, name):
+        """
+        Returns [canonical name, alias1, alias2, ...] for a character,
+        or [name] if it is unknown.
+        """
+        main = self.canonical(name)
+        if main is None:
+            return [name]
+        return self._aliases[main]
+
+    def names(self):
+        """
+        Returns all canonical names.
+        """
+        self._ensure_index()
+        return list(self._aliases)
+
+    def __contains__(self, name):
+        return self.canonical(name) is not None
+
+    def __len__(self):
+        self._ensure_index()
+        return len(self._aliases)
+
+
+_registry = None
+
+
+def get_registry(data):
+    """
+    Returns the CharacterRegistry for data, reusing the previous one as long
+    as it was built from the same character list and alias table.
+    """
+    global _registry
+    character_list = data.get("character_list", _NO_CHARACTERS)
+    character_aliases = data.get("character_aliases", _NO_ALIASES)
+    if (
+        _registry is None
+        or _registry._character_list is not character_list
+        or _registry._character_aliases is not character_aliases
+    ):
+        _registry = CharacterRegistry(character_list, character_aliases)
+    return _registry
@@ -1,12 +1,18 @@
 from src.players.autocomplete import input_with_autocomplete
+from src.players.character_registry import get_registry
+from src.players.completion import CompletionIndex
+from src.players.fuzzy import get_fuzzy_index
+from src.players.roster import top_characters as top_characters_of
 
 
 def get_characters(player_input, data):
     """
-    1. Finds or creates the player entry under data["players"].
+    1. Finds or creates the player entry under data["players"]. A name one
+       typo away from known players offers those first.
     2. Lists up to 10 top characters with their usage counts.
     3. Asks “How many characters did X play?”, then for each:
-       - If they type a name (or tab-complete), use that.
+       - If they type a name or alias (or tab-complete), use its canonical name.
+         Names that are not known characters are rejected.
        - Otherwise auto-select the next-most-used unused character.
        - If none remain, use "Unknown".
     4. Increments the usage count for each chosen character.
@@ -15,15 +21,15 @@ def get_characters(player_input, data):
     player_key = player_input.lower()
     players = data["players"]
 
-    if player_key in players:
-        display_name, char_dict = players[player_key]
-    else:
-        display_name = player_input
-        char_dict = {}
-        players[player_key] = [display_name, char_dict]
+    if player_key not in players:
+        player_key = did_you_mean(player_input, data) or player_key
+
+    if player_key not in players:
+        players[player_key] = [player_input, {}]
+    # Read back what was stored: a compact roster keeps its own entry
+    display_name, char_dict = players[player_key]
 
-    sorted_chars = sorted(char_dict.items(), key=lambda x: x[1], reverse=True)
-    top_characters = [c[0] for c in sorted_chars][:10]
+    top_characters = top_characters_of(char_dict, 10)
 
     print(f"\nTop characters for {display_name}:")
     if top_characters:
@@ -48,10 +54,20 @@ def get_characters(player_input, data):
     chosen = []
     used_chars = set()
     character_list = data.get("character_list", [])
-    autocomplete_options = top_characters if top_characters else character_list
+    # Every character is offered, with this player's most played ones ranked first
+    autocomplete_options = CompletionIndex(top_characters + character_list, weights=char_dict)
+    registry = get_registry(data)
     for i in range(num):
         prompt = f"Character {i+1} for {display_name} (leave blank to auto-select): "
-        char_input = input_with_autocomplete(prompt, autocomplete_options, required=False)
+        while True:
+            char_input = input_with_autocomplete(prompt, autocomplete_options, required=False)
+            if not char_input or not len(registry):
+                break
+            canonical = registry.canonical(char_input)
+            if canonical:
+                char_input = canonical
+                break
+            print(f"Unknown character '{char_input}'. Please enter a character name or alias.")
 
         if char_input:
             chosen_char = char_input
@@ -66,4 +82,28 @@ def get_characters(player_input, data):
         if chosen_char != "Unknown":
             char_dict[chosen_char] = char_dict.get(chosen_char, 0) + 1
 
-    return display_name, chosen
\ No newline at end of file
+    return display_name, chosen
+
+def did_you_mean(player_input, data):
+    """
+    Offers known players one edit away from an unknown name ("Hertu" ->
+    "Hertsu"), most used first. Returns the chosen player's key, or None to
+    add the name as a new player.
+    """
+    players = data["players"]
+    keys = [k for k in get_fuzzy_index(data).suggest(player_input) if k in players]
+    if not keys:
+        return None
+    keys.sort(key=lambda k: sum(players[k][1].values()), reverse=True)
+
+    print(f"\n'{player_input}' is not a known player. Did you mean:")
+    for i, key in enumerate(keys, 1):
+        display_name, char_dict = players[key]
+        print(f"  {i}. {display_name} ({sum(char_dict.values())} characters played)")
+    while True:
+        choice = input(f"\033[91mEnter a number, or leave blank to add '{player_input}' as a new player: \033[0m").strip()
+        if not choice:
+            return None
+        if choice.isdigit() and 1 <= int(choice) <= len(keys):
+            return keys[int(choice) - 1]
+        print("Invalid choice, try again.")
@@ -0,0 +1,125 @@
+import heapq
+import unicodedata
+from bisect import bisect_left
+
+from src.data.tracked import stored_items
+
+# Sorts after every real character, so key + _HIGH bounds a prefix range.
+_HIGH = "\U0010ffff"
+
+
+def fold_prefix(text):
+    """
+    Case- and accent-folds text for prefix matching ("pok" matches "Pokémon Trainer").
+    Unlike fold_name(), whitespace is kept so a typed trailing space still counts.
+    """
+    if text.isascii():
+        # Nothing to decompose, and casefolding stays within ASCII
+        return text.casefold()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class CompletionIndex:
+    """
+    Prefix index over a set of completion options.
+    Options are folded and sorted once, so finding every option that starts
+    with a prefix is two binary searches instead of a scan. Matches are ranked
+    by weight (e.g. usage count), highest first; ties keep alphabetical order.
+    """
+
+    def __init__(self, options, weights=None):
+        pairs = sorted((fold_prefix(o), o) for o in dict.fromkeys(options))
+        self._keys = [k for k, _ in pairs]
+        self._options = [o for _, o in pairs]
+        self._weights = weights or {}
+        self._ranked = None
+
+    def __len__(self):
+        return len(self._options)
+
+    def _range(self, text):
+        key = fold_prefix(text)
+        lo = bisect_left(self._keys, key)
+        hi = bisect_left(self._keys, key + _HIGH, lo)
+        return lo, hi
+
+    def count(self, text):
+        """
+        Returns how many options start with text.
+        """
+        lo, hi = self._range(text)
+        return hi - lo
+
+    def matches(self, text):
+        """
+        Returns all options starting with text, in alphabetical order.
+        """
+        lo, hi = self._range(text)
+        return self._options[lo:hi]
+
+    def top(self, text, limit, offset=0):
+        """
+        Returns one page of options starting with text, ranked by weight.
+        Narrow prefixes rank just their own matches; broad ones (like the empty
+        prefix) walk the precomputed global ranking and stop once the page is full.
+        """
+        lo, hi = self._range(text)
+        options = self._options
+        weights = self._weights
+        wanted = offset + limit
+        if not weights:
+            return options[lo + offset:min(hi, lo + wanted)]
+        if wanted * len(options) < (hi - lo) ** 2:
+            page = []
+            for i in self._global_ranking():
+                if lo <= i < hi:
+                    page.append(i)
+                    if len(page) == wanted:
+                        break
+        else:
+            page = heapq.nlargest(
+                wanted, range(lo, hi),
+                key=lambda i: (weights.get(options[i], 0), -i)
+            )
+        return [options[i] for i in page[offset:]]
+
+    def _global_ranking(self):
+        if self._ranked is None:
+            weights = self._weights
+            options = self._options
+            self._ranked = sorted(range(len(options)), key=lambda i: (-weights.get(options[i], 0), i))
+        return self._ranked
+
+    @classmethod
+    def in_order(cls, options):
+        """
+        Builds an index that ranks matches in the order the options are given.
+        """
+        return cls(options, {o: len(options) - i for i, o in enumerate(options)})
+
+
+def player_roster(players):
+    """
+    Returns (keys, display names, total usages) of data["players"], three
+    lists in iteration order. A snapshot-backed section answers from its
+    roster table, without decoding anyone's character counts.
+    """
+    roster = players.roster() if hasattr(players, "roster") else None
+    if roster is not None:
+        return roster
+    keys, names, weights = [], [], []
+    for key, (display_name, char_dict) in stored_items(players):
+        keys.append(key)
+        names.append(display_name)
+        weights.append(sum(char_dict.values()))
+    return keys, names, weights
+
+
+def player_index(players):
+    """
+    Returns the CompletionIndex over player display names, the most active
+    players (by total character usage) ranked first.
+    """
+    _, names, weights = player_roster(players)
+    return CompletionIndex(names, weights=dict(zip(names, weights)))
@@ -0,0 +1,89 @@
+"""
+Finds players entered twice under slightly different names ("hertsu" and
+"hertu") and merges their character counts.
+
+    python -m src.players.dedup           # list what would be merged
+    python -m src.players.dedup --apply   # merge and save
+"""
+import argparse
+
+from src.data.loader import load_data
+from src.data.saver import save_data
+from src.players.completion import player_roster
+from src.players.fuzzy import FuzzyIndex
+
+
+def plan_merges(players):
+    """
+    Returns ({target_key: [keys merged into it]}, [ambiguous pairs]).
+    Each player is merged into its most used near-duplicate, if that one is
+    used more; chains ("abcd" -> "abce" -> "abde") are not followed, since
+    the ends of a chain may be different people, and are reported instead.
+    """
+    keys, names, weights = player_roster(players)
+    index = FuzzyIndex()
+    for key, display_name in zip(keys, names):
+        index.add(key, display_name)
+
+    usage = dict(zip(keys, weights))
+    neighbours = {}
+    for a, b in index.near_duplicates():
+        neighbours.setdefault(a, set()).add(b)
+        neighbours.setdefault(b, set()).add(a)
+
+    def rank(key):
+        return usage[key], key
+
+    target_of = {}
+    for key, near in neighbours.items():
+        best = max(near, key=rank)
+        if rank(best) > rank(key):
+            target_of[key] = best
+
+    merges = {}
+    ambiguous = []
+    for key, target in sorted(target_of.items()):
+        if target in target_of:
+            ambiguous.append((key, target))
+        else:
+            merges.setdefault(target, []).append(key)
+    return merges, ambiguous
+
+
+def apply_merges(players, merges):
+    """
+    Adds the character counts of every merged player to its target and
+    removes the merged entries.
+    """
+    for target, sources in merges.items():
+        char_dict = players[target][1]
+        for source in sources:
+            for char, count in players.pop(source)[1].items():
+                char_dict[char] = char_dict.get(char, 0) + count
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.players.dedup",
+                                     description="Merge players entered under slightly different names.")
+    parser.add_argument("--apply", action="store_true", help="merge and save (default: only list)")
+    args = parser.parse_args()
+
+    data = load_data()
+    players = data.get("players", {})
+    merges, ambiguous = plan_merges(players)
+
+    for target, sources in sorted(merges.items()):
+        names = ", ".join(f"{players[s][0]} ({sum(players[s][1].values())})" for s in sources)
+        print(f"{players[target][0]} ({sum(players[target][1].values())}) <- {names}")
+    for key, target in ambiguous:
+        print(f"skipped: {players[key][0]} ~ {players[target][0]} (part of a chain, merge by hand)")
+    print(f"{sum(len(s) for s in merges.values())} players to merge into {len(merges)}")
+
+    if args.apply and merges:
+        apply_merges(players, merges)
+        save_data(data)
+        print("Merged and saved.")
+
+
+if __name__ == "__main__":
+    main()
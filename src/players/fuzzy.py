@@ -0,0 +1,177 @@
+import re
+from itertools import islice
+
+from src.data.tracked import revision
+from src.players.character_registry import fold_name
+from src.players.completion import player_roster
+
+# Names shorter than this only match exactly; one edit turns "Leo" into "Lea".
+MIN_FUZZY_LENGTH = 4
+
+_DIGITS = re.compile(r"\d+")
+
+
+def edit_distance(a, b, limit=1):
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions) between a and b, or limit + 1 once it is
+    known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = ca != cb
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _deletions(name):
+    """
+    The name with each character removed in turn (its deletion neighbourhood).
+    """
+    return {name[:i] + name[i + 1:] for i in range(len(name))}
+
+
+def same_numbers(a, b):
+    """
+    True if a and b contain the same digit runs: "Player1" and "Player2" are
+    different players even though they are one edit apart.
+    """
+    return _DIGITS.findall(a) == _DIGITS.findall(b)
+
+
+class FuzzyIndex:
+    """
+    Finds player keys within one edit of a (mistyped) name.
+    Every indexed name is stored under each of its single-character deletions,
+    so a lookup generates the query's own deletions and checks a handful of
+    dict entries: two names one edit apart always share the shorter name or
+    one deletion (symmetric deletion). Candidates are confirmed with
+    edit_distance(). Lookups cost the same for 100 or 100,000 players.
+    """
+
+    def __init__(self):
+        # Values are a single string, or a list in the rare case of several;
+        # a list per entry would make a large roster's index several times
+        # bigger and slow down garbage collection.
+        self._keys = {}      # folded name -> player key(s)
+        self._deleted = {}   # deletion variant -> folded name(s)
+
+    def add(self, player_key, display_name):
+        for name in {fold_name(player_key), fold_name(display_name)}:
+            if name in self._keys:
+                _add_value(self._keys, name, player_key)
+                continue
+            self._keys[name] = player_key
+            if len(name) >= MIN_FUZZY_LENGTH:
+                for variant in _deletions(name):
+                    _add_value(self._deleted, variant, name)
+
+    def keys_for(self, name):
+        return _values(self._keys.get(name))
+
+    def candidates(self, name):
+        """
+        Folded names that may be within one edit of the folded name.
+        """
+        found = set(_values(self._deleted.get(name)))
+        for variant in _deletions(name):
+            if variant in self._keys:
+                found.add(variant)
+            found.update(_values(self._deleted.get(variant)))
+        found.discard(name)
+        return found
+
+    def suggest(self, text, limit=5):
+        """
+        Returns up to limit player keys one edit away from text (excluding an
+        exact match), e.g. "hertu" -> ["hertsu"].
+        """
+        name = fold_name(text)
+        if len(name) < MIN_FUZZY_LENGTH:
+            return []
+        keys = []
+        for candidate in sorted(self.candidates(name)):
+            if same_numbers(name, candidate) and edit_distance(name, candidate) <= 1:
+                keys.extend(k for k in self.keys_for(candidate) if k not in keys)
+        return keys[:limit]
+
+    def near_duplicates(self):
+        """
+        Returns the set of (key_a, key_b) player pairs whose names are within
+        one edit of each other. Only names sharing a deletion bucket are
+        compared, never every pair.
+        """
+        pairs = set()
+        for keys in self._keys.values():
+            if isinstance(keys, list):
+                pairs.update((a, b) for a in keys for b in keys if a < b)
+        for variant, names in self._deleted.items():
+            group = list(_values(names))
+            if variant in self._keys:
+                group.append(variant)
+            for i, a in enumerate(group):
+                for b in group[i + 1:]:
+                    if a != b and same_numbers(a, b) and edit_distance(a, b) <= 1:
+                        for key_a in self.keys_for(a):
+                            for key_b in self.keys_for(b):
+                                if key_a != key_b:
+                                    pairs.add((min(key_a, key_b), max(key_a, key_b)))
+        return pairs
+
+
+def _values(value):
+    if value is None:
+        return ()
+    return value if isinstance(value, list) else (value,)
+
+
+def _add_value(index, key, value):
+    current = index.get(key)
+    if current is None:
+        index[key] = value
+    elif isinstance(current, list):
+        if value not in current:
+            current.append(value)
+    elif current != value:
+        index[key] = [current, value]
+
+
+_fuzzy = None
+_fuzzy_stamp = None
+_fuzzy_keys = []
+_fuzzy_names = []
+
+
+def get_fuzzy_index(data):
+    """
+    Returns the FuzzyIndex over data["players"]. The roster is read again
+    whenever the players section changes: replaced, resized, or (for loaded,
+    tracked data) edited anywhere inside. Players appended since the last
+    call are indexed incrementally; a rename or removal re-indexes everyone.
+    """
+    global _fuzzy, _fuzzy_stamp, _fuzzy_keys, _fuzzy_names
+    players = data.setdefault("players", {})
+    stamp = (id(players), len(players), revision(players))
+    if _fuzzy is not None and stamp == _fuzzy_stamp:
+        return _fuzzy
+    # Keys and display names only; a snapshot answers without decoding characters
+    keys, names, _ = player_roster(players)
+    indexed = len(_fuzzy_keys)
+    if _fuzzy is None or keys[:indexed] != _fuzzy_keys or names[:indexed] != _fuzzy_names:
+        _fuzzy = FuzzyIndex()
+        indexed = 0
+    for key, display_name in islice(zip(keys, names), indexed, None):
+        _fuzzy.add(key, display_name)
+    _fuzzy_stamp, _fuzzy_keys, _fuzzy_names = stamp, keys, names
+    return _fuzzy
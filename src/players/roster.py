@@ -0,0 +1,233 @@
+import heapq
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+# A player's usage is one flat array('I') of (character id, count, order)
+# triples, kept most used first; order is when the character was first
+# played and breaks ties, matching a stable sort of the {character: count}
+# dict it replaces.
+_CELL = 3
+
+
+class CharacterTable:
+    """
+    Character names <-> small integer ids. Ids follow character_list; names
+    not in it (older data, "Unknown") get the next free id when first seen.
+    """
+
+    def __init__(self, character_list=()):
+        self.names = []
+        self.ids = {}
+        for name in character_list:
+            self.id(name)
+
+    def id(self, name):
+        cid = self.ids.get(name)
+        if cid is None:
+            cid = self.ids[name] = len(self.names)
+            self.names.append(sys.intern(name))
+        return cid
+
+
+class Player:
+    """
+    One roster entry. Unpacks like the [display_name, {character: count}]
+    list it replaces (`display_name, char_dict = player`), where char_dict
+    is a CharacterCounts view over the player's cells.
+    """
+    __slots__ = ("display_name", "cells", "table")
+
+    def __init__(self, display_name, table, counts=None):
+        self.display_name = sys.intern(display_name)
+        self.table = table
+        self.cells = array("I")
+        if counts:
+            ranked = sorted(
+                ((table.id(char), count, order) for order, (char, count) in enumerate(counts.items())),
+                key=lambda cell: (-cell[1], cell[2])
+            )
+            for cell in ranked:
+                self.cells.extend(cell)
+
+    def __iter__(self):
+        yield self.display_name
+        yield CharacterCounts(self)
+
+    def __getitem__(self, index):
+        if index in (0, -2):
+            return self.display_name
+        if index in (1, -1):
+            return CharacterCounts(self)
+        raise IndexError(index)
+
+    def __len__(self):
+        return 2
+
+    def _find(self, cid):
+        try:
+            return self.cells[::_CELL].index(cid) * _CELL
+        except ValueError:
+            return -1
+
+    def set_count(self, char, count):
+        cells = self.cells
+        cid = self.table.id(char)
+        i = self._find(cid)
+        if i < 0:
+            order = max(cells[2::_CELL], default=-1) + 1
+            i = len(cells)
+            cells.extend((cid, count, order))
+        else:
+            cells[i + 1] = count
+        self._sift(i)
+
+    def remove(self, char):
+        cid = self.table.ids.get(char)
+        i = -1 if cid is None else self._find(cid)
+        if i < 0:
+            raise KeyError(char)
+        del self.cells[i:i + _CELL]
+
+    def _sift(self, i):
+        """
+        Moves the triple at i up or down until the ranking holds again;
+        a count change moves a character past only the ones it overtakes.
+        """
+        cells = self.cells
+        rank = (-cells[i + 1], cells[i + 2])
+        start = i
+        while i > 0 and rank < (-cells[i - 2], cells[i - 1]):
+            i -= _CELL
+        if i == start:
+            while i + _CELL < len(cells) and rank > (-cells[i + 4], cells[i + 5]):
+                i += _CELL
+        if i != start:
+            cell = cells[start:start + _CELL]
+            del cells[start:start + _CELL]
+            cells[i:i] = cell
+
+    def top(self, k=None):
+        """
+        Returns the k most used characters, most used first.
+        """
+        names = self.table.names
+        end = len(self.cells) if k is None else k * _CELL
+        return [names[cid] for cid in self.cells[0:end:_CELL]]
+
+    def items(self):
+        """
+        (character, count) pairs in the order they were first played.
+        """
+        cells = self.cells
+        names = self.table.names
+        triples = sorted(range(0, len(cells), _CELL), key=lambda i: cells[i + 2])
+        return [(names[cells[i]], cells[i + 1]) for i in triples]
+
+    def to_json(self):
+        return [self.display_name, dict(self.items())]
+
+
+class CharacterCounts(MutableMapping):
+    """
+    {character: count} view of a Player; writes keep the ranking up to date.
+    Iterates in first-played order, like the dict it stands in for.
+    """
+    __slots__ = ("player",)
+
+    def __init__(self, player):
+        self.player = player
+
+    def __getitem__(self, char):
+        count = self.get(char)
+        if count is None:
+            raise KeyError(char)
+        return count
+
+    def get(self, char, default=None):
+        cid = self.player.table.ids.get(char)
+        i = -1 if cid is None else self.player._find(cid)
+        return self.player.cells[i + 1] if i >= 0 else default
+
+    def __setitem__(self, char, count):
+        self.player.set_count(char, count)
+
+    def __delitem__(self, char):
+        self.player.remove(char)
+
+    def __iter__(self):
+        return iter([char for char, _ in self.player.items()])
+
+    def __len__(self):
+        return len(self.player.cells) // _CELL
+
+    def values(self):
+        return self.player.cells[1::_CELL]
+
+    def top(self, k=None):
+        return self.player.top(k)
+
+    def to_json(self):
+        return dict(self.player.items())
+
+
+class Roster(MutableMapping):
+    """
+    Compact stand-in for data["players"] ({key: [display_name, {character:
+    count}]}): display names are interned, character names are shared ids
+    and each player's usage is a single array kept in ranked order, so the
+    top characters are read off the front instead of sorting. Assigning a
+    [display_name, counts] pair converts it; saving goes through to_json().
+    """
+
+    def __init__(self, players=None, character_list=()):
+        self.table = CharacterTable(character_list)
+        self._players = {}
+        for key, (display_name, counts) in (players or {}).items():
+            self._players[key] = Player(display_name, self.table, counts)
+
+    def __getitem__(self, key):
+        return self._players[key]
+
+    def __setitem__(self, key, value):
+        if not (isinstance(value, Player) and value.table is self.table):
+            display_name, counts = value
+            value = Player(display_name, self.table, counts)
+        self._players[key] = value
+
+    def __delitem__(self, key):
+        del self._players[key]
+
+    def __iter__(self):
+        return iter(self._players)
+
+    def __len__(self):
+        return len(self._players)
+
+    def __contains__(self, key):
+        return key in self._players
+
+    def to_json(self):
+        return {key: player.to_json() for key, player in self._players.items()}
+
+
+def compact_players(data):
+    """
+    Replaces data["players"] with a Roster (once) and returns it.
+    """
+    players = data.get("players")
+    if not isinstance(players, Roster):
+        players = data["players"] = Roster(players, data.get("character_list", ()))
+    return players
+
+
+def top_characters(char_dict, k=None):
+    """
+    Returns a player's k most used characters (all when k is None), most used
+    first with ties in first-played order, from a plain dict or a roster entry.
+    """
+    if isinstance(char_dict, CharacterCounts):
+        return char_dict.top(k)
+    if k is None:
+        return sorted(char_dict, key=char_dict.get, reverse=True)
+    return heapq.nlargest(k, char_dict, key=char_dict.get)
@@ -0,0 +1,203 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+# Span categories: "input" is time spent waiting for the operator, everything
+# else is compute. The summary reports the two separately.
+INPUT = "input"
+COMPUTE = "compute"
+
+DEFAULT_TRACE_FILE = "profile.trace.json"
+
+
+class _NullSpan:
+    """
+    What span() returns while profiling is off: entering and leaving it does nothing.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ("profiler", "name", "category", "start", "cpu_start", "mem_start", "peak",
+                 "wall", "cpu", "alloc", "depth")
+
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        stack = self.profiler.stack
+        self.depth = len(stack)
+        self.mem_start = self.peak = 0
+        if self.profiler.memory:
+            if stack:
+                # reset_peak() is global; keep the enclosing span's peak so far
+                parent = stack[-1]
+                parent.peak = max(parent.peak, tracemalloc.get_traced_memory()[1] - parent.mem_start)
+            tracemalloc.reset_peak()
+            self.mem_start = tracemalloc.get_traced_memory()[0]
+        stack.append(self)
+        self.cpu_start = time.thread_time_ns()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.cpu = time.thread_time_ns() - self.cpu_start
+        self.wall = end - self.start
+        self.alloc = 0
+        stack = self.profiler.stack
+        stack.pop()
+        if self.profiler.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.alloc = current - self.mem_start
+            self.peak = max(self.peak, peak - self.mem_start)
+            if stack:
+                parent = stack[-1]
+                parent.peak = max(parent.peak, self.peak + self.mem_start - parent.mem_start)
+        self.profiler.finished.append(self)
+        return False
+
+
+class Profiler:
+    """
+    Collects spans for one process and writes them as a Chrome trace
+    (chrome://tracing, Perfetto) plus a per-span summary table. Without
+    memory, spans only measure time and tracemalloc stays off.
+    """
+
+    def __init__(self, trace_path=DEFAULT_TRACE_FILE, memory=True):
+        self.trace_path = trace_path
+        self.memory = memory
+        self.stack = []
+        self.finished = []
+        self.notes = []
+        self.origin = time.perf_counter_ns()
+        if memory:
+            tracemalloc.start()
+
+    def trace_events(self):
+        pid = os.getpid()
+        tid = threading.get_ident()
+        return [{
+            "name": s.name, "cat": s.category, "ph": "X", "pid": pid, "tid": tid,
+            "ts": (s.start - self.origin) / 1000, "dur": s.wall / 1000,
+            "args": {"cpu_ms": round(s.cpu / 1e6, 3), "alloc_kib": round(s.alloc / 1024, 1),
+                     "peak_kib": round(s.peak / 1024, 1)},
+        } for s in sorted(self.finished, key=lambda s: s.start)]
+
+    def write_trace(self):
+        with open(self.trace_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+
+    def summary(self, input_label="waiting for input"):
+        rows = {}
+        for s in self.finished:
+            row = rows.setdefault(s.name, [s.category, 0, 0, 0, 0, 0])
+            row[1] += 1
+            row[2] += s.wall
+            row[3] += s.cpu
+            row[4] += s.alloc
+            row[5] = max(row[5], s.peak)
+
+        header = f"{'span':<28} {'calls':>5} {'wall ms':>10} {'cpu ms':>10}"
+        lines = [header + (f" {'alloc KiB':>10} {'peak KiB':>10}" if self.memory else "")]
+        for name, (category, calls, wall, cpu, alloc, peak) in sorted(rows.items(), key=lambda r: -r[1][2]):
+            label = f"{name} ({category})" if category == INPUT else name
+            line = f"{label:<28} {calls:>5} {wall / 1e6:>10.2f} {cpu / 1e6:>10.2f}"
+            if self.memory:
+                line += f" {alloc / 1024:>10.1f} {peak / 1024:>10.1f}"
+            lines.append(line)
+
+        # Only top-level spans, so nested time is not counted twice
+        waiting = sum(s.wall for s in self.finished if s.depth == 0 and s.category == INPUT)
+        computing = sum(s.wall for s in self.finished if s.depth == 0 and s.category != INPUT)
+        lines.append(f"{input_label} {waiting / 1e6:.1f} ms, compute {computing / 1e6:.1f} ms")
+        lines.extend(self.notes)
+        return "\n".join(lines)
+
+    def stop_tracing(self):
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def finish(self):
+        self.stop_tracing()
+        self.write_trace()
+        print(self.summary(), file=sys.stderr)
+        print(f"Trace written to {self.trace_path}", file=sys.stderr)
+
+
+_profiler = None
+
+
+def span(name, category=COMPUTE):
+    """
+    Times a block: `with span("construct_tags"): ...`. Returns a shared no-op
+    context manager unless profiling is enabled.
+    """
+    if _profiler is None:
+        return _NULL_SPAN
+    return Span(_profiler, name, category)
+
+
+def note(text):
+    """
+    Adds a line (e.g. cache statistics) to the end of the summary, if
+    profiling is enabled.
+    """
+    if _profiler is not None:
+        _profiler.notes.append(text)
+
+
+def enable(trace_path=None, memory=True):
+    """
+    Starts profiling; spans are collected until finish() (or stop()).
+    trace_path defaults to profile.trace.json in the working directory.
+    """
+    global _profiler
+    _profiler = Profiler(trace_path or DEFAULT_TRACE_FILE, memory)
+    return _profiler
+
+
+def enable_from_env():
+    """
+    Enables profiling if $SMASHVOD_PROFILE is set: "1" for the default trace
+    file, anything else is taken as the trace path.
+    """
+    value = os.environ.get("SMASHVOD_PROFILE", "")
+    if value and value != "0":
+        enable(None if value == "1" else value)
+
+
+def finish():
+    """
+    Writes the trace and prints the summary, if profiling was enabled.
+    """
+    profiler = stop()
+    if profiler is not None:
+        profiler.finish()
+
+
+def stop():
+    """
+    Stops collecting spans and returns the profiler (None if it was off),
+    without writing anything.
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.stop_tracing()
+    return profiler
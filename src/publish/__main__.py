@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from src.publish.limits import DEFAULT_DAILY_QUOTA
+from src.publish.mock_server import MockVideoApi, server_url
+from src.publish.outbox import Outbox, outbox_path
+from src.publish.publisher import Publisher
+
+
+def enqueue(args, outbox):
+    queued = unchanged = skipped = 0
+    with open(args.metadata, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "error" in record or not record.get("video_id"):
+                skipped += 1
+            elif outbox.enqueue(record):
+                queued += 1
+            else:
+                unchanged += 1
+    print(f"{queued} queued, {unchanged} already published, {skipped} skipped (error or no video_id)")
+
+
+async def run(args, outbox):
+    endpoint = args.endpoint
+    mock = server = None
+    if args.mock:
+        mock = MockVideoApi(latency=args.mock_latency, fail_rate=args.mock_fail_rate,
+                            throttle_rate=args.mock_throttle_rate)
+        server = await mock.start()
+        endpoint = server_url(server)
+    publisher = Publisher(outbox, endpoint, concurrency=args.concurrency, rate=args.rate,
+                          daily_quota=args.quota, max_attempts=args.max_attempts)
+    try:
+        report = await publisher.run(include_failed=args.retry_failed)
+    finally:
+        if server is not None:
+            await mock.stop(server)
+    print(report.summary())
+    if mock is not None:
+        print(f"mock server: {json.dumps(mock.stats())}")
+
+
+async def serve_mock(args):
+    mock = MockVideoApi(latency=args.latency, fail_rate=args.fail_rate, throttle_rate=args.throttle_rate)
+    server = await mock.start(port=args.port)
+    print(f"Mock videos.update endpoint on {server_url(server)}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.publish",
+                                     description="Publish generated titles, tags and descriptions to YouTube.")
+    parser.add_argument("--outbox", help="outbox database (default: next to the data file)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enqueue", help="queue the records of a batch/ingest JSONL output (they need a video_id)")
+    p.add_argument("metadata")
+
+    p = sub.add_parser("run", help="send everything queued")
+    p.add_argument("--endpoint", default="https://www.googleapis.com",
+                   help="API base URL (default: the YouTube Data API); the token comes from $SMASHVOD_PUBLISH_TOKEN")
+    p.add_argument("-c", "--concurrency", type=int, default=8, help="requests in flight at once")
+    p.add_argument("--rate", type=float, default=10.0, help="requests per second")
+    p.add_argument("--quota", type=int, default=DEFAULT_DAILY_QUOTA, help="API units per day")
+    p.add_argument("--max-attempts", type=int, default=5)
+    p.add_argument("--retry-failed", action="store_true", help="also retry videos that failed before")
+    p.add_argument("--mock", action="store_true", help="publish to an in-process mock server instead")
+    p.add_argument("--mock-latency", type=float, default=0.02)
+    p.add_argument("--mock-fail-rate", type=float, default=0.05)
+    p.add_argument("--mock-throttle-rate", type=float, default=0.02)
+
+    sub.add_parser("status", help="show what is queued, sent and failed")
+
+    p = sub.add_parser("mock", help="run the mock endpoint on its own")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--latency", type=float, default=0.02)
+    p.add_argument("--fail-rate", type=float, default=0.0)
+    p.add_argument("--throttle-rate", type=float, default=0.0)
+
+    args = parser.parse_args()
+    if args.command == "mock":
+        try:
+            asyncio.run(serve_mock(args))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    outbox = Outbox(args.outbox or outbox_path())
+    try:
+        if args.command == "enqueue":
+            enqueue(args, outbox)
+        elif args.command == "run":
+            asyncio.run(run(args, outbox))
+        else:
+            counts = outbox.counts()
+            print(", ".join(f"{counts.get(state, 0)} {state}" for state in ("pending", "sent", "failed")))
+            for video_id, attempts, error in outbox.failures():
+                print(f"  {video_id}: {error} after {attempts} attempts")
+    finally:
+        outbox.close()
+
+
+if __name__ == "__main__":
+    main()
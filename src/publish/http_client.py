@@ -0,0 +1,106 @@
+import asyncio
+import json
+from urllib.parse import urlsplit
+
+
+class HttpError(Exception):
+    """
+    A request that could not be completed (connection refused, reset, timeout, ...).
+    """
+
+
+class HttpClient:
+    """
+    Minimal HTTP/1.1 client for JSON APIs that keeps up to `pool_size`
+    connections to one host open and reuses them (keep-alive).
+    """
+
+    def __init__(self, base_url, pool_size=8, timeout=30.0, headers=None):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.ssl = parts.scheme == "https"
+        self.port = parts.port or (443 if self.ssl else 80)
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.connections_opened = 0
+        self._idle = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _connect(self):
+        if self._idle:
+            return self._idle.pop()
+        self.connections_opened += 1
+        return await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+
+    async def request(self, method, path, body=None, headers=None):
+        """
+        Sends one request and returns (status, headers, parsed JSON body or None).
+        Raises HttpError if no complete response was received.
+        """
+        async with self._slots:
+            try:
+                reader, writer = await asyncio.wait_for(self._connect(), self.timeout)
+            except (OSError, asyncio.TimeoutError) as e:
+                raise HttpError(f"connect failed: {e!r}") from None
+            try:
+                payload = json.dumps(body).encode("utf-8") if body is not None else b""
+                lines = [f"{method} {self.base_path}{path} HTTP/1.1", f"Host: {self.host}",
+                         f"Content-Length: {len(payload)}", "Content-Type: application/json"]
+                for name, value in {**self.headers, **(headers or {})}.items():
+                    lines.append(f"{name}: {value}")
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+                status, response_headers, data = await asyncio.wait_for(self._read_response(reader), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                writer.close()
+                raise HttpError(f"{method} {path}: {e!r}") from None
+            except BaseException:
+                writer.close()
+                raise
+
+            if response_headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self._idle.append((reader, writer))
+            try:
+                parsed = json.loads(data) if data else None
+            except ValueError:
+                parsed = None
+            return status, response_headers, parsed
+
+    @staticmethod
+    async def _read_response(reader):
+        status_line = await reader.readline()
+        if not status_line:
+            raise asyncio.IncompleteReadError(b"", None)
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            return status, headers, b"".join(chunks)
+        length = int(headers.get("content-length", 0))
+        return status, headers, await reader.readexactly(length) if length else b""
@@ -0,0 +1,60 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+# YouTube Data API: 10,000 units per day by default; videos.update costs 50.
+DEFAULT_DAILY_QUOTA = 10_000
+UPDATE_COST = 50
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average and bursts of up to `burst`.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class DailyQuota:
+    """
+    API units left for the current UTC day, persisted in the outbox.
+    Units are reserved before a request is sent, since the API charges for
+    failed calls too.
+    """
+
+    def __init__(self, outbox, limit=DEFAULT_DAILY_QUOTA, cost=UPDATE_COST):
+        self.outbox = outbox
+        self.limit = limit
+        self.cost = cost
+
+    @staticmethod
+    def today():
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def remaining(self):
+        return self.limit - self.outbox.quota_used(self.today())
+
+    def reserve(self):
+        if self.remaining() < self.cost:
+            raise QuotaExceeded(f"daily quota of {self.limit} units used up")
+        self.outbox.add_quota(self.today(), self.cost)
@@ -0,0 +1,109 @@
+import asyncio
+import json
+import random
+
+from src.publish.publisher import UPDATE_PATH
+
+
+class MockVideoApi:
+    """
+    Local stand-in for the YouTube videos.update endpoint, for testing the
+    publisher offline. Responses take `latency` seconds on average
+    (exponentially distributed); a `fail_rate` share answer 503 and a
+    `throttle_rate` share answer 429. Repeated idempotency keys are answered
+    from memory and counted as duplicates.
+    """
+
+    def __init__(self, latency=0.01, fail_rate=0.0, throttle_rate=0.0, seed=None):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.throttle_rate = throttle_rate
+        self.random = random.Random(seed)
+        self.videos = {}
+        self.requests = 0
+        self.duplicates = 0
+        self.connections = 0
+        self._seen = set()
+        self._writers = set()
+
+    def stats(self):
+        return {"videos": len(self.videos), "requests": self.requests,
+                "duplicates": self.duplicates, "connections": self.connections}
+
+    async def handle(self, method, path, headers, body):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.random.expovariate(1 / self.latency))
+        if method == "GET" and path == "/stats":
+            return 200, {}, self.stats()
+        if method != "PUT" or path != UPDATE_PATH:
+            return 404, {}, {"error": {"code": 404, "message": "not found"}}
+        roll = self.random.random()
+        if roll < self.throttle_rate:
+            return 429, {"Retry-After": "0"}, {"error": {"code": 429, "message": "rateLimitExceeded"}}
+        if roll < self.throttle_rate + self.fail_rate:
+            return 503, {}, {"error": {"code": 503, "message": "backendError"}}
+        try:
+            video = json.loads(body)
+            video_id, snippet = video["id"], video["snippet"]
+        except (ValueError, KeyError, TypeError):
+            return 400, {}, {"error": {"code": 400, "message": "invalid video resource"}}
+        key = headers.get("idempotency-key")
+        if key in self._seen:
+            self.duplicates += 1
+        elif key:
+            self._seen.add(key)
+        self.videos[video_id] = snippet
+        return 200, {}, {"kind": "youtube#video", "id": video_id, "snippet": snippet}
+
+    async def _serve_connection(self, reader, writer):
+        self.connections += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, extra_headers, response = await self.handle(method, target, headers, body)
+                payload = json.dumps(response).encode("utf-8")
+                lines = [f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}",
+                         "Content-Type: application/json", f"Content-Length: {len(payload)}"]
+                lines += [f"{name}: {value}" for name, value in extra_headers.items()]
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + payload)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Starts listening and returns the asyncio server; port 0 picks a free port.
+        """
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+    async def stop(self, server):
+        """
+        Stops listening and closes the connections still open.
+        """
+        server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await server.wait_closed()
+        await asyncio.sleep(0)
+
+
+def server_url(server):
+    host, port = server.sockets[0].getsockname()[:2]
+    return f"http://{host}:{port}"
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from src.data.storage import resolve_data_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    video_id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    sent_digest TEXT,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_state ON outbox (state);
+CREATE TABLE IF NOT EXISTS quota (
+    day TEXT PRIMARY KEY,
+    used INTEGER NOT NULL
+);
+"""
+
+PENDING, SENT, FAILED = "pending", "sent", "failed"
+
+
+def outbox_path(data_path=None):
+    """
+    Returns the outbox database kept next to the data file, e.g. data.outbox.db.
+    """
+    base = os.path.splitext(resolve_data_path(data_path))[0]
+    return f"{base}.outbox.db"
+
+
+def video_payload(record):
+    """
+    Turns a generated metadata record into the body of a videos.update call.
+    """
+    tags = record.get("tags") or ""
+    return {
+        "id": record["video_id"],
+        "snippet": {
+            "title": record["title"],
+            "description": record.get("description", ""),
+            "tags": [t for t in tags.split(",") if t] if isinstance(tags, str) else list(tags),
+            "categoryId": "20",  # Gaming
+        },
+    }
+
+
+class Outbox:
+    """
+    Durable queue of video updates, one row per video.
+    A video is only sent again when its payload changes: enqueueing the
+    payload that was last acknowledged is a no-op. Every state change is
+    committed before the next request starts, so after a crash at most the
+    requests that were in flight are repeated (and those carry an
+    idempotency key).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, record):
+        """
+        Queues one metadata record (it needs a "video_id"). Returns True if it
+        will be sent, False if exactly this payload was already sent.
+        """
+        payload = json.dumps(video_payload(record), sort_keys=True, ensure_ascii=False)
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        row = self.conn.execute(
+            "SELECT sent_digest FROM outbox WHERE video_id = ?", (record["video_id"],)
+        ).fetchone()
+        if row is not None and row[0] == digest:
+            return False
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO outbox (video_id, payload, digest) VALUES (?, ?, ?) "
+                "ON CONFLICT (video_id) DO UPDATE SET payload = excluded.payload, digest = excluded.digest, "
+                "state = 'pending', attempts = 0, last_error = NULL",
+                (record["video_id"], payload, digest),
+            )
+        return True
+
+    def pending(self, include_failed=False):
+        """
+        Returns [(video_id, payload_dict, digest)] still to be sent.
+        """
+        states = (PENDING, FAILED) if include_failed else (PENDING,)
+        rows = self.conn.execute(
+            f"SELECT video_id, payload, digest FROM outbox WHERE state IN ({','.join('?' * len(states))}) "
+            "ORDER BY rowid", states,
+        )
+        return [(video_id, json.loads(payload), digest) for video_id, payload, digest in rows]
+
+    def mark_sent(self, video_id, digest):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET state = 'sent', sent_digest = ?, sent_at = ?, attempts = attempts + 1, "
+                "last_error = NULL WHERE video_id = ? AND digest = ?",
+                (digest, time.time(), video_id, digest),
+            )
+
+    def mark_attempt(self, video_id, error, failed=False):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ?, state = ? WHERE video_id = ?",
+                (error, FAILED if failed else PENDING, video_id),
+            )
+
+    def counts(self):
+        return dict(self.conn.execute("SELECT state, COUNT(*) FROM outbox GROUP BY state"))
+
+    def failures(self, limit=20):
+        return self.conn.execute(
+            "SELECT video_id, attempts, last_error FROM outbox WHERE state = 'failed' ORDER BY rowid LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    # Quota units used per (UTC) day, so restarts do not reset the budget.
+
+    def quota_used(self, day):
+        row = self.conn.execute("SELECT used FROM quota WHERE day = ?", (day,)).fetchone()
+        return row[0] if row else 0
+
+    def add_quota(self, day, units):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO quota (day, used) VALUES (?, ?) "
+                "ON CONFLICT (day) DO UPDATE SET used = used + excluded.used",
+                (day, units),
+            )
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from src.publish.http_client import HttpClient, HttpError
+from src.publish.limits import DailyQuota, QuotaExceeded, TokenBucket
+
+UPDATE_PATH = "/youtube/v3/videos?part=snippet"
+
+# Statuses worth retrying; anything else (400, 403, 404, ...) fails the video.
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class PublishReport:
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.skipped_quota = 0
+        # Seconds per request sent, and spent waiting for a connection slot and
+        # the rate limit before each one; retry backoff counts as neither.
+        self.latencies = []
+        self.waits = []
+        self.elapsed = 0.0
+        self.connections = 0
+
+    def summary(self):
+        lines = [f"{self.sent} sent, {self.failed} failed, {self.retries} retries"
+                 f"{f', {self.skipped_quota} left for tomorrow (quota)' if self.skipped_quota else ''}"
+                 f" in {self.elapsed:.2f}s over {self.connections} connections"]
+        if self.sent and self.elapsed:
+            lines.append(f"throughput {self.sent / self.elapsed:.1f} videos/s")
+        for label, values in (("latency", self.latencies), ("queue wait", self.waits)):
+            if len(values) >= 2:
+                lines.append(f"{label} ms: {_percentiles(values)}")
+        return "\n".join(lines)
+
+
+def _percentiles(values):
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return ", ".join(
+        f"{name} {value * 1000:.1f}" for name, value in
+        (("p50", cuts[49]), ("p95", cuts[94]), ("p99", cuts[98]), ("max", max(values)))
+    )
+
+
+class Publisher:
+    """
+    Sends the outbox's pending video updates to a videos.update-shaped
+    endpoint: at most `concurrency` requests in flight, at most `rate`
+    requests per second, within the daily quota. Failed requests are retried
+    with full-jitter exponential backoff (or the server's Retry-After).
+    """
+
+    def __init__(self, outbox, endpoint, concurrency=8, rate=10.0, daily_quota=None,
+                 max_attempts=5, backoff_base=0.5, backoff_cap=30.0, token=None):
+        self.outbox = outbox
+        self.endpoint = endpoint
+        self.concurrency = concurrency
+        self.rate = rate
+        self.quota = DailyQuota(outbox, daily_quota) if daily_quota else DailyQuota(outbox)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.token = token if token is not None else os.environ.get("SMASHVOD_PUBLISH_TOKEN", "")
+
+    async def run(self, include_failed=False):
+        report = PublishReport()
+        items = self.outbox.pending(include_failed)
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        client = HttpClient(self.endpoint, pool_size=self.concurrency, headers=headers)
+        bucket = TokenBucket(self.rate, burst=self.concurrency)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        quota_left = True
+
+        async def publish(video_id, payload, digest):
+            nonlocal quota_left
+            ready = time.perf_counter()
+            async with semaphore:
+                for attempt in range(1, self.max_attempts + 1):
+                    if not quota_left:
+                        report.skipped_quota += 1
+                        return
+                    await bucket.acquire()
+                    try:
+                        self.quota.reserve()
+                    except QuotaExceeded:
+                        quota_left = False
+                        report.skipped_quota += 1
+                        return
+                    retry_after = None
+                    sent = time.perf_counter()
+                    report.waits.append(sent - ready)
+                    try:
+                        status, response_headers, _ = await client.request(
+                            "PUT", UPDATE_PATH, payload, {"Idempotency-Key": f"{video_id}:{digest}"}
+                        )
+                    except HttpError as e:
+                        report.latencies.append(time.perf_counter() - sent)
+                        error = str(e)
+                    else:
+                        report.latencies.append(time.perf_counter() - sent)
+                        if 200 <= status < 300:
+                            self.outbox.mark_sent(video_id, digest)
+                            report.sent += 1
+                            return
+                        error = f"HTTP {status}"
+                        if status not in RETRY_STATUSES:
+                            break
+                        retry_after = _retry_after(response_headers)
+                    if attempt == self.max_attempts:
+                        break
+                    report.retries += 1
+                    self.outbox.mark_attempt(video_id, error)
+                    if retry_after is None:
+                        retry_after = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+                    await asyncio.sleep(retry_after)
+                    ready = time.perf_counter()
+                self.outbox.mark_attempt(video_id, error, failed=True)
+                report.failed += 1
+
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(publish(*item) for item in items))
+        finally:
+            await client.close()
+        report.elapsed = time.perf_counter() - started
+        report.connections = client.connections_opened
+        return report
+
+
+def _retry_after(headers):
+    try:
+        return max(0.0, float(headers.get("retry-after", "")))
+    except ValueError:
+        return None
@@ -0,0 +1,24 @@
+import argparse
+import sys
+
+from src.session.recorder import DEFAULT_SESSION_LOG
+from src.session.replay import replay
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.session",
+        description="Replay sessions recorded with `python main.py --record-session` and check their outputs."
+    )
+    parser.add_argument("log", nargs="?", default=DEFAULT_SESSION_LOG, help=f"session log (default: {DEFAULT_SESSION_LOG})")
+    parser.add_argument("--verify-state", action="store_true",
+                        help="also check that every session starts from the data it was recorded with")
+    args = parser.parse_args()
+
+    report = replay(args.log, args.verify_state)
+    print(report.summary())
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == "__main__":
+    main()
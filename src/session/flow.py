@@ -0,0 +1,151 @@
+from src.players.autocomplete import input_with_autocomplete
+from src.players.completion import player_index
+from src.players.characters import get_characters
+from src.players.character_registry import get_registry
+from src.players.roster import top_characters
+from src.events.event_store import get_event_store
+from src.events.event_utils import (
+    prompt_event_details, get_event_by_name_and_number, get_latest_event_number_for, record_event_if_new
+)
+from src.events.links import prompt_for_event_links
+from src.core.set_context import build_context
+from src.core.speculative import likely_rounds, speculator
+from src.templates.engine import check_templates, get_templates
+from src.profiling.spans import INPUT, span
+from src.session.quick import prompt_quick_entry
+
+# ANSI bold
+BOLD = "\033[1m"
+RESET = "\033[0m"
+
+def print_bold(text):
+    print(f"{BOLD}{text}{RESET}")
+
+def likely_characters(data, player_input):
+    """
+    The display name and characters get_characters() settles on when every
+    prompt is left blank: the player's most played character.
+    """
+    key = player_input.lower()
+    if key not in data["players"]:
+        return player_input, ["Unknown"]
+    display_name, char_dict = data["players"][key]
+    return display_name, top_characters(char_dict, 1) or ["Unknown"]
+
+def speculate(data, p1, p2, chars1, chars2, event_name=None, event_number=None,
+              round_type=None, round_detail=None):
+    """
+    Starts generating the set as far as it is known (see
+    src/core/speculative.py) while the operator answers the next prompts.
+    Without an event, the default one prompt_event_details() offers is assumed.
+    The title and description are guessed once the round type is known; until
+    the round detail is, for each detail usually typed for that type.
+    """
+    if not speculator.enabled:
+        return
+    if event_name is None:
+        event_name = get_event_store(data).default_series()
+        event_number = get_latest_event_number_for(event_name, data) if event_name else 1
+    rounds = likely_rounds(round_type, round_detail) if round_type else ()
+    templates = get_templates(data, event_name or "") if rounds else None
+    speculator.guess(
+        get_registry(data), p1, p2, chars1, chars2, event_name, event_number, rounds, templates,
+        get_event_by_name_and_number(data, event_name, event_number)
+    )
+
+def prompt_set(data, player_keys):
+    """
+    Asks for the players, their characters, the event and the round one
+    prompt at a time. Returns (p1_display, p1_chars, p2_display, p2_chars,
+    event_name, event_number, round_type, round_detail).
+    After each step the set is guessed ahead with speculate().
+    """
+    with span("prompt players", INPUT):
+        while True:
+            p1_input = input_with_autocomplete("Enter player 1 name: ", player_keys, required=True)
+            if p1_input:
+                break
+            print("\033[91mPlayer 1 name is required. Please try again.\033[0m")
+
+        while True:
+            p2_input = input_with_autocomplete("Enter player 2 name: ", player_keys, required=True)
+            if p2_input:
+                break
+            print("\033[91mPlayer 2 name is required. Please try again.\033[0m")
+
+    with span("speculate"):
+        p1_guess, p1_chars_guess = likely_characters(data, p1_input)
+        p2_guess, p2_chars_guess = likely_characters(data, p2_input)
+        speculate(data, p1_guess, p2_guess, p1_chars_guess, p2_chars_guess)
+
+    with span("prompt characters", INPUT):
+        p1_display, p1_chars = get_characters(p1_input, data)
+        p2_display, p2_chars = get_characters(p2_input, data)
+
+    with span("speculate"):
+        speculate(data, p1_display, p2_display, p1_chars, p2_chars)
+
+    def on_event(evt_name, evt_num, round_type=None, round_detail=None):
+        with span("speculate"):
+            speculate(data, p1_display, p2_display, p1_chars, p2_chars, evt_name, evt_num,
+                      round_type, round_detail)
+
+    with span("prompt event", INPUT):
+        evt_name, evt_num, round_type, round_detail = prompt_event_details(data, on_event)
+    return p1_display, p1_chars, p2_display, p2_chars, evt_name, evt_num, round_type, round_detail
+
+def run_session(data, quick=False):
+    """
+    The interactive flow for one set: prompts for players, characters, event
+    and round, prints the title, tags and description and updates data in
+    memory (usage counts, event editions and links). Loading and saving are
+    left to the caller. quick asks for the whole set on one line instead
+    (see src/session/quick.py) and only prompts for what it leaves open.
+    Returns (ctx, {"title": ..., "tags": ..., "description": ...}).
+    Invalid templates in data raise TemplateError before anything is asked.
+    """
+    check_templates(data)
+    # Built once for both player prompts; most active players are suggested first
+    player_keys = player_index(data["players"])
+    if quick:
+        with span("quick entry", INPUT):
+            (p1_display, p1_chars, p2_display, p2_chars,
+             evt_name, evt_num, round_type, round_detail) = prompt_quick_entry(data, player_keys)
+    else:
+        (p1_display, p1_chars, p2_display, p2_chars,
+         evt_name, evt_num, round_type, round_detail) = prompt_set(data, player_keys)
+    if evt_name:
+        record_event_if_new(data, evt_name, evt_num)
+
+    with span("build_context"):
+        registry = get_registry(data)
+        ctx = build_context(
+            p1_display, p2_display, p1_chars, p2_chars,
+            evt_name, evt_num, round_type, round_detail, registry
+        )
+
+    with span("generate_title"):
+        templates = get_templates(data, evt_name)
+        title = speculator.title(ctx, templates)
+    print_bold("\nGenerated YouTube title:")
+    print(title)
+
+    with span("construct_tags"):
+        tags = speculator.tags(ctx, registry)
+    print_bold("\nGenerated YouTube tags:")
+    print(tags)
+    print(f"\nCharacter count: {len(tags)}")
+
+    event_obj = get_event_by_name_and_number(data, evt_name, evt_num)
+    if event_obj:
+        with span("prompt event links", INPUT):
+            if prompt_for_event_links(event_obj, ctx.event_title):
+                print("Event links updated.")
+
+    with span("generate_description"):
+        description = speculator.description(ctx, event_obj, templates)
+    speculator.finish()
+    print_bold("\nGenerated YouTube description:\n")
+    print(description)
+
+    return ctx, {"title": title, "tags": tags, "description": description}
@@ -0,0 +1,329 @@
+import re
+
+from src.events.event_store import get_event_store
+from src.events.event_utils import get_latest_event_number_for, prompt_round_detail, prompt_round_type
+from src.events.rounds import quick_round
+from src.players.autocomplete import input_with_autocomplete
+from src.players.character_registry import fold_name, get_registry
+from src.players.characters import did_you_mean
+from src.players.completion import CompletionIndex, player_index as build_player_index
+from src.players.roster import top_characters
+
+QUICK_SYNTAX = "p1 [characters] vs p2 [characters] [@event [number]] [round]"
+QUICK_EXAMPLE = "hertsu sheik vs dasuki plant @pvl 18 L sf"
+
+_VERSUS = re.compile(r"\s+vs\.?\s+", re.IGNORECASE)
+_CHARACTER_SEPARATORS = re.compile(r"[,/+]+")
+_NUMBER = re.compile(r"#?(\d+)")
+
+# Longest round phrase tried at the end of a line ("winners round 2")
+_MAX_ROUND_WORDS = 3
+# How many candidates an ambiguous field lists
+_MAX_CHOICES = 10
+
+
+class QuickEntryError(ValueError):
+    """
+    The line does not follow the quick-entry syntax or names an unknown character.
+    """
+
+
+class Ambiguous:
+    """
+    A field whose text matched several candidates; the operator picks one.
+    """
+    __slots__ = ("text", "options")
+
+    def __init__(self, text, options):
+        self.text = text
+        self.options = options
+
+    def __repr__(self):
+        return f"Ambiguous({self.text!r}, {self.options!r})"
+
+
+class QuickSet:
+    """
+    One parsed quick-entry line. Players are player keys (None for a name
+    that is not known yet, kept in p1_text/p2_text), characters canonical
+    names, and any field may be Ambiguous. round_type is None when the line
+    gave no side, round_detail None when it gave no round at all.
+    """
+    __slots__ = ("p1_text", "p1", "p1_chars", "p2_text", "p2", "p2_chars",
+                 "event", "number", "round_type", "round_detail")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+
+class CharacterWords:
+    """
+    Every spelling of every character (names and aliases, folded), indexed
+    from each word on, so a prefix of any word finds the character:
+    "plant" and "pir" both find Piranha Plant.
+    """
+
+    def __init__(self, registry):
+        owners = {}
+        max_words = 1
+        for main in registry.names():
+            for spelling in registry.aliases(main):
+                words = fold_name(spelling).split()
+                max_words = max(max_words, len(words))
+                for i in range(len(words)):
+                    owners.setdefault(" ".join(words[i:]), set()).add(main)
+        self.version = registry.version
+        self.max_words = max_words
+        self._owners = owners
+        self._index = CompletionIndex(owners)
+
+    def candidates(self, text):
+        """
+        Returns the sorted canonical names with a spelling (or a word of one)
+        starting with text.
+        """
+        found = set()
+        for spelling in self._index.matches(fold_name(text)):
+            found |= self._owners[spelling]
+        return sorted(found)
+
+
+_words = None
+
+
+def get_character_words(registry):
+    global _words
+    if _words is None or _words.version != registry.version:
+        _words = CharacterWords(registry)
+    return _words
+
+
+class QuickGrammar:
+    """
+    Parses quick-entry lines against one data set:
+
+        hertsu sheik vs dasuki plant @pvl 18 L sf
+
+    Players and events match exactly or by unique prefix, characters by any
+    name, alias or word prefix, rounds take the parse_round_input()
+    shorthands with an optional side (L sf, lsf, W r2, gf, pools).
+    Characters may be separated by spaces, commas, "/" or "+". Parsing has
+    no side effects; resolve() applies defaults, asks about ambiguous fields
+    and records character usage.
+    """
+
+    def __init__(self, data, player_index=None):
+        self.data = data
+        self.players = data["players"]
+        self.registry = get_registry(data)
+        self.characters = get_character_words(self.registry)
+        self.store = get_event_store(data)
+        self.player_index = player_index or build_player_index(self.players)
+        self.event_index = CompletionIndex(self.store.series_names(), self.store.edition_counts())
+
+    def parse(self, line):
+        sides = _VERSUS.split(line.strip())
+        if len(sides) != 2 or not sides[0] or not sides[1]:
+            raise QuickEntryError(f"expected one 'vs' between the players: {QUICK_SYNTAX}")
+        p2_part, has_event, event_part = sides[1].partition("@")
+        if "@" in event_part:
+            raise QuickEntryError("only one '@event' is allowed")
+
+        # The round comes last, after the event if there is one
+        tail = (event_part if has_event else p2_part).split()
+        round_type, round_detail, tail = _split_round(tail)
+        entry = QuickSet(round_type=round_type, round_detail=round_detail)
+        if has_event:
+            self._parse_event(entry, tail)
+            p2_tokens = p2_part.split()
+        else:
+            self._parse_event(entry, None)
+            p2_tokens = tail
+
+        entry.p1_text, entry.p1, entry.p1_chars = self._parse_side(sides[0].split(), "player 1")
+        entry.p2_text, entry.p2, entry.p2_chars = self._parse_side(p2_tokens, "player 2")
+        return entry
+
+    def _parse_side(self, tokens, label):
+        if not tokens:
+            raise QuickEntryError(f"{label} is missing")
+        # The player is the shortest leading run of words after which the
+        # rest reads as characters, preferring a known player's name.
+        fallback = None
+        bad_character = None
+        for i in range(1, len(tokens) + 1):
+            name = " ".join(tokens[:i])
+            chars, bad = self._parse_characters(tokens[i:])
+            if name.lower() in self.players:
+                if chars is not None:
+                    return name, name.lower(), chars
+                bad_character = bad_character or bad
+            elif chars is not None and fallback is None:
+                fallback = name, chars
+        if bad_character:
+            raise QuickEntryError(f"'{bad_character}' is not a known character or alias")
+        name, chars = fallback
+        return name, self._match_player(name), chars
+
+    def _parse_characters(self, tokens):
+        """
+        Returns ([canonical or Ambiguous, ...], None), or (None, bad_word).
+        """
+        words = [w for token in tokens for w in _CHARACTER_SEPARATORS.split(token) if w]
+        chars = []
+        i = 0
+        while i < len(words):
+            longest = min(self.characters.max_words, len(words) - i)
+            for n in range(longest, 0, -1):
+                main = self.registry.canonical(" ".join(words[i:i + n]))
+                if main:
+                    chars.append(main)
+                    break
+            else:
+                for n in range(longest, 0, -1):
+                    text = " ".join(words[i:i + n])
+                    options = self.characters.candidates(text)
+                    if options:
+                        chars.append(options[0] if len(options) == 1 else Ambiguous(text, options))
+                        break
+                else:
+                    return None, words[i]
+            i += n
+        return chars, None
+
+    def _match_player(self, name):
+        """
+        A player key for a unique prefix, Ambiguous for several, None for none.
+        """
+        count = self.player_index.count(name)
+        if count == 0:
+            return None
+        keys = [display.lower() for display in self.player_index.top(name, _MAX_CHOICES)]
+        keys = [key for key in keys if key in self.players]
+        if not keys:
+            return None
+        if count == 1:
+            return keys[0]
+        return Ambiguous(name, keys)
+
+    def _parse_event(self, entry, tokens):
+        if tokens is None:
+            entry.event = self.store.default_series()
+            entry.number = get_latest_event_number_for(entry.event, self.data) if entry.event else 1
+            return
+        number = None
+        if tokens:
+            match = _NUMBER.fullmatch(tokens[-1])
+            if match:
+                number = int(match.group(1))
+                tokens = tokens[:-1]
+        if not tokens:
+            raise QuickEntryError("'@' needs an event name")
+        name = " ".join(tokens)
+        series = self.store.series(name)
+        if series is not None:
+            entry.event = series.name
+        else:
+            count = self.event_index.count(name)
+            if count == 1:
+                entry.event = self.event_index.matches(name)[0]
+            elif count > 1:
+                entry.event = Ambiguous(name, self.event_index.top(name, _MAX_CHOICES))
+            else:
+                entry.event = name
+        entry.number = number
+
+    def resolve(self, entry):
+        """
+        Settles a parsed line: asks about ambiguous fields and whatever the
+        line left out that has no default (the round), creates new players,
+        fills in top characters and the latest event number, and counts the
+        characters as played.
+        Returns (p1_display, p1_chars, p2_display, p2_chars,
+        event_name, event_number, round_type, round_detail).
+        """
+        p1_display, p1_chars = self._resolve_side(entry.p1_text, entry.p1, entry.p1_chars)
+        p2_display, p2_chars = self._resolve_side(entry.p2_text, entry.p2, entry.p2_chars)
+
+        event = entry.event
+        if isinstance(event, Ambiguous):
+            event = _choose("events", event)
+        number = entry.number
+        if number is None:
+            number = get_latest_event_number_for(event, self.data) if event else 1
+
+        round_type, detail = entry.round_type, entry.round_detail
+        if round_type is None:
+            round_type = prompt_round_type()
+        if round_type == "Pools":
+            detail = ""
+        elif detail is None:
+            detail = prompt_round_detail()
+        return p1_display, p1_chars, p2_display, p2_chars, event, number, round_type, detail
+
+    def _resolve_side(self, text, key, chars):
+        if isinstance(key, Ambiguous):
+            key = _choose("players", key, [self.players[k][0] for k in key.options])
+        elif key is None:
+            key = did_you_mean(text, self.data) or text.lower()
+        if key not in self.players:
+            self.players[key] = [text, {}]
+        display_name, char_dict = self.players[key]
+
+        chosen = []
+        for char in chars:
+            if isinstance(char, Ambiguous):
+                # A player's own character settles it ("sh" for a Sheik player)
+                played = [c for c in char.options if c in char_dict]
+                char = played[0] if len(played) == 1 else _choose(f"characters for {display_name}", char)
+            chosen.append(char)
+        if not chosen:
+            chosen = top_characters(char_dict, 1) or ["Unknown"]
+        for char in chosen:
+            if char != "Unknown":
+                char_dict[char] = char_dict.get(char, 0) + 1
+        return display_name, chosen
+
+
+def _split_round(tokens):
+    """
+    Takes a round off the end of tokens. Returns (round_type, round_detail, rest);
+    the round is (None, None) if the tokens do not end in one.
+    """
+    for n in range(min(_MAX_ROUND_WORDS, len(tokens) - 1), 0, -1):
+        parsed = quick_round(" ".join(tokens[-n:]))
+        if parsed:
+            return parsed[0], parsed[1], tokens[:-n]
+    return None, None, tokens
+
+
+def _choose(what, ambiguous, labels=None):
+    print(f"\n'{ambiguous.text}' matches several {what}:")
+    for i, label in enumerate(labels or ambiguous.options, 1):
+        print(f"  {i}. {label}")
+    while True:
+        choice = input("\033[91mEnter a number [1]: \033[0m").strip()
+        if not choice:
+            return ambiguous.options[0]
+        if choice.isdigit() and 1 <= int(choice) <= len(ambiguous.options):
+            return ambiguous.options[int(choice) - 1]
+        print("Invalid choice, try again.")
+
+
+def prompt_quick_entry(data, player_index=None):
+    """
+    Asks for a whole set on one line and re-asks until it parses.
+    Returns what QuickGrammar.resolve() returns.
+    """
+    grammar = QuickGrammar(data, player_index)
+    print(f"\nQuick entry: {QUICK_SYNTAX}")
+    print(f"  e.g. {QUICK_EXAMPLE}")
+    while True:
+        line = input_with_autocomplete("Set: ", grammar.player_index, required=True)
+        try:
+            entry = grammar.parse(line)
+            break
+        except QuickEntryError as e:
+            print(f"\033[91m{e}\033[0m")
+    return grammar.resolve(entry)
@@ -0,0 +1,109 @@
+import builtins
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+
+from src.data.tracked import as_stored
+from src.session.flow import run_session
+
+# A session log is JSON lines:
+#   {"kind": "snapshot", "data": {...}}    data as it was before the next session
+#   {"kind": "session", "answers": [[prompt, answer], ...], "outputs": {...}, ...}
+# A snapshot is written whenever the data no longer matches what the last
+# recorded session left behind (first recording, edits made by other tools).
+SESSION_FORMAT = 1
+DEFAULT_SESSION_LOG = "sessions.jsonl"
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def plain_prompt(prompt):
+    """
+    The prompt text without colours, as stored in the log.
+    """
+    return _ANSI.sub("", str(prompt))
+
+
+def data_digest(data):
+    text = json.dumps(as_stored(data), sort_keys=True, ensure_ascii=False, default=lambda value: value.to_json())
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def patched_input(replacement):
+    """
+    Routes every input() call (all prompts use it) through replacement.
+    """
+    original = builtins.input
+    builtins.input = replacement
+    try:
+        yield
+    finally:
+        builtins.input = original
+
+
+class PromptRecorder:
+    """
+    Stand-in for input() that asks the real input() and remembers each
+    prompt with its answer.
+    """
+
+    def __init__(self, ask):
+        self.ask = ask
+        self.answers = []
+
+    def __call__(self, prompt=""):
+        answer = self.ask(prompt)
+        self.answers.append([plain_prompt(prompt), answer])
+        return answer
+
+
+def _last_entry(path):
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                last = line
+    return json.loads(last) if last else None
+
+
+def record_session(path, data, quick=False):
+    """
+    Runs the interactive flow (run_session) while recording every prompt and
+    answer, then appends the session to the log at path. Returns what
+    run_session returned.
+    """
+    last = _last_entry(path)
+    before = data_digest(data)
+    snapshot = None
+    if last is None or last.get("data_after") != before:
+        snapshot = json.loads(json.dumps(as_stored(data), default=lambda value: value.to_json()))
+
+    recorder = PromptRecorder(builtins.input)
+    started = time.perf_counter()
+    with patched_input(recorder):
+        result = run_session(data, quick)
+    elapsed = time.perf_counter() - started
+    _, outputs = result
+
+    with open(path, "a", encoding="utf-8") as f:
+        if snapshot is not None:
+            f.write(json.dumps({"kind": "snapshot", "format": SESSION_FORMAT, "data": snapshot},
+                               ensure_ascii=False) + "\n")
+        f.write(json.dumps({
+            "kind": "session",
+            "format": SESSION_FORMAT,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seconds": round(elapsed, 3),
+            "quick": quick,
+            "data_before": before,
+            "data_after": data_digest(data),
+            "answers": recorder.answers,
+            "outputs": outputs,
+        }, ensure_ascii=False) + "\n")
+    return result
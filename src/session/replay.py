@@ -0,0 +1,120 @@
+import io
+import json
+import statistics
+import time
+from contextlib import redirect_stdout
+
+from src.core.speculative import speculator
+from src.profiling import spans
+from src.session.flow import run_session
+from src.session.recorder import data_digest, patched_input, plain_prompt
+
+
+class SessionDiverged(Exception):
+    """
+    The flow asked something other than what was recorded.
+    """
+
+
+class ScriptedInput:
+    """
+    Stand-in for input() that answers from a recorded session, checking that
+    the prompts come in the recorded order.
+    """
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.position = 0
+
+    def __call__(self, prompt=""):
+        if self.position >= len(self.answers):
+            raise SessionDiverged(f"unexpected extra prompt {plain_prompt(prompt)!r}")
+        expected, answer = self.answers[self.position]
+        if plain_prompt(prompt) != expected:
+            raise SessionDiverged(f"prompt {self.position + 1} was {plain_prompt(prompt)!r}, recorded {expected!r}")
+        self.position += 1
+        return answer
+
+    def check_done(self):
+        if self.position != len(self.answers):
+            raise SessionDiverged(f"{len(self.answers) - self.position} recorded answers were not asked for")
+
+
+class ReplayReport:
+    def __init__(self):
+        self.sessions = 0
+        self.failures = []    # (session number, reason)
+        self.durations = []
+        self.profiler = None
+        self.speculation = None
+
+    @property
+    def passed(self):
+        return not self.failures
+
+    def summary(self):
+        lines = [f"{self.sessions} sessions replayed, {self.sessions - len(self.failures)} matched, "
+                 f"{len(self.failures)} failed"]
+        for number, reason in self.failures[:20]:
+            lines.append(f"  session {number}: {reason}")
+        if self.durations:
+            total = sum(self.durations)
+            cuts = statistics.quantiles(self.durations, n=20, method="inclusive") if len(self.durations) > 1 else [total] * 19
+            lines.append(f"total {total * 1000:.0f} ms; per session mean {statistics.mean(self.durations) * 1000:.2f} ms, "
+                         f"p95 {cuts[18] * 1000:.2f} ms, max {max(self.durations) * 1000:.2f} ms")
+        if self.profiler is not None:
+            lines.append(self.profiler.summary(input_label="prompt handling"))
+        if self.speculation is not None:
+            lines.append(self.speculation)
+        return "\n".join(lines)
+
+
+def read_log(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def replay(path, verify_state=False):
+    """
+    Feeds every recorded session back through the real interactive flow,
+    headless and without saving anything, and compares the outputs.
+    Sessions run in order on an in-memory copy of the data, reset at every
+    snapshot in the log. verify_state also checks that each session starts
+    from the recorded data (slower on large data).
+    """
+    report = ReplayReport()
+    profiler = spans.enable(memory=False)
+    data = None
+    try:
+        for entry in read_log(path):
+            if entry["kind"] == "snapshot":
+                data = entry["data"]
+                continue
+            report.sessions += 1
+            if data is None:
+                report.failures.append((report.sessions, "no data snapshot before this session"))
+                continue
+            if verify_state and data_digest(data) != entry["data_before"]:
+                report.failures.append((report.sessions, "data differs from when the session was recorded"))
+
+            scripted = ScriptedInput(entry["answers"])
+            started = time.perf_counter()
+            try:
+                with patched_input(scripted), redirect_stdout(io.StringIO()):
+                    _, outputs = run_session(data, entry.get("quick", False))
+                scripted.check_done()
+            except (SessionDiverged, EOFError) as e:
+                report.failures.append((report.sessions, str(e)))
+                continue
+            finally:
+                report.durations.append(time.perf_counter() - started)
+
+            different = [k for k, v in entry["outputs"].items() if outputs.get(k) != v]
+            if different:
+                report.failures.append((report.sessions, f"{', '.join(different)} changed"))
+    finally:
+        report.profiler = spans.stop()
+        report.speculation = speculator.summary()
+    return report
@@ -0,0 +1,4 @@
+# YouTube tag budget used by default: each tag costs its length plus a comma.
+# Kept apart from tag_generator so the commands that only pass it along (a
+# title, a batch run's defaults) do not import the generator to learn it.
+TAG_CHAR_LIMIT = 400
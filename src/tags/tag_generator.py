@@ -1,75 +1,158 @@
-def get_all_aliases(char, character_aliases):
+from itertools import chain, islice, product
+
+from src.core.fragments import fragment_cache
+from src.tags.limits import TAG_CHAR_LIMIT
+
+GENERIC_TAGS = [
+    "ssbu", "Super Smash Bros. Ultimate", "tournament", "ssbu gameplay",
+    "competitive smash", "smash ultimate 2025",
+]
+
+# Candidates are generated in this priority order; the weight is what a tag
+# is worth when choosing which tags fit the budget.
+EVENT_WEIGHT = 100
+PLAYER_WEIGHT = 90
+MATCHUP_WEIGHT = 80
+PLAYER_CHARACTER_WEIGHT = 70
+HEAD_TO_HEAD_WEIGHT = 60
+GENERIC_WEIGHT = 50
+ALIAS_WEIGHT = 20
+
+# Stop generating once the candidates would fill the budget this many times over:
+# enough slack to swap long tags for shorter ones, bounded however many aliases exist.
+CANDIDATE_OVERFILL = 1.5
+
+# Most alias spellings of one matchup ever offered as candidates.
+MAX_MATCHUP_VARIANTS = 64
+
+
+def player_character_tags(player, char, registry, version=None):
     """
-    Returns a list of all aliases for a character, including the main name.
+    Returns ("<player> <character>", "<player> <alias>", ...), cached per pairing.
+    version is registry.version, if the caller already has it.
     """
-    aliases = [char]
-    for main, alias_list in character_aliases.items():
-        if char == main or char in alias_list:
-            aliases = [main] + alias_list
-            break
-    return aliases
+    return fragment_cache.get(
+        ("player", player, char),
+        lambda: tuple(f"{player} {alias}" for alias in registry.aliases(char)),
+        version or registry.version
+    )
+
+
+def matchup_tags(c1, c2, registry, version=None):
+    """
+    Returns ("<c1> vs <c2>", then alias spellings of the matchup), cached per
+    character pair. At most MAX_MATCHUP_VARIANTS are expanded.
+    """
+    return fragment_cache.get(
+        ("matchup", c1, c2),
+        lambda: tuple(islice(
+            (f"{a1} vs {a2}" for a1, a2 in product(registry.aliases(c1), registry.aliases(c2))),
+            MAX_MATCHUP_VARIANTS
+        )),
+        version or registry.version
+    )
+
 
-def construct_tags(p1, p2, chars1, chars2, event_name, event_number, data):
+def tag_candidates(ctx, registry):
     """
-    Builds a comma-separated tag string:
-    - Base tags: ssbu, Super Smash Bros. Ultimate, tournament, ssbu gameplay, etc.
-    - Inserts one tag: "{event_name} {event_number}"
-    - For each c1 in chars1 and c2 in chars2:
-        • "c1 vs c2"
-        • "p1 c1"
-        • "p2 c2"
-      For each alias of c1/c2, also include those tags.
-    - Also: "p1 vs p2" and "p2 vs p1".
-    - Removes duplicates (case-insensitive), then keeps adding
-      until reaching 400 characters total.
+    Lazily yields (tag, weight) in priority order:
+    event, players, canonical matchups, player + canonical character,
+    "p1 vs p2", generic tags, then alias variants of matchups and player tags.
+    Fragments come from the shared fragment cache (each holds a bounded
+    number of alias spellings), and candidates are only yielded as far as
+    they are consumed.
     """
-    base = [
-        "ssbu", "Super Smash Bros. Ultimate", "tournament", "ssbu gameplay",
-        "competitive smash", "smash ultimate 2025",
-        f"{event_name} {event_number}",
-        p1, p2
-    ]
-
-    matchups = []
-    character_aliases = data.get("character_aliases", {})
-    # For each character, get all aliases (including main name)
-    chars1_aliases = [get_all_aliases(c1, character_aliases) for c1 in chars1]
-    chars2_aliases = [get_all_aliases(c2, character_aliases) for c2 in chars2]
-
-    # For each combination of aliases, generate tags
-    for c1_aliases in chars1_aliases:
-        for c2_aliases in chars2_aliases:
-            for c1 in c1_aliases:
-                for c2 in c2_aliases:
-                    matchups.append(f"{c1} vs {c2}")
-            # Also add player-character tags for all aliases
-            for c1 in c1_aliases:
-                matchups.append(f"{p1} {c1}")
-        for c2_aliases in chars2_aliases:
-            for c2 in c2_aliases:
-                matchups.append(f"{p2} {c2}")
-
-    matchups += [
-        f"{p1} vs {p2}",
-        f"{p2} vs {p1}"
-    ]
+    p1, p2 = ctx.p1, ctx.p2
+    chars1, chars2 = ctx.chars1, ctx.chars2
+    version = registry.version
 
+    # Each pass looks its fragments up again as it reaches them (a cache hit
+    # the second time), so nothing past the point of consumption is built.
+    def matchups():
+        for c1, c2 in product(chars1, chars2):
+            yield matchup_tags(c1, c2, registry, version)
+
+    def player_tags():
+        for c1 in chars1:
+            yield player_character_tags(p1, c1, registry, version)
+        for c2 in chars2:
+            yield player_character_tags(p2, c2, registry, version)
+
+    yield f"{ctx.event_name} {ctx.event_number}", EVENT_WEIGHT
+    yield p1, PLAYER_WEIGHT
+    yield p2, PLAYER_WEIGHT
+    for tags in matchups():
+        yield tags[0], MATCHUP_WEIGHT
+    for tags in player_tags():
+        yield tags[0], PLAYER_CHARACTER_WEIGHT
+    yield f"{p1} vs {p2}", HEAD_TO_HEAD_WEIGHT
+    yield f"{p2} vs {p1}", HEAD_TO_HEAD_WEIGHT
+    for tag in GENERIC_TAGS:
+        yield tag, GENERIC_WEIGHT
+
+    for tags in chain(player_tags(), matchups()):
+        for tag in tags[1:]:
+            yield tag, ALIAS_WEIGHT
+
+
+def select_tags(candidates, budget):
+    """
+    Picks the subset of (tag, weight) candidates with the highest total weight
+    whose cost (len + 1 per tag) fits the budget: a 0/1 knapsack, solved as
+    "which tags to drop" over the overflow, which is usually far smaller than
+    the budget itself. Returns the chosen tags in candidate order.
+    """
+    costs = [len(tag) + 1 for tag, _ in candidates]
+    overflow = sum(costs) - budget
+    if overflow <= 0:
+        return [tag for tag, _ in candidates]
+
+    # dropped[e]: least weight dropped so that at least e characters are freed
+    # (e capped at overflow); drop[i][e] marks where dropping item i helped.
+    infinity = float("inf")
+    dropped = [0] + [infinity] * overflow
+    drop = []
+    for (tag, weight), cost in zip(candidates, costs):
+        row = bytearray(overflow + 1)
+        for e in range(overflow, 0, -1):
+            value = dropped[e - cost if e > cost else 0] + weight
+            if value < dropped[e]:
+                dropped[e] = value
+                row[e] = 1
+        drop.append(row)
+
+    skipped = set()
+    e = overflow
+    for i in range(len(candidates) - 1, -1, -1):
+        if e > 0 and drop[i][e]:
+            skipped.add(i)
+            e = e - costs[i] if e > costs[i] else 0
+    return [tag for i, (tag, _) in enumerate(candidates) if i not in skipped]
+
+
+def construct_tags(ctx, registry, budget=TAG_CHAR_LIMIT):
+    """
+    Builds a comma-separated tag string of at most `budget` characters
+    (counting a comma per tag).
+    Candidates come from tag_candidates() with duplicates removed
+    (case-insensitive); generation stops once there is enough to fill the
+    budget CANDIDATE_OVERFILL times, and select_tags() then picks the most
+    valuable combination that fits, so one long alias no longer cuts off
+    every tag after it.
+    registry supplies the aliases of each character.
+    """
     seen = set()
-    unique = []
-    for tag in base + matchups:
+    candidates = []
+    total = 0
+    for tag, weight in tag_candidates(ctx, registry):
         low = tag.lower()
-        if low not in seen:
-            seen.add(low)
-            unique.append(tag)
-
-    final = []
-    length = 0
-    for tag in unique:
-        addition = len(tag) + 1  # +1 for comma
-        if length + addition <= 400:
-            final.append(tag)
-            length += addition
-        else:
+        cost = len(tag) + 1
+        if low in seen or cost > budget:
+            continue
+        seen.add(low)
+        candidates.append((tag, weight))
+        total += cost
+        if total >= budget * CANDIDATE_OVERFILL:
             break
 
-    return ",".join(final)
\ No newline at end of file
+    return ",".join(select_tags(candidates, budget))
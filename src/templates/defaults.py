@@ -0,0 +1,44 @@
+# Built-in house style. Any of these can be overridden per event series (or for
+# every series, under "default") in data["templates"], e.g.
+#   "templates": {"PVL Weekly": {"title": "{event_title} {round} - {p1} vs {p2}"}}
+
+DEFAULT_TITLE = "{event_title} {round} - {p1} ({p1_char}) vs {p2} ({p2_char}) - SSBU"
+
+# One entry per line. A line starting with "?" is left out when any of its
+# placeholders is empty.
+DEFAULT_DESCRIPTION = [
+    "{event_title} – {p1} vs {p2} – {game}",
+    "",
+    "This is a recorded match from {event_title}, part of our ongoing weekly {game} series. "
+    "In this set, {p1} and {p2} face off using {p1_char} and {p2_char} respectively.",
+    "",
+    "Match Details:",
+    "Game: {game}",
+    "Event: {event_title}",
+    "Players: {p1} vs {p2}",
+    "Characters: {p1_char} vs {p2_char}",
+    "Format: {format}",
+    "",
+    "Watch more matches from {event_title} in the full playlist: {playlist}",
+    "?Full bracket and results: {bracket}",
+    "",
+    "Subscribe for more competitive {game} content, including full sets, tournament highlights, and weekly uploads.",
+    "",
+    "{hashtags}",
+]
+
+# Spaces are removed from each rendered hashtag.
+DEFAULT_HASHTAGS = [
+    "#SuperSmashBrosUltimate",
+    "#{p1_char}Vs{p2_char}",
+    "#SmashUltimateTournament",
+    "#{p1}",
+    "#{p2}",
+    "#{event}{number}",
+]
+
+DEFAULT_TEMPLATES = {
+    "title": DEFAULT_TITLE,
+    "description": DEFAULT_DESCRIPTION,
+    "hashtags": DEFAULT_HASHTAGS,
+}
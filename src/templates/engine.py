@@ -0,0 +1,181 @@
+import json
+from string import Formatter
+
+from src.templates.defaults import DEFAULT_TEMPLATES
+from src.templates.fields import FIELDS, template_fields
+
+# Compiled render functions, keyed by the template source (as JSON).
+_compiled = {}
+
+
+class TemplateError(ValueError):
+    pass
+
+
+def _parse(text):
+    """
+    Splits one template line into Python expressions over the field dict `f`,
+    checking every placeholder. Returns (expressions, placeholder names).
+    """
+    parts = []
+    names = []
+    try:
+        parsed = list(Formatter().parse(text))
+    except ValueError as e:
+        raise TemplateError(f"invalid template {text!r}: {e}") from None
+    for literal, name, spec, conversion in parsed:
+        if literal:
+            parts.append(repr(literal))
+        if name is None:
+            continue
+        if name not in FIELDS:
+            raise TemplateError(f"unknown placeholder {{{name}}} in {text!r}; use one of: {', '.join(sorted(FIELDS))}")
+        if spec or conversion:
+            raise TemplateError(f"format specs are not supported: {text!r}")
+        parts.append(f"f[{name!r}]")
+        names.append(name)
+    return parts or ["''"], names
+
+
+def _build(source, name):
+    namespace = {}
+    exec(compile(source, f"<template {name}>", "exec"), namespace)
+    return namespace[name]
+
+
+def _cache_key(kind, template):
+    return json.dumps([kind, template], ensure_ascii=False)
+
+
+def compile_line(template):
+    """
+    Compiles a single-line template such as the title into render(fields) -> str.
+    """
+    key = _cache_key("line", template)
+    if key not in _compiled:
+        parts, _ = _parse(template)
+        _compiled[key] = _build(f"def render(f):\n    return {' + '.join(parts)}\n", "render")
+    return _compiled[key]
+
+
+def compile_lines(lines):
+    """
+    Compiles a multi-line template (a list of lines) into render(fields) -> str.
+    Lines starting with "?" are skipped when any of their placeholders is empty.
+    """
+    key = _cache_key("lines", lines)
+    if key not in _compiled:
+        body = ["def render(f):", "    out = []"]
+        for line in lines:
+            optional = line.startswith("?")
+            parts, names = _parse(line[1:] if optional else line)
+            append = f"out.append({' + '.join(parts)})"
+            if optional and names:
+                condition = " and ".join(f"f[{n!r}]" for n in names)
+                body.append(f"    if {condition}: {append}")
+            else:
+                body.append(f"    {append}")
+        body.append("    return '\\n'.join(out)")
+        _compiled[key] = _build("\n".join(body) + "\n", "render")
+    return _compiled[key]
+
+
+def compile_hashtags(tags):
+    """
+    Compiles a list of hashtag templates into render(fields) -> str.
+    Each hashtag has its spaces removed; hashtags are joined by spaces.
+    """
+    key = _cache_key("hashtags", tags)
+    if key not in _compiled:
+        exprs = [f"({' + '.join(_parse(tag)[0])}).replace(' ', '')" for tag in tags]
+        _compiled[key] = _build(f"def render(f):\n    return ' '.join([{', '.join(exprs)}])\n", "render")
+    return _compiled[key]
+
+
+class TemplateSet:
+    """
+    The compiled title, description and hashtag templates for one event series.
+    """
+    __slots__ = ("title", "description", "hashtags")
+
+    def __init__(self, title, description, hashtags):
+        self.title = compile_line(title)
+        self.description = compile_lines(description)
+        self.hashtags = compile_hashtags(hashtags)
+
+    def render_title(self, fields):
+        return self.title(fields)
+
+    def render_description(self, fields):
+        fields["hashtags"] = self.hashtags(fields)
+        return self.description(fields)
+
+
+_template_sets = {}
+
+
+def _checked(name, overrides):
+    """
+    Returns one data["templates"] entry after checking its shape: an object
+    with a "title" string and/or "description" and "hashtags" lists of strings.
+    """
+    if not isinstance(overrides, dict):
+        raise TemplateError(f"templates[{name!r}] must be an object with title, description and/or hashtags")
+    for kind, value in overrides.items():
+        if kind not in DEFAULT_TEMPLATES:
+            raise TemplateError(f"templates[{name!r}]: unknown template {kind!r}; use title, description or hashtags")
+        if kind == "title":
+            if not isinstance(value, str):
+                raise TemplateError(f"templates[{name!r}][{kind!r}] must be a string")
+        elif not isinstance(value, list) or not all(isinstance(line, str) for line in value):
+            raise TemplateError(f"templates[{name!r}][{kind!r}] must be a list of strings (one per line)")
+    return overrides
+
+
+def _configured(data):
+    configured = data.get("templates") or {}
+    if not isinstance(configured, dict):
+        raise TemplateError('"templates" must be an object keyed by event series (or "default")')
+    return configured
+
+
+def get_templates(data, event_name=""):
+    """
+    Returns the TemplateSet for an event series: built-in defaults, overridden by
+    data["templates"]["default"], overridden by data["templates"][<series name>]
+    (matched case-insensitively). Raises TemplateError for invalid templates.
+    """
+    configured = _configured(data)
+    merged = dict(DEFAULT_TEMPLATES)
+    merged.update(_checked("default", configured.get("default", {})))
+    folded = event_name.casefold()
+    for name, overrides in configured.items():
+        if name.casefold() == folded and name != "default":
+            merged.update(_checked(name, overrides))
+            break
+
+    key = _cache_key("set", merged)
+    if key not in _template_sets:
+        _template_sets[key] = TemplateSet(merged["title"], merged["description"], merged["hashtags"])
+    return _template_sets[key]
+
+
+def check_templates(data):
+    """
+    Checks every entry of data["templates"] (its shape and each template
+    compiled), so a mistake is reported before any set is entered rather
+    than when it is generated. Raises TemplateError naming the entry.
+    """
+    for name in _configured(data):
+        try:
+            get_templates(data, "" if name == "default" else name)
+        except TemplateError as e:
+            message = str(e)
+            if not message.startswith("templates["):
+                message = f"templates[{name!r}]: {message}"
+            raise TemplateError(message) from None
+
+
+DEFAULT_TEMPLATE_SET = TemplateSet(
+    DEFAULT_TEMPLATES["title"], DEFAULT_TEMPLATES["description"], DEFAULT_TEMPLATES["hashtags"]
+)
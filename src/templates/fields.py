@@ -0,0 +1,42 @@
+"""
+The placeholder values templates are rendered with. Kept apart from the
+engine so rendering the built-in title (see src/title/title_generator.py)
+does not import the template compiler.
+"""
+
+# Placeholders a template may use; see template_fields().
+FIELDS = {
+    "event", "number", "event_title", "round", "round_type", "round_detail", "format",
+    "p1", "p2", "p1_char", "p2_char", "p1_chars", "p2_chars",
+    "playlist", "bracket", "game", "hashtags",
+}
+
+GAME = "Super Smash Bros. Ultimate"
+PLAYLIST_PLACEHOLDER = "[insert playlist link]"
+
+
+def template_fields(ctx, event=None):
+    """
+    Returns the placeholder values for a SetContext, all as strings.
+    event is the stored event edition, used for its links.
+    """
+    event = event or {}
+    return {
+        "event": ctx.event_name,
+        "number": str(ctx.event_number),
+        "event_title": ctx.event_title,
+        "round": ctx.bracket_title,
+        "round_type": ctx.round_type,
+        "round_detail": ctx.round_detail,
+        "format": ctx.best_of,
+        "p1": ctx.p1,
+        "p2": ctx.p2,
+        "p1_char": ctx.p1_char,
+        "p2_char": ctx.p2_char,
+        "p1_chars": " / ".join(ctx.chars1),
+        "p2_chars": " / ".join(ctx.chars2),
+        "playlist": event.get("playlist") or PLAYLIST_PLACEHOLDER,
+        "bracket": event.get("bracket") or "",
+        "game": GAME,
+        "hashtags": "",
+    }
@@ -0,0 +1,30 @@
+import argparse
+
+from src.watch.pattern import DEFAULT_PATTERN
+from src.watch.sidecar import SIDECAR_FORMATS, watch
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.watch",
+        description="Write title/tags/description sidecars for every VOD recorded into a directory."
+    )
+    parser.add_argument("directory", help="recordings directory")
+    parser.add_argument("--pattern", default=DEFAULT_PATTERN,
+                        help=f"file name pattern (default: \"{DEFAULT_PATTERN}\")")
+    parser.add_argument("--format", choices=SIDECAR_FORMATS + ("both",), default="both",
+                        help="sidecar format (default: both)")
+    parser.add_argument("--record", action="store_true",
+                        help="count character usage and add the sets to the history")
+    parser.add_argument("--existing", action="store_true", help="also process videos without sidecars already there")
+    parser.add_argument("--once", action="store_true", help="process videos without sidecars and exit")
+    parser.add_argument("--poll", action="store_true", help="poll the directory instead of using inotify")
+    parser.add_argument("--interval", type=float, default=0.5, help="polling interval in seconds")
+    args = parser.parse_args()
+
+    formats = SIDECAR_FORMATS if args.format == "both" else (args.format,)
+    watch(args.directory, args.pattern, args.poll, args.interval, formats, args.record, args.existing, args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import re
+
+from src.batch.manifest import MANIFEST_FIELDS, normalize_record
+from src.events.rounds import round_from_hint
+
+# Placeholders a file name pattern may use: the manifest fields (see
+# src/batch/manifest.py); {round} alone may hold the whole round ("LSF",
+# "Winners Round 2") when the pattern has no {round_type}.
+DEFAULT_PATTERN = "{event} {number} - {round} - {p1} ({p1_chars}) vs {p2} ({p2_chars})"
+
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".mov", ".flv", ".ts", ".webm", ".avi")
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+class FilenamePattern:
+    """
+    Matches VOD file names (without extension) against a pattern such as
+    "{event} {number} - {round} - {p1} ({p1_chars}) vs {p2} ({p2_chars})"
+    and turns them into set records. Literal text must match exactly
+    (case-insensitively); each placeholder matches as little as possible and
+    only the players may not be empty.
+    """
+
+    def __init__(self, pattern=DEFAULT_PATTERN):
+        self.pattern = pattern
+        self.fields = _PLACEHOLDER.findall(pattern)
+        unknown = [f for f in self.fields if f not in MANIFEST_FIELDS]
+        if unknown:
+            raise ValueError(f"unknown placeholder(s) {', '.join(unknown)}; use {', '.join(MANIFEST_FIELDS)}")
+        if "p1" not in self.fields or "p2" not in self.fields:
+            raise ValueError("the pattern needs {p1} and {p2}")
+
+        regex = []
+        last = 0
+        for match in _PLACEHOLDER.finditer(pattern):
+            regex.append(re.escape(pattern[last:match.start()]))
+            name = match.group(1)
+            if name == "number":
+                regex.append(rf"(?P<{name}>\d*)")
+            elif name in ("p1", "p2"):
+                regex.append(rf"(?P<{name}>.+?)")
+            else:
+                regex.append(rf"(?P<{name}>.*?)")
+            last = match.end()
+        regex.append(re.escape(pattern[last:]))
+        self._regex = re.compile("".join(regex) + r"\Z", re.IGNORECASE)
+
+    def parse(self, path):
+        """
+        Returns the set record for a file name, or None if it does not match.
+        """
+        stem, _ = os.path.splitext(os.path.basename(path))
+        match = self._regex.match(stem)
+        if match is None:
+            return None
+        raw = match.groupdict()
+        for field in ("p1_chars", "p2_chars"):
+            if raw.get(field):
+                raw[field] = raw[field].replace(",", ";").replace("+", ";")
+        if not raw.get("round_type"):
+            # Without any round in the name the set is filed under Pools
+            raw["round_type"], raw["round"] = round_from_hint(raw.get("round") or "Pools")
+        return normalize_record(raw)
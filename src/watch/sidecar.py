@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+
+from src.daemon.server import MetadataService
+from src.data.loader import load_data
+from src.players.fuzzy import get_fuzzy_index
+from src.watch.pattern import FilenamePattern
+from src.watch.watcher import DebouncedQueue, make_watcher, scan
+
+SIDECAR_FORMATS = ("json", "txt")
+
+
+def sidecar_paths(video_path, formats=SIDECAR_FORMATS):
+    """
+    Returns the sidecar files for a video: "<name>.metadata.json" and
+    "<name>.metadata.txt" next to it. Recordings remuxed to another container
+    share their sidecars.
+    """
+    stem, _ = os.path.splitext(video_path)
+    return {fmt: f"{stem}.metadata.{fmt}" for fmt in formats}
+
+
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+class SidecarWriter:
+    """
+    Generates metadata for one VOD from its file name and writes the sidecars.
+    """
+
+    def __init__(self, service, pattern, formats=SIDECAR_FORMATS, record=False, log=print):
+        self.service = service
+        self.pattern = pattern
+        self.formats = formats
+        self.record = record
+        self.log = log
+
+    def resolve_player(self, name):
+        """
+        Returns the name, or the display name of the only known player one typo away.
+        """
+        data = self.service.data
+        if name.lower() in data["players"]:
+            return name
+        with self.service.lock:
+            suggestions = get_fuzzy_index(data).suggest(name)
+        if len(suggestions) == 1:
+            return data["players"][suggestions[0]][0]
+        return name
+
+    def __call__(self, path):
+        started = time.perf_counter()
+        name = os.path.basename(path)
+        record = self.pattern.parse(path)
+        if record is None:
+            self.log(f"{name}: does not match '{self.pattern.pattern}', skipped")
+            return
+        for field in ("p1", "p2"):
+            record[field] = self.resolve_player(record[field])
+        try:
+            output = self.service.generate(dict(record, record=self.record), ("title", "tags", "description"))
+        except ValueError as e:
+            self.log(f"{name}: {e}")
+            return
+
+        paths = sidecar_paths(path, self.formats)
+        if "json" in paths:
+            _write_atomic(paths["json"], json.dumps(dict(video=name, **output), ensure_ascii=False, indent=2) + "\n")
+        if "txt" in paths:
+            _write_atomic(paths["txt"], f"{output['title']}\n\n{output['tags']}\n\n{output['description']}\n")
+        self.log(f"{name}: {output['title']} ({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+
+def watch(directory, pattern=None, poll=False, interval=0.5, formats=SIDECAR_FORMATS, record=False,
+          existing=False, once=False, data_path=None, flush_interval=5.0, debounce=0.2, log=print):
+    """
+    Writes sidecars for every video that lands in directory until Ctrl-C.
+    Detection, debouncing and generation run on separate threads, so a burst
+    of files at the end of a bracket is queued while new files keep being
+    picked up. existing also processes the videos already there that have no
+    sidecar yet; once does only that and returns.
+    """
+    service = MetadataService(load_data(data_path), data_path)
+    writer = SidecarWriter(service, FilenamePattern(pattern) if pattern else FilenamePattern(), formats, record, log)
+    queue = DebouncedQueue(writer, debounce, log)
+    stop = threading.Event()
+
+    if existing or once:
+        for path in scan(directory):
+            if not all(os.path.exists(p) for p in sidecar_paths(path, formats).values()):
+                queue.report(path)
+
+    threads = [threading.Thread(target=queue.run_worker, daemon=True),
+               threading.Thread(target=queue.run_scheduler, args=(stop,), daemon=True)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        if once:
+            time.sleep(debounce)
+        else:
+            watcher = make_watcher(directory, poll, interval)
+            kind = "inotify" if not hasattr(watcher, "interval") else f"polling every {interval}s"
+            log(f"Watching {directory} ({kind}); sidecars: {', '.join(formats)}")
+            detector = threading.Thread(target=watcher.run, args=(queue.report, stop), daemon=True)
+            detector.start()
+            last_flush = time.monotonic()
+            while detector.is_alive():
+                detector.join(0.5)
+                if record and time.monotonic() - last_flush >= flush_interval:
+                    service.flush()
+                    last_flush = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        queue.wake()
+        for thread in threads:
+            thread.join()
+        if record:
+            service.flush()
@@ -0,0 +1,184 @@
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import threading
+import time
+
+from src.watch.pattern import VIDEO_EXTENSIONS
+
+# inotify(7) event bits
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def is_video(name):
+    return name.lower().endswith(VIDEO_EXTENSIONS) and not name.startswith(".")
+
+
+class InotifyWatcher:
+    """
+    Reports video files in a directory as soon as they are closed after
+    writing (or moved in), using Linux inotify through libc.
+    """
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+        self.directory = directory
+
+    def run(self, on_file, stop):
+        """
+        Calls on_file(path) for every finished video file until stop is set.
+        """
+        try:
+            while not stop.is_set():
+                ready, _, _ = select.select([self.fd], [], [], 0.5)
+                if not ready:
+                    continue
+                buf = os.read(self.fd, 64 * 1024)
+                offset = 0
+                while offset < len(buf):
+                    _, mask, _, length = _EVENT_HEADER.unpack_from(buf, offset)
+                    offset += _EVENT_HEADER.size
+                    name = os.fsdecode(buf[offset:offset + length].rstrip(b"\0"))
+                    offset += length
+                    if mask & IN_Q_OVERFLOW:
+                        for existing in scan(self.directory):
+                            on_file(existing)
+                    elif name and is_video(name):
+                        on_file(os.path.join(self.directory, name))
+        finally:
+            os.close(self.fd)
+
+
+class PollingWatcher:
+    """
+    Fallback for systems without inotify: lists the directory every interval
+    seconds and reports a video file once its size and modification time
+    stayed the same between two scans (i.e. the recorder stopped writing).
+    """
+
+    def __init__(self, directory, interval=0.5):
+        self.directory = directory
+        self.interval = interval
+
+    def run(self, on_file, stop):
+        seen = {}
+        reported = {}
+        while not stop.wait(self.interval):
+            current = {}
+            for path in scan(self.directory):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                signature = (st.st_size, st.st_mtime_ns)
+                current[path] = signature
+                if seen.get(path) == signature and reported.get(path) != signature:
+                    reported[path] = signature
+                    on_file(path)
+            seen = current
+
+
+def scan(directory):
+    """
+    Returns the video files currently in directory.
+    """
+    with os.scandir(directory) as entries:
+        return sorted(e.path for e in entries if e.is_file() and is_video(e.name))
+
+
+def make_watcher(directory, poll=False, interval=0.5):
+    """
+    Returns an InotifyWatcher where inotify works, else a PollingWatcher.
+    """
+    if not poll:
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directory, interval)
+
+
+class DebouncedQueue:
+    """
+    Hands detected files to a worker thread. A file reported several times
+    within `delay` seconds (a recorder closing and reopening it, inotify plus
+    a rescan) is processed once, `delay` seconds after its last report, and
+    a file is not processed again unless its size or modification time changed.
+    A file whose processing fails is logged and tried again when next reported;
+    the worker carries on with the other files.
+    """
+
+    def __init__(self, process, delay=0.2, log=print):
+        self.process = process
+        self.delay = delay
+        self.log = log
+        self._due = {}
+        self._done = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._work = queue.Queue()
+
+    def report(self, path):
+        with self._lock:
+            self._due[path] = time.monotonic() + self.delay
+        self._wake.set()
+
+    def run_scheduler(self, stop):
+        """
+        Moves files whose debounce delay has passed onto the work queue, until
+        stop is set (call wake() after setting it).
+        """
+        while not stop.is_set():
+            with self._lock:
+                now = time.monotonic()
+                ready = [p for p, due in self._due.items() if due <= now]
+                for path in ready:
+                    del self._due[path]
+                next_due = min(self._due.values(), default=None)
+            for path in ready:
+                self._work.put(path)
+            self._wake.wait(None if next_due is None else max(0.0, next_due - time.monotonic()))
+            self._wake.clear()
+        # Files still waiting out their delay are processed before stopping
+        with self._lock:
+            remaining, self._due = list(self._due), {}
+        for path in remaining:
+            self._work.put(path)
+        self._work.put(None)
+
+    def run_worker(self):
+        while True:
+            path = self._work.get()
+            if path is None:
+                return
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            signature = (st.st_size, st.st_mtime_ns)
+            if self._done.get(path) == signature:
+                continue
+            self._done[path] = signature
+            try:
+                self.process(path)
+            except Exception as e:
+                del self._done[path]
+                self.log(f"{os.path.basename(path)}: failed: {type(e).__name__}: {e}")
+
+    def wake(self):
+        self._wake.set()
@@ -0,0 +1,44 @@
+from src.data.tracked import track
+from src.players.character_registry import CharacterRegistry
+
+
+def make_data():
+    return track({
+        "players": {},
+        "events": [],
+        "character_list": ["Sheik", "Piranha Plant"],
+        "character_aliases": {"Piranha Plant": ["Plant"]},
+    })
+
+
+def test_in_place_alias_edits_rebuild_the_index():
+    data = make_data()
+    registry = CharacterRegistry(data["character_list"], data["character_aliases"])
+    assert registry.canonical("pp") is None
+    version = registry.version
+
+    data["character_aliases"]["Piranha Plant"].append("PP")
+    assert registry.canonical("pp") == "Piranha Plant"
+    assert registry.version != version
+
+    version = registry.version
+    data["character_aliases"]["Piranha Plant"][1] = "Pirana"
+    assert registry.canonical("pp") is None
+    assert registry.canonical("pirana") == "Piranha Plant"
+    assert registry.version != version
+
+    version = registry.version
+    data["character_aliases"]["Piranha Plant"] = ["Potted"]
+    assert registry.canonical("plant") is None
+    assert registry.aliases("Piranha Plant") == ["Piranha Plant", "Potted"]
+    assert registry.version != version
+
+
+def test_unrelated_changes_keep_the_index():
+    data = make_data()
+    registry = CharacterRegistry(data["character_list"], data["character_aliases"])
+    version = registry.version
+    data["players"]["hertsu"] = ["Hertsu", {"Sheik": 1}]
+    assert registry.version == version
+    data.changes.clear()
+    assert registry.version == version
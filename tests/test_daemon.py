@@ -0,0 +1,88 @@
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from src.daemon.client import DaemonClient
+from src.daemon.server import serve
+
+DATA = {
+    "players": {
+        "hertsu": ["Hertsu", {"Sheik": 12, "Zelda": 2}],
+        "dasuki": ["Dasuki", {"Piranha Plant": 9}],
+    },
+    "events": [{"name": "PVL Weekly", "number": 18, "playlist": "", "bracket": ""}],
+    "character_list": ["Sheik", "Zelda", "Piranha Plant"],
+    "character_aliases": {"Piranha Plant": ["Plant", "PP"]},
+}
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """
+    Runs the daemon on a Unix socket in tmp_path and yields (socket path,
+    server thread); stops it afterwards unless the test did.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix sockets are not available")
+    data_path = tmp_path / "data.json"
+    data_path.write_text(json.dumps(DATA), encoding="utf-8")
+    socket_path = str(tmp_path / "daemon.sock")
+    thread = threading.Thread(
+        target=serve, args=(socket_path, None, str(data_path), 60.0), kwargs={"log": lambda *_: None}
+    )
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket_path):
+        if time.monotonic() > deadline or not thread.is_alive():
+            pytest.fail("daemon did not start")
+        time.sleep(0.01)
+    yield socket_path, thread
+    if thread.is_alive():
+        with DaemonClient(socket_path) as client:
+            client.request("shutdown")
+    thread.join(10)
+    assert not thread.is_alive()
+
+
+def test_round_trip(daemon):
+    socket_path, thread = daemon
+    with DaemonClient(socket_path) as client:
+        assert client.request("ping")["players"] == 2
+
+        response = client.request("title", p1="hertsu", p2="dasuki", round_type="Losers", round="sf")
+        assert response["title"] == (
+            "PVL Weekly #18 Losers Semi-Finals - Hertsu (Sheik) vs Dasuki (Piranha Plant) - SSBU"
+        )
+        assert response["p1_chars"] == ["Sheik"]
+
+        response = client.request("complete", kind="players", text="h")
+        assert response == {"matches": ["Hertsu"], "total": 1}
+
+        with pytest.raises(RuntimeError, match="unknown op"):
+            client.request("nonsense")
+
+        client.request("shutdown")
+    thread.join(10)
+    assert not thread.is_alive()
+    assert not os.path.exists(socket_path)
+
+
+def test_non_object_request_is_an_error(daemon):
+    socket_path, _ = daemon
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(10)
+        sock.connect(socket_path)
+        stream = sock.makefile("rwb")
+        stream.write(b"[1, 2]\n")
+        stream.flush()
+        response = json.loads(stream.readline())
+        assert response["ok"] is False and "object" in response["error"]
+
+        # The connection stays usable
+        stream.write(b'{"op": "ping"}\n')
+        stream.flush()
+        assert json.loads(stream.readline())["ok"] is True
@@ -0,0 +1,54 @@
+import json
+
+from src.data.snapshot import Snapshot, write_snapshot
+from src.data.tracked import track
+from src.players.completion import player_index, player_roster
+from src.players.fuzzy import get_fuzzy_index
+
+DATA = {
+    "players": {
+        "hertsu": ["Hertsu", {"Sheik": 12, "Zelda": 2}],
+        "dasuki": ["Dasuki", {"Piranha Plant": 9}],
+        "leo": ["Leo", {"Sheik": 1}],
+    },
+    "events": [{"name": "PVL Weekly", "number": 18, "playlist": "", "bracket": ""}],
+    "character_list": ["Sheik", "Zelda", "Piranha Plant"],
+    "character_aliases": {},
+}
+
+
+def _load(tmp_path):
+    path = tmp_path / "data.json"
+    source = json.dumps(DATA).encode("utf-8")
+    path.write_bytes(source)
+    return write_snapshot(str(path), track(json.loads(source)), source).load()
+
+
+def test_player_index_leaves_players_undecoded(tmp_path):
+    data = _load(tmp_path)
+    players = data["players"]
+    players["dasuki"][1]["Piranha Plant"] += 10
+    players["plup"] = ["Plup", {"Sheik": 4}]
+
+    assert player_roster(players) == (
+        ["hertsu", "dasuki", "leo", "plup"], ["Hertsu", "Dasuki", "Leo", "Plup"], [14, 19, 1, 4]
+    )
+    assert player_index(players).top("", 4) == ["Dasuki", "Hertsu", "Plup", "Leo"]
+    assert get_fuzzy_index(data).suggest("Hertsy") == ["hertsu"]
+    # Only the entries looked up or added were decoded
+    assert sorted(dict.keys(players)) == ["dasuki", "plup"]
+
+
+def test_fuzzy_index_follows_renames_and_removals(tmp_path):
+    data = _load(tmp_path)
+    players = data["players"]
+    assert get_fuzzy_index(data).suggest("Dasuky") == ["dasuki"]
+
+    players["leo"][0] = "Leonardo"
+    assert get_fuzzy_index(data).suggest("Leonardp") == ["leo"]
+
+    # Same size as before, so only the section's revision tells them apart
+    del players["dasuki"]
+    players["mango"] = ["Mango", {"Fox": 3}]
+    assert get_fuzzy_index(data).suggest("Dasuky") == []
+    assert get_fuzzy_index(data).suggest("Mangp") == ["mango"]
@@ -0,0 +1,77 @@
+from src.core.set_context import build_context
+from src.core.speculative import Speculator
+from src.players.character_registry import get_registry
+from src.tags.tag_generator import construct_tags
+
+DATA = {
+    "character_list": ["Sheik", "Zelda", "Piranha Plant"],
+    "character_aliases": {"Piranha Plant": ["Plant", "PP"]},
+}
+
+
+def _settle(speculator):
+    # A guess still queued when taken is a miss; let the worker get to it first
+    for future in list(speculator._pending.values()):
+        future.result()
+
+
+def _context(registry, chars2):
+    return build_context("Hertsu", "Dasuki", ["Sheik"], chars2, "PVL Weekly", 18, "Losers", "sf", registry)
+
+
+def test_guessed_tags_match_direct_generation():
+    registry = get_registry(DATA)
+    speculator = Speculator()
+    speculator.guess(registry, "Hertsu", "Dasuki", ["Sheik"], ["Zelda"], "PVL Weekly", 18)
+    # The guess is replaced once the characters are known
+    speculator.guess(registry, "Hertsu", "Dasuki", ["Sheik"], ["Piranha Plant"], "PVL Weekly", 18)
+    _settle(speculator)
+    ctx = _context(registry, ["Piranha Plant"])
+    assert speculator.tags(ctx, registry) == construct_tags(ctx, registry)
+    assert speculator.stats()["hits"] == 1
+
+    speculator.guess(registry, "Hertsu", "Dasuki", ["Sheik"], ["Zelda"], "PVL Weekly", 18)
+    ctx = _context(registry, ["Sheik"])
+    assert speculator.tags(ctx, registry) == construct_tags(ctx, registry)
+    speculator.finish()
+    assert speculator.stats()["misses"] == 1
+
+
+def test_guess_is_stale_after_an_alias_edit():
+    data = {"character_list": list(DATA["character_list"]),
+            "character_aliases": {k: list(v) for k, v in DATA["character_aliases"].items()}}
+    registry = get_registry(data)
+    speculator = Speculator()
+    speculator.guess(registry, "Hertsu", "Dasuki", ["Sheik"], ["Piranha Plant"], "PVL Weekly", 18)
+    _settle(speculator)
+    ctx = _context(registry, ["Piranha Plant"])
+    data["character_aliases"]["Piranha Plant"] = ["Plant", "PP", "Pirahna"]
+    registry.invalidate()
+    assert speculator.tags(ctx, registry) == construct_tags(ctx, registry)
+    assert speculator.stats()["misses"] == 1
+
+
+def test_guessed_title_and_description_match_direct_generation():
+    from src.core.speculative import likely_rounds
+    from src.description.description_generator import generate_description
+    from src.templates.engine import get_templates
+    from src.title.title_generator import generate_title
+
+    registry = get_registry(DATA)
+    templates = get_templates(DATA, "PVL Weekly")
+    event = {"name": "PVL Weekly", "number": 18, "playlist": "https://example.com/pl"}
+    speculator = Speculator()
+    args = (registry, "Hertsu", "Dasuki", ["Sheik"], ["Piranha Plant"], "PVL Weekly", 18)
+    speculator.guess(*args, likely_rounds("Losers"), templates, event)
+    # The detail narrows the guess; the matching round keeps its work
+    speculator.guess(*args, likely_rounds("Losers", "sf"), templates, event)
+    assert speculator.stats()["started"] == 15
+    _settle(speculator)
+
+    ctx = _context(registry, ["Piranha Plant"])
+    assert speculator.title(ctx, templates) == generate_title(ctx, templates)
+    assert speculator.tags(ctx, registry) == construct_tags(ctx, registry)
+    # An edition without a bracket link renders like one with an empty link
+    event["bracket"] = ""
+    assert speculator.description(ctx, event, templates) == generate_description(ctx, event, templates)
+    assert speculator.stats()["hits"] == 3
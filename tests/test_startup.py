@@ -0,0 +1,42 @@
+import json
+import os
+
+import pytest
+
+from benchmarks.bench_startup import BUDGET_MS, SET_FLAGS, import_times
+
+DATA = {
+    "players": {
+        "hertsu": ["Hertsu", {"Sheik": 12}],
+        "dasuki": ["Dasuki", {"Piranha Plant": 9}],
+    },
+    "events": [{"name": "PVL Weekly", "number": 18, "playlist": "", "bracket": ""}],
+    "character_list": ["Sheik", "Piranha Plant"],
+    "character_aliases": {},
+}
+
+# Never needed to print a title with the built-in template
+HEAVY = ["src.templates.engine", "sqlite3", "readline", "concurrent.futures", "src.session"]
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(DATA), encoding="utf-8")
+    monkeypatch.setenv("SMASHVOD_DATA", str(path))
+    monkeypatch.delenv("SMASHVOD_PROFILE", raising=False)
+    return dict(os.environ)
+
+
+def test_title_imports_nothing_heavy(env):
+    _, modules, _ = import_times(["title"] + SET_FLAGS, env)
+    imported = sorted(m for m in modules for heavy in HEAVY if m == heavy or m.startswith(heavy + "."))
+    assert imported == []
+
+
+def test_title_import_time(env):
+    # Loose on purpose: the benchmark holds the real budget, this only
+    # catches something as slow as a whole extra subsystem.
+    baseline = min(import_times([], env, ("-c", "pass"))[0] for _ in range(3))
+    added = min(import_times(["title"] + SET_FLAGS, env)[0] for _ in range(3)) - baseline
+    assert added < 3 * BUDGET_MS
@@ -0,0 +1,51 @@
+import json
+import os
+import threading
+
+from src.data.storage import JsonStorage, write_atomic
+from src.data.tracked import unsaved_changes
+
+
+def test_concurrent_atomic_writes(tmp_path):
+    path = str(tmp_path / "data.json")
+    errors = []
+
+    def save(digit):
+        try:
+            for _ in range(50):
+                write_atomic(path, digit.encode() * 10000)
+        except Exception as e:
+            errors.append(e)
+
+    savers = [threading.Thread(target=save, args=(str(i),)) for i in range(4)]
+    for saver in savers:
+        saver.start()
+    for saver in savers:
+        saver.join()
+
+    assert errors == []
+    with open(path, "rb") as f:
+        content = f.read()
+    # One saver's payload, whole
+    assert len(content) == 10000 and len(set(content)) == 1
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_changes_through_iteration_are_saved(tmp_path):
+    path = str(tmp_path / "data.json")
+    with open(path, "w") as f:
+        json.dump({"players": {"hertsu": ["Hertsu", {"Sheik": 12}], "leo": ["Leo", {}]}, "events": []}, f)
+    storage = JsonStorage(path)
+    data = storage.load()
+
+    for _, (_, chars) in data["players"].items():
+        chars["Sheik"] = chars.get("Sheik", 0) + 1
+    for _, chars in data["players"].values():
+        chars["Zelda"] = 1
+
+    assert unsaved_changes(data) == {"players": 2}
+    assert not storage.save(data).skipped
+    with open(path) as f:
+        assert json.load(f)["players"] == {
+            "hertsu": ["Hertsu", {"Sheik": 13, "Zelda": 1}], "leo": ["Leo", {"Sheik": 1, "Zelda": 1}]
+        }
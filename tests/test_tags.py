@@ -0,0 +1,43 @@
+from src.core.fragments import fragment_cache
+from src.core.set_context import build_context
+from src.data.tracked import track
+from src.players.character_registry import get_registry
+from src.tags.tag_generator import construct_tags, tag_candidates
+
+
+def test_editing_an_alias_list_changes_the_tags():
+    data = track({
+        "players": {},
+        "events": [],
+        "character_list": ["Sheik", "Piranha Plant"],
+        "character_aliases": {"Piranha Plant": ["Plant"]},
+    })
+    registry = get_registry(data)
+    ctx = build_context("Hertsu", "Dasuki", ["Sheik"], ["Piranha Plant"], "PVL Weekly", 18, "Losers", "sf", registry)
+    tags = construct_tags(ctx, registry).split(",")
+    assert "Dasuki Plant" in tags
+    assert "Dasuki Potted Plant" not in tags
+    # The fragments are cached now; the edit below must not be served from the cache
+    assert fragment_cache.stats()["size"] > 0
+
+    data["character_aliases"]["Piranha Plant"].append("Potted Plant")
+    tags = construct_tags(ctx, get_registry(data)).split(",")
+    assert "Dasuki Potted Plant" in tags
+    assert "Sheik vs Potted Plant" in tags
+
+    data["character_aliases"]["Piranha Plant"].remove("Plant")
+    tags = construct_tags(ctx, get_registry(data)).split(",")
+    assert "Dasuki Plant" not in tags
+    assert "Dasuki Potted Plant" in tags
+
+
+def test_candidates_build_fragments_only_as_consumed():
+    data = track({"players": {}, "events": [], "character_list": ["Sheik", "Zelda", "Fox"], "character_aliases": {}})
+    registry = get_registry(data)
+    ctx = build_context("Hertsu", "Dasuki", ["Sheik", "Zelda"], ["Fox"], "PVL Weekly", 18, "Losers", "sf", registry)
+    fragment_cache.clear()
+    candidates = tag_candidates(ctx, registry)
+    # Event, both players and the first matchup
+    for _ in range(4):
+        next(candidates)
+    assert fragment_cache.stats()["size"] == 1
@@ -0,0 +1,37 @@
+import pytest
+
+from src.session import flow
+from src.templates.engine import TemplateError, check_templates, get_templates
+
+
+@pytest.mark.parametrize("templates, message", [
+    ({"default": {"description": "one line"}}, "list of strings"),
+    ({"default": {"title": ["{p1} vs {p2}"]}}, "must be a string"),
+    ({"PVL Weekly": {"hashtags": ["#{event}", 3]}}, "list of strings"),
+    ({"PVL Weekly": "{p1} vs {p2}"}, "must be an object"),
+    ({"default": {"titel": "{p1}"}}, "unknown template"),
+    (["default"], "keyed by event series"),
+])
+def test_template_shapes_are_checked(templates, message):
+    with pytest.raises(TemplateError, match=message):
+        get_templates({"templates": templates}, "PVL Weekly")
+
+
+def test_check_templates_names_the_series():
+    data = {"templates": {"PVL Weekly": {"title": "{p1} vs {opponent}"}}}
+    # Other series never use the bad template...
+    get_templates(data, "Smash Sunday")
+    # ...but checking reports it, and where it is
+    with pytest.raises(TemplateError, match=r"templates\['PVL Weekly'\]: unknown placeholder \{opponent\}"):
+        check_templates(data)
+
+
+def test_session_fails_before_prompting(monkeypatch):
+    def prompt(*_):
+        raise AssertionError("prompted before the templates were checked")
+
+    monkeypatch.setattr("builtins.input", prompt)
+    data = {"players": {}, "events": [], "character_list": [], "character_aliases": {},
+            "templates": {"default": {"description": "{p1} vs {p2}"}}}
+    with pytest.raises(TemplateError, match="list of strings"):
+        flow.run_session(data)